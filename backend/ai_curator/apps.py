@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AiCuratorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ai_curator'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,143 @@
+# ai_curator/async_views.py
+# settings.ASYNC_VIEWS 일 때 쓰는 비동기 버전 (uvicorn 등 ASGI 서버에서)
+# 알라딘/위키/OpenAI 응답을 기다리는 동안 워커 스레드를 붙잡지 않는다. 응답 모양은 views.py 와 같다.
+
+import asyncio
+import json
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from config.http import async_api_view, conditional, make_etag
+from config.metrics import count_cache
+from books.services.aladin import asearch_books_by_query, validate_isbn13, InvalidISBN, is_known_missing
+from books.services.cache import incr_stat
+from .jobs import TERMINAL, ensure_job
+from .models import AIAnalysisJob, AIReviewAnalysis
+from .services import acached_chat_json, aget_wikipedia_author_info, recommend_messages
+from .taste import MODEL, TEMPERATURE, finish_recommendation, prepare_recommendation
+from .views import (
+    analysis_payload,
+    find_country_data,
+    job_payload,
+    job_response,
+    travel_book,
+    travel_payload,
+    travel_query,
+)
+
+
+@async_api_view(["POST"])
+async def recommend_book(request):
+    try:
+        answers = json.loads(request.body).get("answers", [])
+
+        # GPT 호출만 여기서 비동기로, 나머지 단계는 taste.recommend 와 같은 함수
+        payload, user_summary, books = await sync_to_async(prepare_recommendation)(answers)
+        if payload is not None:
+            return JsonResponse(payload)
+
+        try:
+            raw = await acached_chat_json(MODEL, recommend_messages(user_summary, books), temperature=TEMPERATURE)
+        except Exception as e:
+            return JsonResponse(await sync_to_async(finish_recommendation)(answers, user_summary, books, error=e))
+        return JsonResponse(await sync_to_async(finish_recommendation)(answers, user_summary, books, raw))
+
+    except Exception as e:
+        print(f"Error: {e}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@async_api_view(["GET"])
+async def book_ai_review(request, isbn13):
+    try:
+        isbn13 = validate_isbn13(isbn13)
+    except InvalidISBN as e:
+        incr_stat("aladin.negative.invalid")
+        return JsonResponse({"error": str(e)}, status=400)
+
+    cached = await AIReviewAnalysis.objects.filter(isbn13=isbn13).afirst()
+    count_cache("ai_review", "hit" if cached else "miss")
+    if cached:
+        return conditional(
+            request,
+            lambda: JsonResponse(analysis_payload(cached)),
+            etag=make_etag(isbn13, cached.created_at),
+            last_modified=cached.created_at,
+            cache="ai_review",
+        )
+
+    if await sync_to_async(is_known_missing)(isbn13):
+        return JsonResponse({"message": "도서 정보를 찾을 수 없습니다."}, status=404)
+    job = await sync_to_async(ensure_job)(isbn13)
+    return await sync_to_async(job_response)(request, job)
+
+
+@async_api_view(["POST"])
+async def book_travel(request):
+    try:
+        data = json.loads(request.body)
+        country = data.get("country", "").strip()
+        if not country:
+            return JsonResponse({"error": "country is required"}, status=400)
+
+        country_data = find_country_data(country)
+        if not country_data:
+            return JsonResponse({"error": f"{country}에 대한 데이터가 없습니다."}, status=404)
+
+        # 위키 1건 + 알라딘 검색 N건을 한 번에
+        author_name = country_data.get("representative_author", {}).get("name")
+        wiki, *results = await asyncio.gather(
+            aget_wikipedia_author_info(author_name),
+            *(asearch_books_by_query(travel_query(b), max_results=1) for b in country_data.get("books", [])),
+        )
+        wiki_intro, wiki_img, wiki_url = wiki
+
+        return JsonResponse(travel_payload(country, country_data, wiki_img, wiki_url, [travel_book(r) for r in results]))
+
+    except Exception as e:
+        print(f"🚨 book_travel 에러: {e}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _job_state(request, job_id):
+    job = AIAnalysisJob.objects.filter(pk=job_id).first()
+    return (None, None) if job is None else (job.status, job_payload(request, job))
+
+
+async def _job_events(request, job_id):
+    # 상태가 바뀔 때마다 status 이벤트, 끝나면 done 이벤트 하나 보내고 종료 (기다리는 동안 스레드를 잡지 않음)
+    deadline = time.monotonic() + settings.AI_ANALYSIS_SSE_TIMEOUT
+    last_status = None
+    yield f"retry: {settings.AI_ANALYSIS_POLL_SECONDS * 1000}\n\n"
+    while True:
+        status, payload = await sync_to_async(_job_state)(request, job_id)
+        if status is None:
+            yield _sse("error", {"message": "작업을 찾을 수 없습니다."})
+            return
+        if status in TERMINAL:
+            yield _sse("done", payload)
+            return
+        if status != last_status:
+            last_status = status
+            yield _sse("status", payload)
+        else:
+            yield ": keepalive\n\n"   # 끊긴 연결을 빨리 알아채도록
+        if time.monotonic() >= deadline:
+            return
+        await asyncio.sleep(settings.AI_ANALYSIS_POLL_SECONDS)
+
+
+@async_api_view(["GET"])
+async def ai_analysis_job_events(request, job_id):
+    """
+    분석 작업 완료 알림 (Server-Sent Events) — ASGI 에서만 연결 (WSGI 는 폴링 ai_analysis_job)
+    """
+    response = StreamingHttpResponse(_job_events(request, job_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"   # nginx 버퍼링 끔
+    return response
@@ -0,0 +1,183 @@
+# ai_curator/jobs.py
+
+"""
+AI 도서 분석 작업 (ISBN 당 하나)
+
+- 분석은 알라딘 + 위키 + GPT 라 수 초~수십 초 걸린다 → 요청 스레드에서 돌리지 않고 작업으로
+- ensure_job: 작업을 찾거나 만들고 백그라운드 실행을 예약 (같은 ISBN 을 동시에 여러 명이 열어도 GPT 호출은 한 번)
+- run_job: 대기 중인 작업을 원자적으로 가져가서(claim) 실행 → 프로세스가 여러 개여도 한 곳에서만 돈다
+- 상세 페이지를 열면 warm_analysis 로 미리 시작해 둔다 (source="warm", 로그인 사용자 + 비로그인은 일부만, 봇 제외)
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F, Q
+from django.utils import timezone
+from books.services.aladin import is_known_missing
+from books.services.background import run_in_background
+from books.services.quota import BACKGROUND, USER, aladin_priority
+from config.circuit import OPEN, breaker
+from config.metrics import registry
+from .models import AIAnalysisJob, AIReviewAnalysis
+from .services import (
+    analyze_book_complete,
+    degraded_analysis_payload,
+    get_aladin_data_complete,
+    get_wikipedia_author_info,
+)
+
+# AIAnalysisJob.error
+NOT_FOUND = "not_found"
+AI_FAILED = "ai_failed"
+ERROR = "error"
+
+TERMINAL = (AIAnalysisJob.DONE, AIAnalysisJob.FAILED)
+
+
+def _is_stale(job, now) -> bool:
+    # 실행 중인 채로 오래된 작업 = 워커가 죽었다고 보고 다시 가져갈 수 있음
+    limit = timedelta(seconds=settings.AI_ANALYSIS_JOB_STALE_SECONDS)
+    return job.status == AIAnalysisJob.RUNNING and (job.started_at is None or job.started_at < now - limit)
+
+
+def _needs_run(job, now) -> bool:
+    if job.status == AIAnalysisJob.PENDING:
+        return True
+    if job.status == AIAnalysisJob.RUNNING:
+        return _is_stale(job, now)
+    if job.status == AIAnalysisJob.FAILED:
+        # 없는 ISBN 은 is_known_missing 이 풀린 뒤에만 다시
+        if job.error == NOT_FOUND:
+            return not is_known_missing(job.isbn13)
+        retry = timedelta(seconds=settings.AI_ANALYSIS_RETRY_SECONDS)
+        return job.finished_at is None or job.finished_at < now - retry
+    # done 인데 분석 결과가 지워졌으면 다시
+    return not AIReviewAnalysis.objects.filter(isbn13=job.isbn13).exists()
+
+
+def ensure_job(isbn13: str, source: str = "user") -> AIAnalysisJob:
+    """
+    isbn13 분석 작업을 반환 (없으면 만들고, 돌려야 하면 백그라운드 실행 예약)
+    이미 대기/실행 중이면 그 작업에 붙는다.
+    """
+    try:
+        job, created = AIAnalysisJob.objects.get_or_create(isbn13=isbn13, defaults={"source": source})
+    except IntegrityError:
+        # 다른 요청이 방금 만든 경우
+        job, created = AIAnalysisJob.objects.get(isbn13=isbn13), False
+    registry.inc("ai_analysis_jobs_total", source=source, result="created" if created else "joined")
+
+    now = timezone.now()
+    if not created and not _needs_run(job, now):
+        return job
+    if job.status in TERMINAL:
+        # 끝난 작업을 다시 대기로 (동시에 여러 요청이 와도 한 번만 바뀜)
+        AIAnalysisJob.objects.filter(pk=job.pk, status=job.status).update(
+            status=AIAnalysisJob.PENDING, source=source, error="", result=None, updated_at=now,
+        )
+        job.refresh_from_db()
+
+    # 사용자가 기다리는 작업은 알라딘 우선순위도 사용자 쪽으로
+    if source == "user" and job.source != "user" and job.status == AIAnalysisJob.PENDING:
+        AIAnalysisJob.objects.filter(pk=job.pk).update(source="user")
+        job.source = "user"
+
+    run_in_background(f"ai-analysis:{isbn13}", lambda: run_job(job.pk))
+    return job
+
+
+# User-Agent 에 이 문자열이 있으면 크롤러로 보고 미리 분석하지 않음
+BOT_MARKERS = ("bot", "crawl", "spider", "slurp", "preview", "facebookexternalhit", "headless")
+
+
+def should_warm(request) -> bool:
+    """
+    상세 요청이 미리 분석을 시작할 만한지: 로그인 사용자는 항상, 비로그인은 AI_ANALYSIS_WARM_ANON_RATE 비율만, 봇은 안 함
+    """
+    agent = request.headers.get("User-Agent", "").lower()
+    if not agent or any(marker in agent for marker in BOT_MARKERS):
+        return False
+    if request.user.is_authenticated:
+        return True
+    return random.random() < settings.AI_ANALYSIS_WARM_ANON_RATE
+
+
+def warm_analysis(isbn13: str):
+    """
+    상세 페이지를 열었을 때 미리 분석 시작 (이미 있거나 GPT 서킷이 열려 있으면 하지 않음)
+    """
+    if not settings.AI_ANALYSIS_WARM_ON_DETAIL or breaker("openai").state == OPEN:
+        return
+    if AIReviewAnalysis.objects.filter(isbn13=isbn13).exists() or is_known_missing(isbn13):
+        return
+    try:
+        ensure_job(isbn13, source="warm")
+    except Exception as e:
+        # 미리 분석은 실패해도 상세 응답에 영향 없음
+        print(f"🚨 AI 분석 미리 시작 실패 ({isbn13}): {e}")
+
+
+def _claim(job_id: int) -> bool:
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.AI_ANALYSIS_JOB_STALE_SECONDS)
+    return AIAnalysisJob.objects.filter(pk=job_id).filter(
+        Q(status=AIAnalysisJob.PENDING) | Q(status=AIAnalysisJob.RUNNING, started_at__lt=stale)
+    ).update(
+        status=AIAnalysisJob.RUNNING, started_at=now, attempts=F("attempts") + 1, updated_at=now,
+    ) == 1
+
+
+def _analyze(isbn13: str):
+    """
+    반환: (status, error, result)
+    """
+    if AIReviewAnalysis.objects.filter(isbn13=isbn13).exists():
+        return AIAnalysisJob.DONE, "", None
+
+    aladin_data = get_aladin_data_complete(isbn13)
+    if not aladin_data:
+        return AIAnalysisJob.FAILED, NOT_FOUND, None
+
+    # 위키와 GPT 분석은 서로 독립이라 동시에 (위키 쪽은 DB 를 쓰지 않음)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="jandi-wiki") as pool:
+        wiki = pool.submit(get_wikipedia_author_info, aladin_data.get("author", ""))
+        ai_result = analyze_book_complete(aladin_data)
+        wiki_intro, wiki_img, wiki_url = wiki.result()
+
+    if not isinstance(ai_result, dict):
+        # GPT 장애 → 임시 응답만 작업에 남기고 분석 결과는 저장하지 않음 (AI_ANALYSIS_RETRY_SECONDS 뒤 재시도)
+        return AIAnalysisJob.FAILED, AI_FAILED, degraded_analysis_payload(aladin_data, wiki_intro, wiki_img)
+
+    AIReviewAnalysis.objects.get_or_create(isbn13=isbn13, defaults={
+        "story_summary": ai_result.get("story_summary", "") or "",
+        "summary_reviews": ai_result.get("summary_reviews", []) or [],
+        "keywords": ai_result.get("keywords", []) or [],
+        "recommend_targets": ai_result.get("recommend_targets", []) or [],
+        # ✅ 작가정보/사진은 위키로 고정
+        "author_info": wiki_intro or "",
+        "author_image": wiki_img or "",
+    })
+    return AIAnalysisJob.DONE, "", None
+
+
+def run_job(job_id: int):
+    if not _claim(job_id):
+        return  # 다른 워커가 이미 가져감
+    job = AIAnalysisJob.objects.get(pk=job_id)
+
+    try:
+        with aladin_priority(USER if job.source == "user" else BACKGROUND):
+            status, error, result = _analyze(job.isbn13)
+    except Exception as e:
+        print(f"🚨 AI 분석 작업 실패 ({job.isbn13}): {e}")
+        status, error, result = AIAnalysisJob.FAILED, ERROR, None
+
+    now = timezone.now()
+    AIAnalysisJob.objects.filter(pk=job_id).update(
+        status=status, error=error, result=result, finished_at=now, updated_at=now,
+    )
+    registry.inc("ai_analysis_jobs_finished_total", status=status, error=error or "none")
+    registry.observe("ai_analysis_job_seconds", (now - job.started_at).total_seconds(), source=job.source)
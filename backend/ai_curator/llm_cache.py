@@ -0,0 +1,93 @@
+# ai_curator/llm_cache.py
+
+"""
+GPT 응답 캐시 (내용 주소 방식)
+
+- 키: sha256(모델 + 메시지(system/user 프롬프트) + response_format + temperature 구간)
+  → 프롬프트가 한 글자라도 다르면 다른 키, 같으면 어느 뷰에서 불렀든 같은 키
+- 1단계: 워커별 TTLLRUCache, 2단계: LLMResponse 테이블 (재시작/워커 간에도 유지)
+- TTL: settings.LLM_CACHE_TTL, 개수: LLM_CACHE_MAX_ENTRIES 를 넘으면 오래 안 쓴 것부터 삭제
+  (정리는 저장 중 LLM_CACHE_PRUNE_RATE 비율에서만)
+- 메모리 캐시 값은 복사해서 주고받음 (호출한 쪽이 결과를 고쳐도 다른 요청에 새지 않도록)
+- hit/miss 는 /metrics 의 cache_requests_total{cache="llm"}
+"""
+
+import copy
+import hashlib
+import json
+import random
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from books.services.cache import TTLLRUCache
+from config.metrics import count_cache
+from .models import LLMResponse
+
+_MISSING = object()
+
+local_cache = TTLLRUCache(maxsize=settings.LLM_CACHE_LOCAL_MAXSIZE, ttl=settings.LLM_CACHE_TTL)
+
+
+def _temperature_bucket(temperature) -> str:
+    # 0.70 과 0.7 을 같게 (지정 안 하면 모델 기본값)
+    return "default" if temperature is None else f"{round(float(temperature), 1):.1f}"
+
+
+def chat_cache_key(model: str, messages, response_format=None, temperature=None) -> str:
+    raw = json.dumps(
+        {
+            "model": model,
+            "messages": [{"role": m["role"], "content": m["content"]} for m in messages],
+            "response_format": response_format,
+            "temperature": _temperature_bucket(temperature),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get(key: str):
+    value = local_cache.get(key, _MISSING)
+    if value is not _MISSING:
+        count_cache("llm", "hit")
+        return copy.deepcopy(value)
+
+    now = timezone.now()
+    row = LLMResponse.objects.filter(key=key, expires_at__gt=now).only("response").first()
+    if row is None:
+        count_cache("llm", "miss")
+        return None
+
+    count_cache("llm", "hit")
+    LLMResponse.objects.filter(pk=row.pk).update(hits=F("hits") + 1, last_used_at=now)
+    local_cache.set(key, copy.deepcopy(row.response))
+    return row.response
+
+
+def put(key: str, model: str, value):
+    now = timezone.now()
+    LLMResponse.objects.update_or_create(key=key, defaults={
+        "model": model,
+        "response": value,
+        "last_used_at": now,
+        "expires_at": now + timedelta(seconds=settings.LLM_CACHE_TTL),
+    })
+    local_cache.set(key, copy.deepcopy(value))
+    # 정리는 count + delete 라 저장할 때마다 하지 않고 일부에서만
+    if random.random() < settings.LLM_CACHE_PRUNE_RATE:
+        prune(now)
+
+
+def prune(now=None):
+    """
+    만료된 응답 삭제 + 최대 개수 초과분을 오래 안 쓴 것부터 삭제
+    """
+    now = now or timezone.now()
+    LLMResponse.objects.filter(expires_at__lte=now).delete()
+    overflow = LLMResponse.objects.count() - settings.LLM_CACHE_MAX_ENTRIES
+    if overflow > 0:
+        oldest = LLMResponse.objects.order_by("last_used_at").values_list("pk", flat=True)[:overflow]
+        LLMResponse.objects.filter(pk__in=list(oldest)).delete()
@@ -0,0 +1,40 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ai_curator.taste import answer_key, precompute
+
+
+class Command(BaseCommand):
+    help = "Precompute taste-test results (tree + 5 books) for all 128 answer combinations"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--variants", type=int, default=settings.TASTE_RESULT_VARIANTS,
+                            help="Results stored per answer combination")
+        parser.add_argument("--force", action="store_true",
+                            help="Regenerate every result, not only missing or stale ones")
+        parser.add_argument("--workers", type=int, default=4, help="Concurrent GPT calls")
+        parser.add_argument("--answers", action="append", default=None,
+                            help="Only this answer combination, e.g. 1212121 (repeatable)")
+
+    def handle(self, *args, **options):
+        keys = None
+        if options["answers"]:
+            keys = [answer_key(a) for a in options["answers"]]
+            if None in keys:
+                raise CommandError("--answers must be 7 digits of 1 or 2")
+        if options["variants"] < 1:
+            raise CommandError("--variants must be at least 1")
+
+        started = time.monotonic()
+        result = precompute(
+            variants=options["variants"],
+            force=options["force"],
+            workers=options["workers"],
+            keys=keys,
+            log=lambda msg: self.stdout.write(self.style.WARNING(msg)),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"planned={result['planned']} generated={result['generated']} failed={result['failed']} "
+            f"removed={result['removed']} ({time.monotonic() - started:.1f}s)"
+        ))
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_catalog(apps, schema_editor):
+    """
+    큐레이터 도서를 books.Book 카탈로그 행에 연결 (카탈로그에 없으면 큐레이터 데이터로 생성)
+    """
+    CuratorBook = apps.get_model("ai_curator", "Book")
+    CatalogBook = apps.get_model("books", "Book")
+
+    for cb in CuratorBook.objects.filter(catalog__isnull=True).iterator():
+        book, _ = CatalogBook.objects.get_or_create(
+            isbn13=cb.isbn13,
+            defaults={
+                "title": cb.title,
+                "author": cb.author,
+                "publisher": cb.publisher,
+                "description": cb.description,
+                "cover": cb.cover or "",
+                "category_name": cb.category_name,
+            },
+        )
+        cb.catalog_id = book.pk
+        cb.save(update_fields=["catalog"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_curator', '0006_rename_author_intro_aireviewanalysis_author_info_and_more'),
+        ('books', '0012_catalog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='catalog',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='curator_entries', to='books.book'),
+        ),
+        migrations.RunPython(link_catalog, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_curator', '0007_book_catalog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AIAnalysisJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('isbn13', models.CharField(max_length=13, unique=True)),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '분석 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=10)),
+                ('source', models.CharField(default='user', max_length=10)),
+                ('error', models.CharField(blank=True, default='', max_length=20)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_curator', '0009_llmresponse'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TasteResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('answer_key', models.CharField(max_length=7)),
+                ('variant', models.PositiveSmallIntegerField()),
+                ('tree', models.JSONField(blank=True, null=True)),
+                ('recommendations', models.JSONField(default=list)),
+                ('catalog_version', models.CharField(max_length=40)),
+                ('created_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('answer_key', 'variant'), name='uniq_taste_result_variant')],
+            },
+        ),
+    ]
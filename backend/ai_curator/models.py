@@ -10,6 +10,15 @@ class Book(models.Model):
     isbn13 = models.CharField(max_length=20, unique=True)
     category_name = models.CharField(max_length=255)
     cover = models.URLField(max_length=500, blank=True, null=True) 
+
+    # books.Book 카탈로그 행 (저장 시 isbn13 으로 연결)
+    catalog = models.ForeignKey(
+        "books.Book",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="curator_entries",
+    )
     
     def __str__(self):
         return self.title
@@ -33,4 +42,66 @@ class AIReviewAnalysis(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"{self.isbn13} 분석 데이터"
\ No newline at end of file
+        return f"{self.isbn13} 분석 데이터"
+
+
+class AIAnalysisJob(models.Model):
+    # ISBN 당 하나: 첫 요청이 만들고 이후 요청/워커는 같은 작업을 기다림
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "대기"),
+        (RUNNING, "분석 중"),
+        (DONE, "완료"),
+        (FAILED, "실패"),
+    ]
+
+    isbn13 = models.CharField(max_length=13, unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    source = models.CharField(max_length=10, default="user")       # user / warm (상세 페이지 미리 분석)
+    error = models.CharField(max_length=20, blank=True, default="")  # not_found / ai_failed / error
+    result = models.JSONField(null=True, blank=True)                # 실패 시 알라딘 설명으로 만든 임시 응답
+    attempts = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.isbn13} 분석 작업 ({self.status})"
+
+
+class LLMResponse(models.Model):
+    # GPT 응답 캐시 (ai_curator.llm_cache): 모델/메시지/응답 형식/temperature 가 같으면 다시 호출하지 않음
+    key = models.CharField(max_length=64, unique=True)   # 요청 내용의 sha256
+    model = models.CharField(max_length=50)
+    response = models.JSONField()                         # 파싱된 JSON 응답
+    hits = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(db_index=True)   # 개수 초과 시 오래 안 쓴 것부터 삭제
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.model} 응답 {self.key[:12]} (hit {self.hits})"
+
+
+class TasteResult(models.Model):
+    # 성향 테스트 결과 미리 계산 (ai_curator.taste): 답변 조합마다 variants 개 중 하나를 골라 응답
+    answer_key = models.CharField(max_length=7)             # "1212121" (답변 7개)
+    variant = models.PositiveSmallIntegerField()
+    tree = models.JSONField(null=True, blank=True)           # 나만의 나무
+    recommendations = models.JSONField(default=list)         # [{"book_id", "type", "reason"}, ...]
+    catalog_version = models.CharField(max_length=40)       # 만들 때의 큐레이터 도서 목록 (다르면 재생성 대상)
+    created_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["answer_key", "variant"], name="uniq_taste_result_variant"),
+        ]
+
+    def __str__(self):
+        return f"{self.answer_key} #{self.variant}"
@@ -1,16 +1,124 @@
 # backend/ai_curator/services.py
 
+import functools
+import httpx
 import requests
 import json
 import re
 import xml.etree.ElementTree as ET
 from django.conf import settings
-from openai import OpenAI
+from asgiref.sync import sync_to_async
+from openai import AsyncOpenAI, DefaultHttpxClient, OpenAI
+from config.cassettes import CassetteTransport, cassette_session
+from config.circuit import upstream_call
+from books.models import Book as CatalogBook
+from books.services.aladin import remember_missing
+from books.services.client import aladin_client, async_http_client
+from . import llm_cache
+
+@functools.cache
+def get_client() -> OpenAI:
+    # 처음 GPT 를 부를 때 만든다 (import 시점에 만들면 OPENAI_API_KEY 없이는 manage.py 명령이 모두 실패)
+    return OpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        timeout=settings.OPENAI_TIMEOUT,
+        max_retries=settings.OPENAI_MAX_RETRIES,
+        http_client=DefaultHttpxClient(transport=CassetteTransport("openai")),
+    )
+
+
+def aclient() -> AsyncOpenAI:
+    # ASGI 뷰용 (a 로 시작하는 함수들): 이벤트 루프별 공유 커넥션 풀 위에 가볍게 만든다
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        timeout=settings.OPENAI_TIMEOUT,
+        max_retries=settings.OPENAI_MAX_RETRIES,
+        http_client=async_http_client("openai"),
+    )
+
+
+def _chat_kwargs(model, messages, response_format, temperature) -> dict:
+    kwargs = {"model": model, "messages": messages, "response_format": response_format}
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    return kwargs
+
+
+def cached_chat_json(model: str, messages, response_format=None, temperature=None):
+    """
+    JSON 응답 GPT 호출 (같은 프롬프트면 llm_cache 에서, 실패는 저장하지 않고 그대로 raise)
+    """
+    response_format = response_format or {"type": "json_object"}
+    key = llm_cache.chat_cache_key(model, messages, response_format, temperature)
+    cached = llm_cache.get(key)
+    if cached is not None:
+        return cached
+
+    with upstream_call("openai", "chat"):
+        response = get_client().chat.completions.create(**_chat_kwargs(model, messages, response_format, temperature))
+    data = json.loads(response.choices[0].message.content)
+    llm_cache.put(key, model, data)
+    return data
+
+
+async def acached_chat_json(model: str, messages, response_format=None, temperature=None):
+    response_format = response_format or {"type": "json_object"}
+    key = llm_cache.chat_cache_key(model, messages, response_format, temperature)
+    cached = await sync_to_async(llm_cache.get)(key)
+    if cached is not None:
+        return cached
+
+    with upstream_call("openai", "chat"):
+        response = await aclient().chat.completions.create(**_chat_kwargs(model, messages, response_format, temperature))
+    data = json.loads(response.choices[0].message.content)
+    await sync_to_async(llm_cache.put)(key, model, data)
+    return data
 
-client = OpenAI(
-    api_key=settings.OPENAI_API_KEY,
-    base_url="https://gms.ssafy.io/gmsapi/api.openai.com/v1",
-)
+
+# 위키피디아도 녹화/재생 대상 (config.cassettes)
+wiki_session = cassette_session("wikipedia")
+WIKI_HEADERS = {"User-Agent": "JandiBook/1.0"}
+
+
+def _parse_aladin_item(xml_text: str):
+    root = ET.fromstring(xml_text)
+
+    # ✅ 네임스페이스 대응
+    item = root.find(".//{*}item")
+    if item is None:
+        return None
+
+    title = (item.findtext("{*}title") or "").strip()
+    author = (item.findtext("{*}author") or "").strip()
+    description = (item.findtext("{*}description") or "").strip()
+
+    reviews = []
+    for r in item.findall(".//{*}review"):
+        t = (r.findtext("{*}title") or "").strip()
+        t = t.replace("[100자평]", "").replace("[마이리뷰]", "").strip()
+        if t:
+            reviews.append(t)
+
+    return {
+        "title": title,
+        "author": author,
+        "description": description,
+        "reviews": reviews,
+    }
+
+
+def _catalog_book_data(book):
+    # 알라딘 장애/할당량 소진 → 카탈로그에 저장된 도서 정보로 대체 (독자 리뷰 없이 분석)
+    if book is None:
+        return None
+    return {
+        "title": book.title,
+        "author": book.author,
+        "description": book.description,
+        "reviews": [],
+    }
 
 
 def get_aladin_data_complete(isbn13: str):
@@ -19,53 +127,23 @@ def get_aladin_data_complete(isbn13: str):
         print("🚨 오류: settings.py에 ALADIN_TTB_KEY가 없습니다.")
         return None
 
-    url = "http://www.aladin.co.kr/ttb/api/ItemLookUp.aspx"
-    params = {
-        "ttbkey": ttb_key,
-        "itemIdType": "ISBN13",
-        "ItemId": isbn13,
-        "output": "xml",
-        "Version": "20131101",
-        "OptResult": "reviewList,description",
-    }
-
     try:
-        res = requests.get(url, params=params, timeout=7)
-        res.raise_for_status()
-        root = ET.fromstring(res.text)
-
-        # ✅ 네임스페이스 대응
-        item = root.find(".//{*}item")
-        if item is None:
-            return None
-
-        title = (item.findtext("{*}title") or "").strip()
-        author = (item.findtext("{*}author") or "").strip()
-        description = (item.findtext("{*}description") or "").strip()
-
-        reviews = []
-        for r in item.findall(".//{*}review"):
-            t = (r.findtext("{*}title") or "").strip()
-            t = t.replace("[100자평]", "").replace("[마이리뷰]", "").strip()
-            if t:
-                reviews.append(t)
-
-        return {
-            "title": title,
-            "author": author,
-            "description": description,
-            "reviews": reviews,
-        }
-
+        xml_text = aladin_client.item_lookup_xml(isbn13, opt_result="reviewList,description")
+        data = _parse_aladin_item(xml_text)
+        if data is None:
+            # 알라딘에 없는 ISBN → 짧게 기억해서 반복 호출 방지
+            remember_missing(isbn13)
+        return data
+
+    except requests.RequestException as e:
+        print(f"🚨 알라딘 API 요청 실패 (카탈로그 데이터 사용): {e}")
+        return _catalog_book_data(CatalogBook.objects.filter(isbn13=isbn13).first())
     except Exception as e:
         print(f"🚨 알라딘 API 요청 실패: {e}")
         return None
 
 
-def analyze_book_complete(book_data):
-    if not book_data:
-        return None
-
+def _analysis_messages(book_data):
     title = book_data["title"]
     author = book_data["author"]
     desc = book_data["description"] if book_data["description"] else "제공된 설명 없음"
@@ -108,23 +186,40 @@ def analyze_book_complete(book_data):
     
     조건: 반드시 JSON 형식을 지키고, 한국어 존댓말(~해요)을 사용하세요.
     """
+    return [
+        {"role": "system", "content": "당신은 유능한 북 큐레이터입니다. JSON 형식으로만 응답하세요."},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def analyze_book_complete(book_data):
+    if not book_data:
+        return None
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "당신은 유능한 북 큐레이터입니다. JSON 형식으로만 응답하세요."},
-                {"role": "user", "content": prompt},
-            ],
-            response_format={"type": "json_object"},
-        )
-        return json.loads(response.choices[0].message.content)
+        return cached_chat_json("gpt-4o-mini", _analysis_messages(book_data))
 
     except Exception as e:
         print(f"🚨 GPT 호출 오류: {e}")
         return None
 
 
+def degraded_analysis_payload(book_data, wiki_intro=None, wiki_img=None) -> dict:
+    """
+    GPT 분석을 못 했을 때 알라딘 데이터만으로 만든 응답 (degraded=True, 저장하지 않음)
+    """
+    return {
+        "story_summary": book_data.get("description") or "",
+        "summary_reviews": (book_data.get("reviews") or [])[:3],
+        "keywords": [],
+        "recommend_targets": [],
+        "author_info": wiki_intro or "",
+        "author_works": [],
+        "author_image": wiki_img or "",
+        "degraded": True,
+    }
+
+
 def _clean_author_for_wiki(author_name: str) -> str:
     if not author_name:
         return ""
@@ -142,47 +237,71 @@ def _clean_author_for_wiki(author_name: str) -> str:
     return s
 
 
-def get_wikipedia_author_info(author_name: str):
-    """
-    위키 소개글/썸네일 + (추가) 위키 페이지 URL까지 반환
-    """
-    if not author_name:
-        return None, None, None
-
-    clean_name = _clean_author_for_wiki(author_name)
-    if not clean_name:
-        return None, None, None
-
-    url = "https://ko.wikipedia.org/w/api.php"
-    params = {
+def _wiki_params(clean_name: str) -> dict:
+    # 불리언 플래그는 값과 무관하게 존재 여부만 보므로 1 로 (requests/httpx 인코딩 차이 방지)
+    return {
         "action": "query",
         "format": "json",
         "prop": "extracts|pageimages|info",
         "inprop": "url",
         "titles": clean_name,
         "pithumbsize": 300,
-        "exintro": True,
-        "explaintext": True,
+        "exintro": 1,
+        "explaintext": 1,
         "redirects": 1,
     }
 
+
+def _parse_wiki_page(data: dict):
+    pages = data.get("query", {}).get("pages", {})
+    if not pages:
+        return None, None, None
+
+    page_id = next(iter(pages))
+    if page_id == "-1":
+        return None, None, None
+
+    page = pages[page_id]
+    intro = page.get("extract", "") or ""
+    image_url = page.get("thumbnail", {}).get("source")
+    page_url = page.get("fullurl")
+    return intro, image_url, page_url
+
+
+def get_wikipedia_author_info(author_name: str):
+    """
+    위키 소개글/썸네일 + (추가) 위키 페이지 URL까지 반환
+    """
+    clean_name = _clean_author_for_wiki(author_name)
+    if not clean_name:
+        return None, None, None
+
     try:
-        res = requests.get(url, params=params, timeout=7, headers={"User-Agent": "JandiBook/1.0"})
-        data = res.json()
+        with upstream_call("wikipedia", "query"):
+            res = wiki_session.get(settings.WIKIPEDIA_API_URL, params=_wiki_params(clean_name),
+                                   timeout=settings.WIKIPEDIA_TIMEOUT, headers=WIKI_HEADERS)
+            data = res.json()
+        return _parse_wiki_page(data)
+
+    except Exception as e:
+        print(f"🚨 위키피디아 API 에러: {e}")
+        return None, None, None
 
-        pages = data.get("query", {}).get("pages", {})
-        if not pages:
-            return None, None, None
 
-        page_id = next(iter(pages))
-        if page_id == "-1":
-            return None, None, None
+async def aget_wikipedia_author_info(author_name: str):
+    clean_name = _clean_author_for_wiki(author_name)
+    if not clean_name:
+        return None, None, None
 
-        page = pages[page_id]
-        intro = page.get("extract", "") or ""
-        image_url = page.get("thumbnail", {}).get("source")
-        page_url = page.get("fullurl")
-        return intro, image_url, page_url
+    try:
+        with upstream_call("wikipedia", "query"):
+            connect, read = settings.WIKIPEDIA_TIMEOUT
+            res = await async_http_client("wikipedia").get(
+                settings.WIKIPEDIA_API_URL, params=_wiki_params(clean_name),
+                timeout=httpx.Timeout(read, connect=connect), headers=WIKI_HEADERS,
+            )
+            data = res.json()
+        return _parse_wiki_page(data)
 
     except Exception as e:
         print(f"🚨 위키피디아 API 에러: {e}")
@@ -224,16 +343,101 @@ def get_country_literature_info(country_name: str):
     """
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "당신은 세계 문학 전문가입니다. JSON 형식으로만 응답하세요."},
-                {"role": "user", "content": prompt},
-            ],
-            response_format={"type": "json_object"},
-        )
-        return json.loads(response.choices[0].message.content)
+        return cached_chat_json("gpt-4o-mini", [
+            {"role": "system", "content": "당신은 세계 문학 전문가입니다. JSON 형식으로만 응답하세요."},
+            {"role": "user", "content": prompt},
+        ])
 
     except Exception as e:
         print(f"🚨 GPT 호출 오류 (Book Travel): {e}")
         return None
+
+
+# ---- 성향 테스트 추천 ----
+
+def summarize_answers(answers) -> str:
+    """
+    성향 테스트 답변(1/2) → "대중적/베스트셀러, 감성/은유 중심, ..."
+    """
+    keywords_map = [
+        ["대중적/베스트셀러", "마이너/유니크"],
+        ["정보/팩트 중심", "감성/은유 중심"],
+        ["비판적/분석적", "공감/이입"],
+        ["탄탄한 서사/스토리", "여운/분위기"],
+        ["명확한 닫힌 결말", "열린 결말/상상"],
+        ["지식/성장/자기계발", "위로/힐링/도피"],
+        ["완독/끈기", "찍먹/흥미위주"]
+    ]
+
+    user_traits = []
+    for i, ans in enumerate(answers):
+        if i < len(keywords_map):
+            idx = int(ans) - 1
+            user_traits.append(keywords_map[i][idx])
+
+    return ", ".join(user_traits)
+
+
+def recommend_messages(user_summary: str, books):
+    # 프롬프트용 책 목록 텍스트 생성 (books: ai_curator.taste.candidate_books 의 dict, 설명은 이미 잘려 있음)
+    book_context = ""
+    for book in books:
+        # 카테고리 정보도 주면 AI가 판단하기 더 좋음
+        book_context += f"[ID:{book['id']}] {book['title']} (카테고리: {book['category_name']}) / 설명: {book['summary']}...\n"
+
+    # 프롬프트 작성 (5권 추천 요청 및 나무 추천 추가)
+    system_prompt = "당신은 사용자의 성향을 완벽하게 분석해주는 전문 북 큐레이터이자 심리 분석가입니다."
+    user_prompt = f"""
+    [사용자 성향]
+    {user_summary}
+
+    [도서 목록]
+    {book_context}
+
+    [요청사항]
+    1. 사용자의 성향을 분석하여 그와 어울리는 '나만의 나무'를 하나 선정해주세요.
+       - 나무 이름, 짧은 슬로건, 그 나무가 사용자와 왜 어울리는지에 대한 상세한 설명.
+       - 그 나무를 상징하는 색상들을 추출하세요:
+         - "point_color": 텍스트와 배지에 사용할 **채도가 높고 진한** 대표 색상 (예: 벚꽃-진분홍, 은행-진노랑, 소나무-진녹색)
+         - "bg_colors": 배경에 사용할 **매우 연하고 부드러운** 파스텔 톤 색상 2가지 (예: 벚꽃-연분홍/화이트, 은행-연노랑/베이지)
+       - 모든 색상은 Hex Code로 제공하세요.
+    2. 사용자의 성향을 분석하여 [도서 목록] 중 가장 어울리는 책 **5권**을 추천해주세요.
+       - 첫 번째 책: 사용자의 취향을 저격하는 **'운명의 책'**
+       - 나머지 4권: 사용자의 취향을 학장해주거나 새로운 즐거움을 줄 수 있는 책들
+    3. 각 책에 대해 추천하는 이유를 2문장 내외로 매력적으로 작성하세요.
+    4. 결과는 반드시 아래 JSON 포맷을 준수하여 출력하세요.
+
+    [JSON 출력 예시]
+    {{
+        "tree": {{
+            "name": "버드나무",
+            "tagline": "부드럽게 흔들리지만 절대 꺾이지 않는 마음",
+            "description": "당신은 주변의 변화에 유연하게 대처하면서도 자신만의 결을 잃지 않는 사람입니다. 이런 당신에게는...",
+            "point_color": "#059669",
+            "bg_colors": ["#f0fdf4", "#dcfce7"]
+        }},
+        "recommendations": [
+            {{
+                "book_id": 10,
+                "type": "운명의 책",
+                "reason": "당신의 논리적인 성향에 딱 맞는 과학적 통찰이 담겨 있습니다."
+            }},
+            {{ "book_id": 45, "type": "감성의 숲", "reason": "..." }},
+            {{ "book_id": 12, "type": "지식의 샘", "reason": "..." }},
+            {{ "book_id": 7, "type": "모험의 시작", "reason": "..." }},
+            {{ "book_id": 22, "type": "새로운 시도", "reason": "..." }}
+        ]
+    }}
+    """
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def fallback_recommendations(books, count: int = 5) -> dict:
+    # GPT 를 쓸 수 없을 때: 이미 무작위로 뽑은 후보 중 앞쪽 몇 권 (나무는 프론트 기본값 사용)
+    return {
+        "tree": None,
+        "recommendations": [{"book_id": b["id"], "type": "추천 도서", "reason": ""} for b in books[:count]],
+    }
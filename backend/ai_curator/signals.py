@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Book
+from .taste import category_index_cache, schedule_regeneration
+
+
+# 큐레이터 도서가 바뀌면 후보 id 목록을 비우고 성향 테스트 결과 재생성 (settings.TASTE_REGENERATE_ON_CHANGE)
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def on_curator_book_changed(sender, instance, raw=False, **kwargs):
+    category_index_cache.clear()
+    if raw:
+        return
+    schedule_regeneration()
@@ -0,0 +1,327 @@
+# ai_curator/taste.py
+
+"""
+성향 테스트 추천 (POST /api/ai_curator/recommend/)
+
+- 답변은 7개 × (1/2) 라 입력은 128가지뿐 → taste_precompute 명령으로 조합마다 결과(나무 + 책 5권)를
+  TASTE_RESULT_VARIANTS 개씩 미리 만들어 TasteResult 에 저장하고, 요청 때는 그중 하나를 골라 응답
+- 미리 만든 결과가 없으면(처음 배포, 잘못된 답변 형식) 예전처럼 GPT 를 바로 호출하고
+  변형 수가 모자라면 그 결과도 저장
+- 큐레이터 도서가 바뀌면 catalog_version 이 달라진 결과를 재생성 대상으로 본다
+  (TASTE_REGENERATE_ON_CHANGE 이면 백그라운드에서 바로, 아니면 다음 taste_precompute 때)
+"""
+
+import hashlib
+import itertools
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import Count, Max
+from django.db.models.functions import Substr
+from books.services.background import run_in_background
+from books.services.cache import TTLLRUCache
+from .models import Book, TasteResult
+from .services import cached_chat_json, fallback_recommendations, recommend_messages, summarize_answers
+
+ANSWER_COUNT = 7
+MODEL = "gpt-4o"
+TEMPERATURE = 0.7
+
+
+def answer_key(answers):
+    """
+    [1, 2, 1, ...] → "121..." (7개가 모두 1/2 가 아니면 None)
+    """
+    key = "".join(str(a).strip() for a in answers or [])
+    if len(key) != ANSWER_COUNT or set(key) - {"1", "2"}:
+        return None
+    return key
+
+
+def all_answer_keys():
+    return ["".join(p) for p in itertools.product("12", repeat=ANSWER_COUNT)]
+
+
+def catalog_version() -> str:
+    # 도서 추가/삭제를 알아채는 정도면 충분 (설명 수정은 추천 결과에 거의 영향 없음)
+    agg = Book.objects.aggregate(n=Count("id"), last=Max("id"))
+    return hashlib.sha1(f"{agg['n']}:{agg['last']}".encode()).hexdigest()
+
+
+# ---- 후보 도서 ----
+
+# 성향(summarize_answers 의 문구) → 잘 맞는 알라딘 1단계 카테고리 (없는 성향은 카테고리와 무관)
+TRAIT_CATEGORIES = {
+    "정보/팩트 중심": ["인문학", "과학", "사회과학", "역사", "경제경영"],
+    "감성/은유 중심": ["소설/시/희곡", "에세이"],
+    "탄탄한 서사/스토리": ["소설/시/희곡", "역사"],
+    "지식/성장/자기계발": ["자기계발", "경제경영", "인문학", "과학"],
+    "위로/힐링/도피": ["에세이", "소설/시/희곡", "만화"],
+}
+
+# {"all": [id, ...], "by_category": {카테고리: [id, ...]}} (워커별, 도서 저장/삭제 시 비움)
+category_index_cache = TTLLRUCache(maxsize=1, ttl=settings.TASTE_CATEGORY_INDEX_TTL)
+
+
+def top_category(category_name: str) -> str:
+    # "국내도서>소설/시/희곡>한국소설>..." → "소설/시/희곡"
+    parts = (category_name or "").split(">")
+    return parts[1] if len(parts) > 1 else parts[0]
+
+
+def category_index() -> dict:
+    index = category_index_cache.get("index")
+    if index is None:
+        by_category = {}
+        all_ids = []
+        # id 와 카테고리만 (설명 등 큰 컬럼은 읽지 않음)
+        for book_id, category_name in Book.objects.values_list("id", "category_name").iterator():
+            all_ids.append(book_id)
+            by_category.setdefault(top_category(category_name), []).append(book_id)
+        index = {"all": all_ids, "by_category": by_category}
+        category_index_cache.set("index", index)
+    return index
+
+
+def preferred_categories(user_summary: str) -> set:
+    traits = [t.strip() for t in (user_summary or "").split(",")]
+    return {category for t in traits for category in TRAIT_CATEGORIES.get(t, [])}
+
+
+def candidate_ids(user_summary: str, rng=random) -> list:
+    """
+    후보 id 를 고름: TASTE_PREFERRED_SHARE 만큼은 성향에 맞는 카테고리에서, 나머지는 전체에서 (다양성)
+    """
+    index = category_index()
+    size = settings.TASTE_CANDIDATE_BOOKS
+    if len(index["all"]) <= size:
+        return list(index["all"])
+
+    preferred = [
+        book_id
+        for category in sorted(preferred_categories(user_summary))
+        for book_id in index["by_category"].get(category, [])
+    ]
+    picked = set(rng.sample(preferred, min(len(preferred), int(size * settings.TASTE_PREFERRED_SHARE))))
+    # 나머지는 전체에서 겹치지 않게 (후보가 전체보다 훨씬 작으므로 몇 번 더 뽑으면 충분)
+    while len(picked) < size:
+        picked.update(rng.sample(index["all"], size - len(picked)))
+    ids = list(picked)
+    rng.shuffle(ids)
+    return ids
+
+
+def candidate_books(user_summary: str, rng=random) -> list:
+    """
+    GPT 에 보여줄 후보 [{"id", "title", "category_name", "summary"}] (설명은 DB 에서 잘라서)
+    """
+    ids = candidate_ids(user_summary, rng)
+    rows = Book.objects.filter(id__in=ids).values(
+        "id", "title", "category_name", summary=Substr("description", 1, settings.TASTE_DESCRIPTION_CHARS),
+    )
+    order = {book_id: i for i, book_id in enumerate(ids)}
+    return sorted(rows, key=lambda r: order[r["id"]])
+
+
+def clean_result(result_data, books) -> dict:
+    # book_id 는 정수로 맞추고 ("10" 으로 오는 경우), 후보에 없는 것 (GPT 가 지어낸 것) 은 버림
+    ids = {b["id"] for b in books}
+    recommendations = []
+    for item in result_data.get("recommendations", []) or []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            book_id = int(item.get("book_id"))
+        except (TypeError, ValueError):
+            continue
+        if book_id in ids:
+            recommendations.append(dict(item, book_id=book_id))
+    return {"tree": result_data.get("tree") or None, "recommendations": recommendations}
+
+
+def recommendation_payload(user_summary, result_data, degraded=False) -> dict:
+    items = result_data.get("recommendations", [])
+    # 추천된 책들을 한 번에 (결과를 만든 뒤 삭제된 도서는 빠짐)
+    books = Book.objects.only("id", "title", "author", "cover", "isbn13", "description").in_bulk(
+        [item.get("book_id") for item in items]
+    )
+    response_books = []
+    for item in items:
+        book_obj = books.get(item.get("book_id"))
+        if book_obj is None:
+            continue
+        response_books.append({
+            "id": book_obj.id,
+            "title": book_obj.title,
+            "author": book_obj.author,
+            "cover": book_obj.cover,
+            "isbn": book_obj.isbn13,
+            "description": book_obj.description,
+            "type": item.get("type"),
+            "reason": item.get("reason"),
+        })
+
+    return {
+        "analysis": user_summary,
+        "tree": result_data.get("tree") or {},   # 나무 정보
+        "books": response_books,                # 추천 책 5권 리스트
+        "degraded": degraded,
+    }
+
+
+# ---- 저장된 결과 ----
+
+def precomputed_recommendation(answers):
+    """
+    미리 만든 결과 중 하나로 응답 (없으면 None)
+    """
+    key = answer_key(answers)
+    if key is None:
+        return None
+    # 변형 번호를 여기서 골라 (answer_key, variant) 유니크 인덱스로 한 행만 (없으면 아무 변형이나)
+    results = TasteResult.objects.filter(answer_key=key)
+    result = (
+        results.filter(variant=random.randrange(settings.TASTE_RESULT_VARIANTS)).first()
+        or results.first()
+    )
+    if result is None:
+        return None
+    return recommendation_payload(
+        summarize_answers(answers),
+        {"tree": result.tree, "recommendations": result.recommendations},
+    )
+
+
+def store_result(key, result_data, version=None, variant=None) -> bool:
+    """
+    결과 저장 (variant 를 지정하지 않으면 빈 자리가 있을 때만)
+    """
+    if key is None or not result_data.get("recommendations"):
+        return False
+    if variant is None:
+        used = set(TasteResult.objects.filter(answer_key=key).values_list("variant", flat=True))
+        free = [v for v in range(settings.TASTE_RESULT_VARIANTS) if v not in used]
+        if not free:
+            return False
+        variant = free[0]
+    try:
+        TasteResult.objects.update_or_create(answer_key=key, variant=variant, defaults={
+            "tree": result_data.get("tree"),
+            "recommendations": result_data["recommendations"],
+            "catalog_version": version or catalog_version(),
+        })
+    except IntegrityError:
+        return False  # 동시에 같은 자리를 채운 경우
+    return True
+
+
+# ---- 요청 경로 ----
+
+def prepare_recommendation(answers):
+    """
+    반환: (미리 만든 응답, None, None) 또는 GPT 를 불러야 하면 (None, user_summary, 후보 도서)
+    """
+    payload = precomputed_recommendation(answers)
+    if payload is not None:
+        return payload, None, None
+    user_summary = summarize_answers(answers)
+    return None, user_summary, candidate_books(user_summary)
+
+
+def finish_recommendation(answers, user_summary, books, raw=None, error=None) -> dict:
+    """
+    GPT 응답(raw) 정리 → 저장 → 응답. GPT 가 실패했으면(error) 대체 추천 (degraded 로 표시)
+    동기/비동기 뷰가 GPT 호출만 각자 하고 나머지는 여기서 같이 쓴다.
+    """
+    if error is None:
+        try:
+            result_data = clean_result(raw, books)
+            store_result(answer_key(answers), result_data)
+            return recommendation_payload(user_summary, result_data)
+        except Exception as e:
+            error = e
+    print(f"🚨 GPT 호출 오류 (대체 추천으로 응답): {error}")
+    return recommendation_payload(user_summary, fallback_recommendations(books), degraded=True)
+
+
+def recommend(answers) -> dict:
+    payload, user_summary, books = prepare_recommendation(answers)
+    if payload is not None:
+        return payload
+
+    # 미리 만든 결과가 없음 → GPT 직접 호출 (OpenAI 장애/서킷 열림 → 대체 추천)
+    try:
+        raw = cached_chat_json(MODEL, recommend_messages(user_summary, books), temperature=TEMPERATURE)
+    except Exception as e:
+        return finish_recommendation(answers, user_summary, books, error=e)
+    return finish_recommendation(answers, user_summary, books, raw)
+
+
+# ---- 미리 계산 ----
+
+def _generate(key, books):
+    user_summary = summarize_answers(list(key))
+    return clean_result(
+        cached_chat_json(MODEL, recommend_messages(user_summary, books), temperature=TEMPERATURE), books,
+    )
+
+
+def precompute(variants=None, force=False, workers=4, keys=None, log=print) -> dict:
+    """
+    비어 있거나 catalog_version 이 다른 (답변 조합, 변형) 자리를 채운다 (force 면 전부 다시)
+    GPT 호출만 스레드에서, DB 는 이 스레드에서만 읽고 쓴다.
+    """
+    variants = variants or settings.TASTE_RESULT_VARIANTS
+    version = catalog_version()
+    current = {
+        (r["answer_key"], r["variant"]): r["catalog_version"]
+        for r in TasteResult.objects.values("answer_key", "variant", "catalog_version")
+    }
+    todo = [
+        (key, variant)
+        for key in (keys or all_answer_keys())
+        for variant in range(variants)
+        if force or current.get((key, variant)) != version
+    ]
+
+    # 변형마다 다른 후보 목록 → 다른 프롬프트 (LLM 캐시에 걸리지 않고 서로 다른 결과)
+    jobs = [(key, variant, candidate_books(summarize_answers(list(key)))) for key, variant in todo]
+    done = failed = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jandi-taste") as pool:
+        futures = {pool.submit(_generate, key, books): (key, variant) for key, variant, books in jobs}
+        for future in as_completed(futures):
+            key, variant = futures[future]
+            try:
+                result_data = future.result()
+            except Exception as e:
+                log(f"🚨 성향 결과 생성 실패 ({key} #{variant}): {e}")
+                failed += 1
+                continue
+            if store_result(key, result_data, version=version, variant=variant):
+                done += 1
+            else:
+                failed += 1
+
+    # 줄어든 변형 수보다 뒤의 자리는 정리 (keys 를 지정했으면 그 조합만)
+    stale = TasteResult.objects.filter(variant__gte=variants)
+    if keys:
+        stale = stale.filter(answer_key__in=keys)
+    removed, _ = stale.delete()
+    return {"planned": len(todo), "generated": done, "failed": failed, "removed": removed, "version": version}
+
+
+REGENERATE_PASSES = 3
+
+
+def _regenerate_until_current():
+    # 재생성 중에 도서가 또 바뀌면 한 번 더 (계속 바뀌는 중이면 REGENERATE_PASSES 번까지만, 나머지는 다음 변경/taste_precompute 때)
+    for _ in range(REGENERATE_PASSES):
+        version = precompute()["version"]
+        if version == catalog_version():
+            return
+
+
+def schedule_regeneration():
+    if settings.TASTE_REGENERATE_ON_CHANGE:
+        run_in_background("taste:regenerate", _regenerate_until_current)
@@ -1,3 +1,312 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from books.services.aladin import negative_cache
+from . import llm_cache, taste
+from .jobs import AI_FAILED, NOT_FOUND, _claim, ensure_job, run_job
+from .models import AIAnalysisJob, AIReviewAnalysis, Book, LLMResponse, TasteResult
+from .services import cached_chat_json
 
-# Create your tests here.
+ISBN = "9788936434120"
+
+AI_RESULT = {
+    "story_summary": "줄거리",
+    "summary_reviews": ["좋아요"],
+    "keywords": ["성장"],
+    "recommend_targets": ["청소년"],
+}
+
+
+# ---- AI 분석 작업 ----
+
+class AnalysisJobTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        negative_cache.local.clear()
+        self.client = APIClient()
+        # 백그라운드 실행은 테스트에서 직접 run_job 으로
+        patcher = mock.patch("ai_curator.jobs.run_in_background")
+        self.scheduled = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def analyze(self, job, aladin_data=None, ai_result=AI_RESULT):
+        with mock.patch("ai_curator.jobs.get_aladin_data_complete", return_value=aladin_data), \
+                mock.patch("ai_curator.jobs.analyze_book_complete", return_value=ai_result), \
+                mock.patch("ai_curator.jobs.get_wikipedia_author_info", return_value=("작가 소개", "", "")):
+            run_job(job.pk)
+        job.refresh_from_db()
+        return job
+
+    def test_claim_is_taken_once(self):
+        job = AIAnalysisJob.objects.create(isbn13=ISBN)
+        self.assertTrue(_claim(job.pk))
+        self.assertFalse(_claim(job.pk))
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (AIAnalysisJob.RUNNING, 1))
+
+    def test_stale_running_job_can_be_reclaimed(self):
+        job = AIAnalysisJob.objects.create(
+            isbn13=ISBN, status=AIAnalysisJob.RUNNING, started_at=timezone.now() - timedelta(days=1),
+        )
+        self.assertTrue(_claim(job.pk))
+
+    def test_request_returns_202_with_poll_url(self):
+        res = self.client.get(f"/api/ai_curator/{ISBN}/")
+
+        self.assertEqual(res.status_code, 202)
+        job = AIAnalysisJob.objects.get(isbn13=ISBN)
+        body = res.json()
+        self.assertEqual((body["job_id"], body["status"]), (job.id, AIAnalysisJob.PENDING))
+        self.assertTrue(body["poll_url"].endswith(f"/api/ai_curator/jobs/{job.id}/"))
+        self.assertIsNone(body["events_url"])   # WSGI 에서는 폴링만
+        self.assertEqual(res["Location"], body["poll_url"])
+        self.assertTrue(res["Retry-After"])
+        self.scheduled.assert_called_once()
+
+    def test_concurrent_requests_join_one_job(self):
+        first = self.client.get(f"/api/ai_curator/{ISBN}/").json()
+        second = self.client.get(f"/api/ai_curator/{ISBN}/").json()
+
+        self.assertEqual(first["job_id"], second["job_id"])
+        self.assertEqual(AIAnalysisJob.objects.count(), 1)
+
+    def test_poll_returns_result_when_done(self):
+        job = ensure_job(ISBN)
+        poll = f"/api/ai_curator/jobs/{job.id}/"
+        self.assertEqual(self.client.get(poll).json()["status"], AIAnalysisJob.PENDING)
+
+        self.analyze(job, aladin_data={"title": "책", "author": "저자"})
+
+        body = self.client.get(poll).json()
+        self.assertEqual(body["status"], AIAnalysisJob.DONE)
+        self.assertEqual(body["result"]["story_summary"], "줄거리")
+        self.assertEqual(body["result"]["author_info"], "작가 소개")
+        # 이후 요청은 작업 없이 저장된 분석 결과로 바로 응답
+        res = self.client.get(f"/api/ai_curator/{ISBN}/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["keywords"], ["성장"])
+
+    def test_missing_book_finishes_as_not_found(self):
+        job = self.analyze(ensure_job(ISBN), aladin_data=None)
+
+        self.assertEqual((job.status, job.error), (AIAnalysisJob.FAILED, NOT_FOUND))
+        self.assertFalse(AIReviewAnalysis.objects.exists())
+
+    def test_ai_failure_keeps_degraded_result_without_saving(self):
+        with mock.patch("ai_curator.jobs.degraded_analysis_payload", return_value={"story_summary": "설명"}):
+            job = self.analyze(ensure_job(ISBN), aladin_data={"title": "책", "author": "저자"}, ai_result=None)
+
+        self.assertEqual((job.status, job.error), (AIAnalysisJob.FAILED, AI_FAILED))
+        self.assertFalse(AIReviewAnalysis.objects.exists())
+        res = self.client.get(f"/api/ai_curator/jobs/{job.id}/")
+        self.assertEqual(res.json()["result"], {"story_summary": "설명"})
+
+    def test_poll_unknown_job_is_404(self):
+        self.assertEqual(self.client.get("/api/ai_curator/jobs/999/").status_code, 404)
+
+
+# ---- GPT 응답 캐시 ----
+
+MESSAGES = [
+    {"role": "system", "content": "도서 큐레이터"},
+    {"role": "user", "content": "추천해줘"},
+]
+
+
+def chat_completion(content: str):
+    message = mock.Mock(content=content)
+    return mock.Mock(choices=[mock.Mock(message=message)])
+
+
+class LLMCacheTests(TestCase):
+    def setUp(self):
+        llm_cache.local_cache.clear()
+
+    def test_key_ignores_float_formatting_and_extra_message_fields(self):
+        key = llm_cache.chat_cache_key("gpt", MESSAGES, {"type": "json_object"}, 0.7)
+        self.assertEqual(key, llm_cache.chat_cache_key("gpt", MESSAGES, {"type": "json_object"}, 0.70))
+        with_name = [{**m, "name": "x"} for m in MESSAGES]
+        self.assertEqual(key, llm_cache.chat_cache_key("gpt", with_name, {"type": "json_object"}, 0.7))
+
+    def test_key_changes_with_prompt_model_and_temperature(self):
+        key = llm_cache.chat_cache_key("gpt", MESSAGES, None, 0.7)
+        changed = [MESSAGES[0], {"role": "user", "content": "추천해줘!"}]
+        self.assertNotEqual(key, llm_cache.chat_cache_key("gpt", changed, None, 0.7))
+        self.assertNotEqual(key, llm_cache.chat_cache_key("gpt-mini", MESSAGES, None, 0.7))
+        self.assertNotEqual(key, llm_cache.chat_cache_key("gpt", MESSAGES, None, 0.2))
+        self.assertNotEqual(key, llm_cache.chat_cache_key("gpt", MESSAGES, None, None))
+
+    @override_settings(LLM_CACHE_PRUNE_RATE=0)
+    def test_put_then_get_from_memory_and_db(self):
+        key = llm_cache.chat_cache_key("gpt", MESSAGES)
+        self.assertIsNone(llm_cache.get(key))
+
+        llm_cache.put(key, "gpt", {"books": [1, 2]})
+        self.assertEqual(llm_cache.get(key), {"books": [1, 2]})
+
+        # 다른 워커(메모리 캐시 없음)는 DB 에서 읽고 사용 횟수를 올림
+        llm_cache.local_cache.clear()
+        self.assertEqual(llm_cache.get(key), {"books": [1, 2]})
+        self.assertEqual(LLMResponse.objects.get(key=key).hits, 1)
+
+    @override_settings(LLM_CACHE_PRUNE_RATE=0)
+    def test_callers_get_copies(self):
+        key = llm_cache.chat_cache_key("gpt", MESSAGES)
+        value = {"books": [1, 2]}
+        llm_cache.put(key, "gpt", value)
+        value["books"].append(3)   # 저장한 쪽이 고쳐도
+
+        first = llm_cache.get(key)
+        first["books"].append(4)   # 받은 쪽이 고쳐도
+        self.assertEqual(llm_cache.get(key), {"books": [1, 2]})
+
+    def test_expired_rows_are_misses(self):
+        key = llm_cache.chat_cache_key("gpt", MESSAGES)
+        LLMResponse.objects.create(
+            key=key, model="gpt", response={"old": True},
+            last_used_at=timezone.now(), expires_at=timezone.now() - timedelta(seconds=1),
+        )
+        self.assertIsNone(llm_cache.get(key))
+
+    @override_settings(LLM_CACHE_MAX_ENTRIES=2, LLM_CACHE_PRUNE_RATE=0)
+    def test_prune_drops_least_recently_used(self):
+        now = timezone.now()
+        for i in range(3):
+            LLMResponse.objects.create(
+                key=f"k{i}", model="gpt", response={},
+                last_used_at=now - timedelta(minutes=10 - i), expires_at=now + timedelta(days=1),
+            )
+        llm_cache.prune()
+        self.assertEqual(set(LLMResponse.objects.values_list("key", flat=True)), {"k1", "k2"})
+
+    @override_settings(LLM_CACHE_PRUNE_RATE=0)
+    def test_cached_chat_json_calls_openai_once(self):
+        client = mock.Mock()
+        client.chat.completions.create.return_value = chat_completion('{"answer": 1}')
+        with mock.patch("ai_curator.services.get_client", return_value=client):
+            self.assertEqual(cached_chat_json("gpt", MESSAGES, temperature=0.7), {"answer": 1})
+            self.assertEqual(cached_chat_json("gpt", MESSAGES, temperature=0.70), {"answer": 1})
+        client.chat.completions.create.assert_called_once()
+
+    def test_failed_call_is_not_cached(self):
+        client = mock.Mock()
+        client.chat.completions.create.side_effect = [RuntimeError("timeout"), chat_completion('{"answer": 2}')]
+        with mock.patch("ai_curator.services.get_client", return_value=client):
+            with self.assertRaises(RuntimeError):
+                cached_chat_json("gpt", MESSAGES)
+            self.assertEqual(cached_chat_json("gpt", MESSAGES), {"answer": 2})
+        self.assertEqual(client.chat.completions.create.call_count, 2)
+
+
+# ---- 성향 테스트 추천 ----
+
+KEY = "1212121"
+OTHER_KEY = "2222222"
+
+
+class TasteRecommendationTests(TestCase):
+    def setUp(self):
+        self.books = [
+            Book.objects.create(
+                title=f"책 {i}", author="저자", publisher="출판사", description="설명",
+                isbn13=f"97889000000{i:02d}", category_name="국내도서>소설/시/희곡",
+            )
+            for i in range(3)
+        ]
+        self.ids = [b.id for b in self.books]
+
+    def gpt_result(self, *args, **kwargs):
+        # GPT 는 book_id 를 문자열로 주기도 하고, 후보에 없는 id 를 지어내기도 함
+        return {
+            "tree": {"name": "소나무"},
+            "recommendations": [
+                {"book_id": str(self.ids[0]), "type": "인생책", "reason": "이유"},
+                {"book_id": 99999, "type": "지어낸 책", "reason": ""},
+                "잘못된 항목",
+            ],
+        }
+
+    def test_clean_result_coerces_and_filters_book_ids(self):
+        candidates = [{"id": i} for i in self.ids]
+        result = taste.clean_result(self.gpt_result(), candidates)
+
+        self.assertEqual(result["tree"], {"name": "소나무"})
+        self.assertEqual([r["book_id"] for r in result["recommendations"]], [self.ids[0]])
+
+    def test_answer_key(self):
+        self.assertEqual(taste.answer_key([1, 2, 1, 2, 1, 2, 1]), KEY)
+        self.assertEqual(taste.answer_key(["1", "2", "1", "2", "1", "2", "1"]), KEY)
+        self.assertIsNone(taste.answer_key([1, 2, 3, 2, 1, 2, 1]))
+        self.assertIsNone(taste.answer_key([1, 2]))
+        self.assertEqual(len(taste.all_answer_keys()), 128)
+
+    def test_precompute_fills_variants_once_per_catalog_version(self):
+        with mock.patch("ai_curator.taste.cached_chat_json", side_effect=self.gpt_result) as gpt:
+            stats = taste.precompute(variants=2, workers=2, keys=[KEY, OTHER_KEY], log=lambda *_: None)
+            self.assertEqual((stats["planned"], stats["generated"], stats["failed"]), (4, 4, 0))
+            self.assertEqual(gpt.call_count, 4)
+
+            # 도서 목록이 그대로면 다시 만들지 않음
+            self.assertEqual(taste.precompute(variants=2, keys=[KEY, OTHER_KEY])["planned"], 0)
+
+            # 도서가 추가되면 catalog_version 이 달라져 재생성 대상
+            Book.objects.create(
+                title="새 책", author="저자", publisher="출판사", description="",
+                isbn13="9788900000099", category_name="국내도서>에세이",
+            )
+            self.assertEqual(taste.precompute(variants=2, keys=[KEY])["planned"], 2)
+
+        result = TasteResult.objects.get(answer_key=KEY, variant=0)
+        self.assertEqual(result.recommendations[0]["book_id"], self.ids[0])
+
+    def test_precompute_prunes_extra_variants_only_for_given_keys(self):
+        for key in (KEY, OTHER_KEY):
+            for variant in range(3):
+                TasteResult.objects.create(
+                    answer_key=key, variant=variant, recommendations=[{"book_id": self.ids[0]}],
+                    catalog_version=taste.catalog_version(),
+                )
+
+        stats = taste.precompute(variants=2, keys=[KEY])
+
+        self.assertEqual((stats["planned"], stats["removed"]), (0, 1))
+        self.assertEqual(TasteResult.objects.filter(answer_key=KEY).count(), 2)
+        self.assertEqual(TasteResult.objects.filter(answer_key=OTHER_KEY).count(), 3)
+
+    def test_recommend_uses_precomputed_result_without_gpt(self):
+        TasteResult.objects.create(
+            answer_key=KEY, variant=0, tree={"name": "소나무"},
+            recommendations=[{"book_id": self.ids[1], "type": "인생책", "reason": "이유"}],
+            catalog_version=taste.catalog_version(),
+        )
+        with mock.patch("ai_curator.taste.cached_chat_json") as gpt:
+            payload = taste.recommend(list(KEY))
+        gpt.assert_not_called()
+        self.assertEqual([b["id"] for b in payload["books"]], [self.ids[1]])
+        self.assertFalse(payload["degraded"])
+
+    def test_recommend_without_precomputed_result_stores_gpt_answer(self):
+        with mock.patch("ai_curator.taste.cached_chat_json", side_effect=self.gpt_result):
+            payload = taste.recommend(list(KEY))
+
+        self.assertEqual([b["id"] for b in payload["books"]], [self.ids[0]])
+        self.assertTrue(TasteResult.objects.filter(answer_key=KEY).exists())
+
+    def test_gpt_failure_falls_back_to_candidates(self):
+        with mock.patch("ai_curator.taste.cached_chat_json", side_effect=RuntimeError("timeout")):
+            payload = taste.recommend(list(KEY))
+
+        self.assertTrue(payload["degraded"])
+        self.assertEqual(sorted(b["id"] for b in payload["books"]), sorted(self.ids))
+        self.assertFalse(TasteResult.objects.exists())
+
+    def test_regeneration_gives_up_after_passes(self):
+        # 재생성 중에 도서가 계속 바뀌면 REGENERATE_PASSES 번까지만
+        with mock.patch("ai_curator.taste.precompute", return_value={"version": "old"}) as precompute, \
+                mock.patch("ai_curator.taste.catalog_version", return_value="new"):
+            taste._regenerate_until_current()
+        self.assertEqual(precompute.call_count, taste.REGENERATE_PASSES)
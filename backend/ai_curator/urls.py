@@ -1,11 +1,21 @@
 # ai_curator/urls.py
+from django.conf import settings
 from django.urls import path
-from .views import recommend_book, book_ai_review, book_travel, get_supported_countries
+from . import async_views, views
+
+# 외부 호출이 대부분인 뷰는 ASYNC_VIEWS 일 때 비동기 버전으로
+io_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
-    path("recommend/", recommend_book, name="ai-curator-recommend"),
-    path("travel/", book_travel, name="book-travel"),
-    path("travel/countries/", get_supported_countries, name="supported-countries"),
-    path("<str:isbn13>/", book_ai_review, name="book-ai-review"),
+    path("recommend/", io_views.recommend_book, name="ai-curator-recommend"),
+    path("travel/", io_views.book_travel, name="book-travel"),
+    path("travel/countries/", views.get_supported_countries, name="supported-countries"),
+    path("jobs/<int:job_id>/", views.ai_analysis_job, name="ai-analysis-job"),
+    path("<str:isbn13>/", io_views.book_ai_review, name="book-ai-review"),
 ]
 
+# SSE 는 연결이 길어서 ASGI 에서만 (WSGI 에서는 연결마다 워커 스레드를 잡음)
+if settings.ASYNC_VIEWS:
+    urlpatterns.insert(-1, path(
+        "jobs/<int:job_id>/events/", async_views.ai_analysis_job_events, name="ai-analysis-job-events",
+    ))
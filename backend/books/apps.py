@@ -4,3 +4,23 @@ from django.apps import AppConfig
 class BooksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'books'
+
+    def ready(self):
+        from . import signals
+        self._schedule_warmup()
+
+    def _schedule_warmup(self):
+        import sys
+        from django.conf import settings
+
+        if not settings.ALADIN_WARMUP_ON_BOOT:
+            return
+        # migrate 같은 관리 명령에서는 건너뜀 (runserver 만 허용)
+        if sys.argv and sys.argv[0].endswith("manage.py") and sys.argv[1:2] != ["runserver"]:
+            return
+
+        from .services.background import run_in_background
+        from .services.prewarm import run_refresh_cycle
+
+        # 부팅 경로를 막지 않도록 백그라운드에서 목록만 빠르게 채움
+        run_in_background("aladin:warmup", lambda: run_refresh_cycle(authors=0, trending=0))
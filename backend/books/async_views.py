@@ -0,0 +1,43 @@
+# books/async_views.py
+# settings.ASYNC_VIEWS 일 때 쓰는 비동기 버전 (uvicorn 등 ASGI 서버에서). 응답 모양은 views.py 와 같다.
+
+import requests
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from config.http import async_api_view
+from .services.aladin import asearch_books
+from .services.local_search import search_local
+from .views import decorate_search_items
+
+
+@async_api_view(["GET"])
+async def book_search(request):
+    q = request.GET.get("q")
+    if not q:
+        return JsonResponse({"error": "q parameter is required"}, status=400)
+
+    query_type = request.GET.get("type", "Keyword")
+    page = int(request.GET.get("page", 1))
+    size = int(request.GET.get("size", 10))
+    sort = request.GET.get("sort", "Accuracy")
+    category_id = request.GET.get("category", 0)
+
+    source = request.GET.get("source", "aladin")
+    if source == "local":
+        data = await sync_to_async(search_local)(q, page=page, size=size)
+    else:
+        try:
+            data = await asearch_books(q, query_type=query_type, page=page, size=size, sort=sort, category_id=category_id)
+        except requests.RequestException as e:
+            print(f"🚨 알라딘 검색 API 에러 (로컬 검색으로 대체): {e}")
+            data = await sync_to_async(search_local)(q, page=page, size=size)
+            source = "local"
+
+    items = await sync_to_async(decorate_search_items)(request.user, data["items"])
+    return JsonResponse({
+        "total": data["total"],
+        "source": source,
+        "page": page,
+        "size": size,
+        "items": items,
+    })
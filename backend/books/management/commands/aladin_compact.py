@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from books.services.eviction import compact_author_sales
+
+
+class Command(BaseCommand):
+    help = "Evict cold AuthorSales:* cache keys down to the configured key/row caps"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-keys", type=int, default=settings.ALADIN_AUTHOR_SALES_MAX_KEYS)
+        parser.add_argument("--max-rows", type=int, default=settings.ALADIN_AUTHOR_SALES_MAX_ROWS)
+        parser.add_argument("--batch-size", type=int, default=settings.ALADIN_EVICTION_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        result = compact_author_sales(
+            max_keys=options["max_keys"],
+            max_rows=options["max_rows"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"keys={result['keys_before']} rows={result['rows_before']} → "
+            f"evicted_keys={result['evicted_keys']} deleted_rows={result['deleted_rows']}"
+        ))
@@ -0,0 +1,53 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from books.services.eviction import compact_author_sales
+from books.services.prewarm import run_refresh_cycle, next_delay
+
+
+class Command(BaseCommand):
+    help = "Refresh Aladin-backed caches (lists, AuthorSales:*, trending books) before they expire"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--daemon", action="store_true", help="Keep running and refresh on a jittered schedule")
+        parser.add_argument("--interval", type=float, default=settings.ALADIN_REFRESH_INTERVAL,
+                            help="Seconds between cycles in daemon mode")
+        parser.add_argument("--jitter", type=float, default=0.2, help="Random +/- fraction applied to the interval")
+        parser.add_argument("--concurrency", type=int, default=4, help="Max refreshes running at once")
+        parser.add_argument("--authors", type=int, default=20, help="Number of most-bookmarked authors to refresh")
+        parser.add_argument("--trending", type=int, default=50, help="Number of trending ISBNs to hydrate")
+        parser.add_argument("--budget", type=int, default=settings.ALADIN_REFRESH_CALL_BUDGET,
+                            help="Max Aladin calls per cycle")
+        parser.add_argument("--no-compact", action="store_true",
+                            help="Skip evicting cold AuthorSales:* keys after each cycle")
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            result = run_refresh_cycle(
+                authors=options["authors"],
+                trending=options["trending"],
+                concurrency=options["concurrency"],
+                budget=options["budget"],
+                log=lambda msg: self.stdout.write(self.style.WARNING(msg)),
+            )
+            rows = " ".join(f"{k}={v}" for k, v in result["rows"].items())
+            self.stdout.write(self.style.SUCCESS(
+                f"planned={result['planned']} run={result['run']} skipped={result['skipped']} "
+                f"failed={result['failed']} calls={result['calls']} | {rows} "
+                f"({time.monotonic() - started:.1f}s)"
+            ))
+
+            if not options["no_compact"]:
+                compacted = compact_author_sales()
+                if compacted["evicted_keys"]:
+                    self.stdout.write(
+                        f"compacted AuthorSales: evicted_keys={compacted['evicted_keys']} "
+                        f"deleted_rows={compacted['deleted_rows']}"
+                    )
+
+            if not options["daemon"]:
+                return
+
+            time.sleep(next_delay(options["interval"], options["jitter"]))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from books.services.stats import rebuild_book_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute BookStats from reviews and bookmarks"
+
+    def handle(self, *args, **options):
+        count = rebuild_book_stats()
+        self.stdout.write(self.style.SUCCESS(f"book_stats={count}"))
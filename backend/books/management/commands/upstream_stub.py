@@ -0,0 +1,103 @@
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from config.cassettes import cassette_content, load_cassette, request_key
+
+
+def _error_body(upstream: str, status: int) -> bytes:
+    # 각 서비스가 실제로 내려주는 오류 모양을 흉내
+    if upstream == "openai":
+        body = {"error": {"message": f"stub injected error ({status})", "type": "stub_error"}}
+    elif upstream == "aladin":
+        body = {"errorCode": status, "errorMessage": "stub injected error"}
+    else:
+        body = {"error": f"stub injected error ({status})"}
+    return json.dumps(body).encode("utf-8")
+
+
+class Command(BaseCommand):
+    help = "Serve recorded Aladin/Wikipedia/OpenAI responses with configurable latency and error injection"
+
+    def add_arguments(self, parser):
+        conf = settings.UPSTREAM_STUB
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--latency", default=str(conf["latency"]),
+                            help='"recorded" (replay recorded duration) or fixed milliseconds')
+        parser.add_argument("--latency-scale", type=float, default=conf["latency_scale"],
+                            help="Multiplier applied to recorded latency")
+        parser.add_argument("--jitter", type=float, default=conf["jitter"], help="Random +/- fraction applied to latency")
+        parser.add_argument("--error-rate", type=float, default=conf["error_rate"])
+        parser.add_argument("--error-status", type=int, default=conf["error_status"])
+        parser.add_argument("--timeout-rate", type=float, default=conf["timeout_rate"],
+                            help="Fraction of requests that hang for --hang-seconds")
+        parser.add_argument("--hang-seconds", type=float, default=conf["hang_seconds"])
+        parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible injection")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        fixed_latency = None if options["latency"] == "recorded" else float(options["latency"])
+        log = self.stdout.write
+
+        def delay_for(entry):
+            base = fixed_latency if fixed_latency is not None else entry.get("elapsed_ms", 0) * options["latency_scale"]
+            jitter = options["jitter"]
+            return max(0.0, base * (1 + rng.uniform(-jitter, jitter))) / 1000
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, status, content, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def _serve(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+
+                # /<upstream>/... → 녹화 때와 같은 키
+                upstream = self.path.lstrip("/").split("/", 1)[0].split("?", 1)[0]
+                req = request_key(upstream, self.command, self.path, body)
+
+                roll = rng.random()
+                if roll < options["timeout_rate"]:
+                    time.sleep(options["hang_seconds"])
+                elif roll < options["timeout_rate"] + options["error_rate"]:
+                    time.sleep(delay_for({}))
+                    return self._reply(options["error_status"], _error_body(upstream, options["error_status"]),
+                                       "application/json")
+
+                entry = load_cassette(req)
+                if entry is None:
+                    log(f"miss {upstream}/{req['endpoint']} {req['key']}")
+                    return self._reply(404, json.dumps({"error": "no recording", "key": req["key"]}).encode(),
+                                       "application/json")
+
+                time.sleep(delay_for(entry))
+                self._reply(entry["status"], cassette_content(entry), entry.get("content_type") or "application/json")
+
+            do_GET = _serve
+            do_POST = _serve
+
+            def log_message(self, fmt, *args):
+                pass
+
+        server = ThreadingHTTPServer((options["host"], options["port"]), Handler)
+        self.stdout.write(self.style.SUCCESS(
+            f"upstream stub on http://{options['host']}:{options['port']} "
+            f"(cassettes: {settings.UPSTREAM_CASSETTE_DIR}) — set UPSTREAM_STUB_URL to this address"
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,120 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:38
+
+from django.db import migrations, models
+
+
+FTS_TABLE = "books_searchdocument_fts"
+FTS_COLUMNS = "title, author, publisher, category_name, description"
+
+
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "sqlite":
+        # external content FTS5 테이블 + 원본 테이블 변경을 따라가는 트리거
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"{FTS_COLUMNS}, content='books_searchdocument', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER books_searchdocument_ai AFTER INSERT ON books_searchdocument BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS}) "
+            f"VALUES (new.id, new.title, new.author, new.publisher, new.category_name, new.description); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER books_searchdocument_ad AFTER DELETE ON books_searchdocument BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {FTS_COLUMNS}) "
+            f"VALUES ('delete', old.id, old.title, old.author, old.publisher, old.category_name, old.description); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER books_searchdocument_au AFTER UPDATE ON books_searchdocument BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {FTS_COLUMNS}) "
+            f"VALUES ('delete', old.id, old.title, old.author, old.publisher, old.category_name, old.description); "
+            f"INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS}) "
+            f"VALUES (new.id, new.title, new.author, new.publisher, new.category_name, new.description); END"
+        )
+    elif vendor == "postgresql":
+        # books.services.local_search 의 SearchVector 와 같은 식이어야 인덱스를 탄다
+        schema_editor.execute(
+            "CREATE INDEX books_searchdocument_fts_idx ON books_searchdocument USING GIN ("
+            "to_tsvector('simple'::regconfig, "
+            "COALESCE(title, '') || ' ' || COALESCE(author, '') || ' ' || COALESCE(publisher, '') || ' ' || "
+            "COALESCE(category_name, '') || ' ' || COALESCE(description, '')))"
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "sqlite":
+        for trigger in ("books_searchdocument_ai", "books_searchdocument_ad", "books_searchdocument_au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS books_searchdocument_fts_idx")
+
+
+def populate_documents(apps, schema_editor):
+    SearchDocument = apps.get_model("books", "SearchDocument")
+    Book = apps.get_model("books", "Book")
+    AladinListItem = apps.get_model("books", "AladinListItem")
+    CuratorBook = apps.get_model("ai_curator", "Book")
+
+    docs = {}
+    # 우선순위가 낮은 것부터 채워서 뒤에 오는 것이 덮어쓰도록
+    for it in AladinListItem.objects.exclude(isbn13="").order_by("id"):
+        docs[it.isbn13] = dict(
+            title=it.title, author=it.author, publisher=it.publisher,
+            category_name=it.category_name, description=it.description,
+            cover=it.cover, pub_date=it.pub_date, sales_point=it.sales_point or 0,
+            customer_review_rank=it.customer_review_rank,
+        )
+    for b in CuratorBook.objects.exclude(isbn13=""):
+        docs[b.isbn13] = dict(
+            docs.get(b.isbn13, {}),
+            title=b.title, author=b.author, publisher=b.publisher,
+            category_name=b.category_name, description=b.description, cover=b.cover or "",
+        )
+    for b in Book.objects.all():
+        docs[b.isbn13] = dict(
+            title=b.title, author=b.author, publisher=b.publisher,
+            category_name=b.category_name, description=b.description,
+            cover=b.cover, pub_date=b.pub_date, sales_point=b.sales_point or 0,
+            customer_review_rank=b.customer_review_rank,
+        )
+
+    SearchDocument.objects.bulk_create(
+        [SearchDocument(isbn13=isbn13, **fields) for isbn13, fields in docs.items()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0008_fetchlock'),
+        ('ai_curator', '0006_rename_author_intro_aireviewanalysis_author_info_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('isbn13', models.CharField(max_length=20, unique=True)),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('author', models.CharField(blank=True, max_length=255)),
+                ('publisher', models.CharField(blank=True, max_length=255)),
+                ('category_name', models.CharField(blank=True, max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('cover', models.URLField(blank=True, max_length=500)),
+                ('pub_date', models.DateField(blank=True, null=True)),
+                ('sales_point', models.IntegerField(default=0)),
+                ('customer_review_rank', models.IntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(populate_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0009_searchdocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aladinlistitem',
+            name='payload_hash',
+            field=models.CharField(blank=True, max_length=40),
+        ),
+    ]
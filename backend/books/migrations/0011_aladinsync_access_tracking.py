@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0010_aladinlistitem_payload_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aladinsync',
+            name='hit_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='aladinsync',
+            name='last_accessed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Book 카탈로그 3/3: 옮긴 컬럼 삭제 + FK NOT NULL
+# (다른 앱 마이그레이션이 이 이름에 의존하므로 마지막 단계가 0012_catalog)
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0012_catalog_link'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='aladinlistitem',
+            name='author',
+        ),
+        migrations.RemoveField(
+            model_name='aladinlistitem',
+            name='category_id',
+        ),
+        migrations.RemoveField(
+            model_name='aladinlistitem',
+            name='category_name',
+        ),
+        migrations.RemoveField(
+            model_name='aladinlistitem',
+            name='cover',
+        ),
+        migrations.RemoveField(
+            model_name='aladinlistitem',
+            name='customer_review_rank',
+        ),
+        migrations.RemoveField(
+            model_name='aladinlistitem',
+            name='description',
+        ),
+        migrations.RemoveField(
+            model_name='aladinlistitem',
+            name='isbn',
+        ),
+        migrations.RemoveField(
+            model_name='aladinlistitem',
+            name='isbn13',
+        ),
+        migrations.RemoveField(
+            model_name='aladinlistitem',
+            name='mall_type',
+        ),
+        migrations.RemoveField(
+            model_name='aladinlistitem',
+            name='payload_hash',
+        ),
+        migrations.RemoveField(
+            model_name='aladinlistitem',
+            name='pub_date',
+        ),
+        migrations.RemoveField(
+            model_name='aladinlistitem',
+            name='publisher',
+        ),
+        migrations.RemoveField(
+            model_name='aladinlistitem',
+            name='title',
+        ),
+        migrations.AlterField(
+            model_name='aladinlistitem',
+            name='book',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='list_entries', to='books.book'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+# Book 카탈로그 1/3: 컬럼 추가만 (PostgreSQL 에서는 데이터 변경과 ALTER TABLE 을 한 트랜잭션에 섞을 수 없어 나눔)
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0011_aladinsync_access_tracking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='item_id',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='book',
+            name='pub_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='payload_hash',
+            field=models.CharField(blank=True, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='aladinlistitem',
+            name='book',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='list_entries', to='books.book'),
+        ),
+    ]
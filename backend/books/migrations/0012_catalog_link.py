@@ -0,0 +1,78 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:20
+
+from django.db import migrations
+
+
+# 목록 행에만 있던 도서 내용 컬럼 (Book 카탈로그로 옮김)
+LIST_CONTENT_FIELDS = [
+    "category_id",
+    "category_name",
+    "title",
+    "author",
+    "publisher",
+    "pub_date",
+    "description",
+    "cover",
+    "customer_review_rank",
+]
+
+
+def link_list_items(apps, schema_editor):
+    """
+    AladinListItem 의 내용을 isbn13 기준 Book 카탈로그 행으로 합치고 FK 로 연결.
+    isbn13 이 없는 목록 행은 카탈로그에 넣을 수 없으므로 지운다 (다음 갱신 때 다시 받음).
+    """
+    Book = apps.get_model("books", "Book")
+    AladinListItem = apps.get_model("books", "AladinListItem")
+
+    orphan_ids = []
+    for it in AladinListItem.objects.order_by("id").iterator():
+        if not it.isbn13:
+            orphan_ids.append(it.pk)
+            continue
+
+        defaults = {name: getattr(it, name) for name in LIST_CONTENT_FIELDS}
+        defaults["item_id"] = it.item_id
+        defaults["sales_point"] = it.sales_point
+        book, created = Book.objects.get_or_create(isbn13=it.isbn13, defaults=defaults)
+        if not created and book.item_id is None:
+            book.item_id = it.item_id
+            book.save(update_fields=["item_id"])
+
+        it.book_id = book.pk
+        it.save(update_fields=["book"])
+
+    AladinListItem.objects.filter(pk__in=orphan_ids).delete()
+
+
+def unlink_list_items(apps, schema_editor):
+    AladinListItem = apps.get_model("books", "AladinListItem")
+
+    for it in AladinListItem.objects.select_related("book").iterator():
+        for name in LIST_CONTENT_FIELDS:
+            setattr(it, name, getattr(it.book, name))
+        it.isbn13 = it.book.isbn13
+        it.save()
+
+
+def fill_missing_pub_date(apps, schema_editor):
+    # 되돌릴 때만 실행: pub_date 가 다시 NOT NULL 이 되므로 pub_date 없는 카탈로그 행은 생성일로 채움
+    Book = apps.get_model("books", "Book")
+    for book in Book.objects.filter(pub_date__isnull=True).iterator():
+        book.pub_date = book.created_at.date()
+        book.save(update_fields=["pub_date"])
+
+
+# Book 카탈로그 2/3: 목록 행을 카탈로그에 연결 (데이터만)
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0012_catalog_fields'),
+    ]
+
+    operations = [
+        # 앞으로 갈 때는 할 일 없음 (pub_date 는 0012_catalog_fields 에서 NULL 허용으로 바뀌기만 함).
+        # 되돌릴 때만 NULL pub_date 를 채워서, 이어서 되돌려지는 0012_catalog_fields 가 다시 NOT NULL 로 바꿀 수 있게 함.
+        migrations.RunPython(migrations.RunPython.noop, fill_missing_pub_date),
+        migrations.RunPython(link_list_items, unlink_list_items),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:51
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Q, Sum
+
+
+def populate_book_stats(apps, schema_editor):
+    # books.services.stats.rebuild_book_stats 와 같은 집계 (마이그레이션 시점 모델 사용)
+    BookStats = apps.get_model("books", "BookStats")
+    Bookmark = apps.get_model("books", "Bookmark")
+    Review = apps.get_model("reviews", "Review")
+
+    rows = {}
+    review_aggs = (
+        Review.objects.exclude(isbn13="")
+        .values("isbn13")
+        .annotate(
+            review_count=Count("id"),
+            rating_count=Count("id", filter=Q(rating__isnull=False)),
+            rating_sum=Sum("rating", default=0),
+            last_activity=Max("updated_at"),
+            **{f"rating_{r}": Count("id", filter=Q(rating=r)) for r in range(1, 6)},
+        )
+    )
+    for agg in review_aggs:
+        rows[agg.pop("isbn13")] = agg
+
+    for agg in Bookmark.objects.values("book__isbn13").annotate(n=Count("id"), last=Max("created_at")):
+        fields = rows.setdefault(agg["book__isbn13"], {})
+        fields["bookmark_count"] = agg["n"]
+        if fields.get("last_activity") is None or agg["last"] > fields["last_activity"]:
+            fields["last_activity"] = agg["last"]
+
+    BookStats.objects.bulk_create(
+        [BookStats(isbn13=isbn13, **fields) for isbn13, fields in rows.items()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0012_catalog'),
+        ('reviews', '0004_review_isbn13_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('isbn13', models.CharField(max_length=20, unique=True)),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_1', models.IntegerField(default=0)),
+                ('rating_2', models.IntegerField(default=0)),
+                ('rating_3', models.IntegerField(default=0)),
+                ('rating_4', models.IntegerField(default=0)),
+                ('rating_5', models.IntegerField(default=0)),
+                ('bookmark_count', models.IntegerField(default=0)),
+                ('last_activity', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(populate_book_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0013_bookstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AladinQuotaUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('calls', models.IntegerField(default=0)),
+                ('user_calls', models.IntegerField(default=0)),
+                ('background_calls', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
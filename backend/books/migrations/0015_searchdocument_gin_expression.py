@@ -0,0 +1,40 @@
+from django.db import migrations
+
+INDEX_NAME = "books_searchdocument_fts_idx"
+# books.services.local_search.SEARCH_VECTOR_FIELDS / SEARCH_CONFIG 와 같아야 함
+SEARCH_VECTOR_FIELDS = ("title", "author", "publisher", "category_name", "description")
+SEARCH_CONFIG = "simple"
+
+
+def _gin_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    # 손으로 쓴 식(0009)은 SearchVector 가 만드는 COALESCE((col)::text, '') 식과 달라 인덱스를 타지 않음
+    # → 검색 쿼리와 같은 SearchVector 로 인덱스 식을 만든다
+    return GinIndex(SearchVector(*SEARCH_VECTOR_FIELDS, config=SEARCH_CONFIG), name=INDEX_NAME)
+
+
+def replace_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    SearchDocument = apps.get_model("books", "SearchDocument")
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+    schema_editor.add_index(SearchDocument, _gin_index())
+
+
+def drop_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0014_aladinquotausage'),
+    ]
+
+    operations = [
+        migrations.RunPython(replace_gin_index, drop_gin_index),
+    ]
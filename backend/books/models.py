@@ -7,33 +7,50 @@ class AladinSync(models.Model):
     query_type = models.CharField(max_length=50, unique=True) 
     updated_at = models.DateTimeField(auto_now=True)
 
+    # 캐시 키 사용 기록 (AuthorSales:* 키 정리 시 LRU/LFU 기준)
+    last_accessed_at = models.DateTimeField(null=True, blank=True)
+    hit_count = models.PositiveIntegerField(default=0)
+
     def __str__(self):
         return f"{self.query_type} @ {self.updated_at}"
 
 
-class AladinListItem(models.Model):
-    query_type = models.CharField(max_length=50) 
-    item_id = models.IntegerField()
+# 알라딘 호출 single-flight 용 락 (워커 간 공유)
+class FetchLock(models.Model):
+    key = models.CharField(max_length=100, unique=True)
+    owner = models.CharField(max_length=64)
+    expires_at = models.DateTimeField()
 
-    category_id = models.IntegerField(null=True, blank=True)
-    category_name = models.CharField(max_length=255, blank=True)
+    def __str__(self):
+        return f"{self.key} ({self.owner}) ~ {self.expires_at}"
 
-    mall_type = models.CharField(max_length=20, blank=True)
 
-    isbn = models.CharField(max_length=20, blank=True)
-    isbn13 = models.CharField(max_length=20, blank=True)
+# 알라딘 일일 호출 사용량 (워커 간 공유 할당량)
+class AladinQuotaUsage(models.Model):
+    day = models.DateField(unique=True)
+    calls = models.IntegerField(default=0)              # 재시도 포함 전체
+    user_calls = models.IntegerField(default=0)
+    background_calls = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)           # 한도 초과로 막은 호출
+    updated_at = models.DateTimeField(auto_now=True)
 
-    title = models.CharField(max_length=255, blank=True)
-    author = models.CharField(max_length=255, blank=True)
-    publisher = models.CharField(max_length=255, blank=True)
-    pub_date = models.DateField(null=True, blank=True)
+    def __str__(self):
+        return f"{self.day}: {self.calls}"
 
-    description = models.TextField(blank=True)
-    cover = models.URLField(blank=True)
+
+# 목록 소속 정보만 담는 얇은 테이블 (도서 내용은 Book 카탈로그를 참조)
+class AladinListItem(models.Model):
+    query_type = models.CharField(max_length=50) 
+    item_id = models.IntegerField()
+
+    book = models.ForeignKey(
+        "Book",
+        on_delete=models.CASCADE,
+        related_name="list_entries"
+    )
 
     best_rank = models.IntegerField(null=True, blank=True)  # Bestseller만 주로 씀
     sales_point = models.IntegerField(default=0)
-    customer_review_rank = models.IntegerField(null=True, blank=True)
 
     class Meta:
         constraints = [
@@ -42,16 +59,18 @@ class AladinListItem(models.Model):
         ordering = ["-id"]
 
     def __str__(self):
-        return f"{self.query_type}:{self.title}({self.item_id})"
+        return f"{self.query_type}:{self.book_id}({self.item_id})"
 
 
+# 도서 카탈로그 (isbn13 기준 한 행). 목록/상세/AI 분석/리뷰/검색이 모두 이 행을 참조
 class Book(models.Model):
     isbn13 = models.CharField(max_length=20, unique=True)
+    item_id = models.IntegerField(null=True, blank=True, db_index=True)  # 알라딘 itemId
 
     title = models.CharField(max_length=255)
     author = models.CharField(max_length=255)
     publisher = models.CharField(max_length=255)
-    pub_date = models.DateField()
+    pub_date = models.DateField(null=True, blank=True)
     description = models.TextField(blank=True)
     cover = models.URLField(blank=True)
     sales_point = models.IntegerField(null=True, blank=True)
@@ -60,12 +79,64 @@ class Book(models.Model):
     category_name = models.CharField(max_length=255, blank=True)
     customer_review_rank = models.IntegerField(null=True, blank=True)
 
+    # 판매지수/평점을 제외한 내용의 해시 (바뀌지 않은 행은 다시 쓰지 않기 위해)
+    payload_hash = models.CharField(max_length=40, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.title} ({self.isbn13})"
         
 
+# 로컬 검색용 문서 (Book 카탈로그 행을 isbn13 기준으로 복사)
+# 실제 전문 검색 인덱스는 마이그레이션에서 DB 별로 생성 (SQLite FTS5 / Postgres GIN tsvector)
+class SearchDocument(models.Model):
+    isbn13 = models.CharField(max_length=20, unique=True)
+
+    title = models.CharField(max_length=255, blank=True)
+    author = models.CharField(max_length=255, blank=True)
+    publisher = models.CharField(max_length=255, blank=True)
+    category_name = models.CharField(max_length=255, blank=True)
+    description = models.TextField(blank=True)
+
+    cover = models.URLField(max_length=500, blank=True)
+    pub_date = models.DateField(null=True, blank=True)
+    sales_point = models.IntegerField(default=0)
+    customer_review_rank = models.IntegerField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.title} ({self.isbn13})"
+
+
+# 도서별 리뷰/북마크 집계 (리뷰·북마크 쓰기 때 F() 로 증감, rebuild_book_stats 로 재계산)
+class BookStats(models.Model):
+    isbn13 = models.CharField(max_length=20, unique=True)
+
+    review_count = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)  # 별점을 남긴 리뷰 수 (평균 분모)
+    rating_sum = models.IntegerField(default=0)
+    rating_1 = models.IntegerField(default=0)
+    rating_2 = models.IntegerField(default=0)
+    rating_3 = models.IntegerField(default=0)
+    rating_4 = models.IntegerField(default=0)
+    rating_5 = models.IntegerField(default=0)
+
+    bookmark_count = models.IntegerField(default=0)
+    last_activity = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def rating_avg(self):
+        if not self.rating_count:
+            return None
+        return round(self.rating_sum / self.rating_count, 2)
+
+    def __str__(self):
+        return f"{self.isbn13} 리뷰 {self.review_count} / 북마크 {self.bookmark_count}"
+
+
 # 북마크
 class Bookmark(models.Model):
     user = models.ForeignKey(
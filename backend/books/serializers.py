@@ -1,13 +1,22 @@
+from django.conf import settings
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Book, Bookmark, AladinListItem
 from reviews.models import Review
 from .services.aladin import _to_cover500
+from .services.stats import get_book_stats
 
 User = get_user_model()
 
 # 알라딘 API로부터 받아온 도서 목록 아이템
+# (도서 내용은 Book 카탈로그에서 읽으므로 select_related("book") 로 조회할 것)
 class AladinListItemSerializer(serializers.ModelSerializer):
+    isbn13 = serializers.CharField(source="book.isbn13", read_only=True)
+    category_name = serializers.CharField(source="book.category_name", read_only=True)
+    title = serializers.CharField(source="book.title", read_only=True)
+    author = serializers.CharField(source="book.author", read_only=True)
+    publisher = serializers.CharField(source="book.publisher", read_only=True)
+    customer_review_rank = serializers.IntegerField(source="book.customer_review_rank", read_only=True)
     cover = serializers.SerializerMethodField()
     class Meta:
         model = AladinListItem
@@ -25,11 +34,13 @@ class AladinListItemSerializer(serializers.ModelSerializer):
         ]
         
     def get_cover(self, obj):
-        return _to_cover500(obj.cover)
+        return _to_cover500(obj.book.cover)
 
 
 # 하위 시리얼라이저: 리뷰 (도서 상세 페이지용)
+# (obj.user 를 읽으므로 select_related("user") 로 조회할 것)
 class BookReviewSerializer(serializers.ModelSerializer):
+    user_id = serializers.IntegerField(read_only=True)
     user_nickname = serializers.SerializerMethodField()
     user_profile_image = serializers.SerializerMethodField()
     
@@ -37,6 +48,7 @@ class BookReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = [
             "id",
+            "user_id",
             "user_nickname",
             "user_profile_image",
             "content",
@@ -53,13 +65,16 @@ class BookReviewSerializer(serializers.ModelSerializer):
         return None  # Or default path if you prefer
 
 
-# 알라딘 API로부터 받아온 도서 목록 아이템
 # 도서 상세 페이지
+# context 로 reviews(첫 페이지), reviews_next, stats(BookStats), is_bookmarked 를 넘기면 추가 쿼리 없이 사용
 class BookDetailSerializer(serializers.ModelSerializer):
     is_bookmarked = serializers.SerializerMethodField()
     customerReviewRank = serializers.SerializerMethodField()
     reviews = serializers.SerializerMethodField()
+    reviews_next = serializers.SerializerMethodField()
     review_count = serializers.SerializerMethodField()
+    rating_avg = serializers.SerializerMethodField()
+    bookmark_count = serializers.SerializerMethodField()
     cover = serializers.SerializerMethodField()
     
     class Meta:
@@ -78,13 +93,18 @@ class BookDetailSerializer(serializers.ModelSerializer):
             "is_bookmarked",
             "customerReviewRank",
             "reviews",
+            "reviews_next",
             "review_count",
+            "rating_avg",
+            "bookmark_count",
         ]
         
     def get_cover(self, obj):
         return _to_cover500(obj.cover)
 
     def get_is_bookmarked(self, obj):
+        if "is_bookmarked" in self.context:
+            return self.context["is_bookmarked"]
         request = self.context.get("request")
         if request is None or not request.user.is_authenticated:
             return False
@@ -94,13 +114,37 @@ class BookDetailSerializer(serializers.ModelSerializer):
         return obj.customer_review_rank or 0
 
     def get_reviews(self, obj):
-        # 해당 도서의 리뷰 (최신순)
+        # 해당 도서의 리뷰 첫 페이지 (최신순)
         # obj: Book model instance
-        qs = Review.objects.filter(isbn13=obj.isbn13).order_by("-id")
-        return BookReviewSerializer(qs, many=True).data
+        reviews = self.context.get("reviews")
+        if reviews is None:
+            reviews = (
+                Review.objects.filter(isbn13=obj.isbn13)
+                .select_related("user")
+                .order_by("-id")[:settings.BOOK_REVIEW_PAGE_SIZE]
+            )
+        return BookReviewSerializer(reviews, many=True).data
+
+    def get_reviews_next(self, obj):
+        return self.context.get("reviews_next")
+
+    def _stats(self, obj):
+        # 리뷰/북마크 집계는 BookStats 한 행에서 읽음
+        if "stats" not in self.context:
+            self.context["stats"] = get_book_stats(obj.isbn13)
+        return self.context["stats"]
 
     def get_review_count(self, obj):
-        return Review.objects.filter(isbn13=obj.isbn13).count()
+        stats = self._stats(obj)
+        return stats.review_count if stats else 0
+
+    def get_rating_avg(self, obj):
+        stats = self._stats(obj)
+        return stats.rating_avg if stats else None
+
+    def get_bookmark_count(self, obj):
+        stats = self._stats(obj)
+        return stats.bookmark_count if stats else 0
 
     
 
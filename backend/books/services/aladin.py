@@ -1,11 +1,25 @@
 # books/services/aladin.py
 
+import hashlib
+import heapq
+import json
 import requests
+from asgiref.sync import sync_to_async
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, datetime
 from django.conf import settings
+from django.core.cache import cache as shared_cache
+from django.db import transaction
 from django.utils import timezone
+from config.metrics import count_cache
 from books.models import Book
 from books.models import AladinSync, AladinListItem
+from .background import run_in_background
+from .cache import TieredCache, incr_stat
+from .client import aladin_client
+from .quota import aladin_priority, current_priority
+from .local_search import index_documents, doc_from_book, search_local
+from .singleflight import single_flight
 
 def _parse_iso_date(s: str):
     if not s:
@@ -24,44 +38,135 @@ def _to_cover500(url: str) -> str:
         return url
     return url.replace("/coversum/", "/cover500/")
 
+BOOK_NOT_FOUND_MESSAGE = "해당 ISBN13의 도서를 찾을 수 없습니다."
+
+
+class InvalidISBN(ValueError):
+    pass
+
+
+def validate_isbn13(isbn13: str) -> str:
+    """
+    ISBN13 형식(978/979 + 체크섬) 검증. DB/알라딘 조회 전에 호출.
+    """
+    s = (isbn13 or "").strip()
+    if len(s) != 13 or not s.isdigit() or s[:3] not in ("978", "979"):
+        raise InvalidISBN("올바르지 않은 ISBN13 형식입니다.")
+    total = sum(int(ch) * (1 if i % 2 == 0 else 3) for i, ch in enumerate(s[:12]))
+    if (10 - total % 10) % 10 != int(s[12]):
+        raise InvalidISBN("올바르지 않은 ISBN13 형식입니다.")
+    return s
+
+
+# 알라딘에 없는 ISBN (짧은 TTL 로 기억해서 반복 조회 방지)
+negative_cache = TieredCache(
+    prefix="aladin:notfound",
+    maxsize=settings.ALADIN_NEGATIVE_CACHE_MAXSIZE,
+    ttl=settings.ALADIN_NEGATIVE_CACHE_TTL,
+)
+
+
+def is_known_missing(isbn13: str) -> bool:
+    if negative_cache.get(isbn13):
+        incr_stat("aladin.negative.hit")
+        return True
+    return False
+
+
+def remember_missing(isbn13: str):
+    negative_cache.set(isbn13, True)
+    incr_stat("aladin.negative.store")
+
+
 def get_or_create_book_by_isbn13(isbn13: str) -> Book:
+    try:
+        isbn13 = validate_isbn13(isbn13)
+    except InvalidISBN:
+        incr_stat("aladin.negative.invalid")
+        raise
+
     book = Book.objects.filter(isbn13=isbn13).first()
     if book:
         return book
 
-    params = {
-        "ttbkey": settings.ALADIN_TTB_KEY,
-        "ItemId": isbn13,
-        "ItemIdType": "ISBN13",
-        "Output": "JS",
-        "Version": settings.ALADIN_API_VERSION,
-    }
+    if is_known_missing(isbn13):
+        raise ValueError(BOOK_NOT_FOUND_MESSAGE)
+
+    # 같은 ISBN 을 동시에 여는 요청은 한 번만 알라딘을 호출
+    return single_flight(
+        f"aladin:book:{isbn13}",
+        lambda: _fetch_and_create_book(isbn13),
+        reuse=lambda: Book.objects.filter(isbn13=isbn13).first(),
+    )
 
-    res = requests.get(settings.ALADIN_LOOKUP_URL, params=params)
-    res.raise_for_status()
-    data = res.json()
 
+def _lookup_item(isbn13: str):
+    """
+    ItemLookUp 한 건. 알라딘에 없으면 네거티브 캐시에 기록하고 None.
+    """
+    data = aladin_client.item_lookup(isbn13)
     items = data.get("item", [])
     if not items:
-        raise ValueError("해당 ISBN13의 도서를 찾을 수 없습니다.")
-
-    item = items[0]
-
-    book = Book.objects.create(
-        isbn13=isbn13,
-        title=item.get("title"),
-        author=item.get("author"),
-        publisher=item.get("publisher"),
-        pub_date=_parse_iso_date(item.get("pubDate")),
-        description=item.get("description", ""),
-        cover=_to_cover500(item.get("cover", "")),
-        category_id=item.get("categoryId"),
-        category_name=item.get("categoryName", ""),
-        sales_point=item.get("salesPoint", 0),
-        customer_review_rank=item.get("customerReviewRank"),
-    )
+        remember_missing(isbn13)
+        return None
+    return items[0]
+
+
+def _fetch_and_create_book(isbn13: str) -> Book:
+    # 락을 먼저 잡은 다른 워커가 방금 "없음" 을 확인했으면 다시 묻지 않음 (reuse() 는 없는 책을 돌려줄 수 없으므로)
+    if is_known_missing(isbn13):
+        raise ValueError(BOOK_NOT_FOUND_MESSAGE)
+    item = _lookup_item(isbn13)
+    if item is None:
+        raise ValueError(BOOK_NOT_FOUND_MESSAGE)
+
+    # 락 대기 시간을 넘긴 다른 요청이 먼저 저장했어도 카탈로그 upsert 로 합쳐짐
+    books, _ = upsert_catalog_books([dict(item, isbn13=isbn13)])
+    return books[isbn13]
+
+
+def get_books_by_isbn13s(isbn13s) -> dict:
+    """
+    여러 ISBN13 을 한 번에 Book 으로 확보
+    1) DB 에 있는 건 쿼리 한 번으로 조회
+    2) 없는 건 ItemLookUp 을 제한된 스레드풀에서 동시에 호출
+    3) 새로 받은 건 bulk_create 로 한 번에 저장
+    반환: {isbn13: Book} (형식 오류/알라딘에 없는 ISBN 은 빠짐)
+    """
+    valid = []
+    for isbn13 in isbn13s:
+        try:
+            valid.append(validate_isbn13(isbn13))
+        except InvalidISBN:
+            incr_stat("aladin.negative.invalid")
+
+    books = Book.objects.in_bulk(valid, field_name="isbn13")
+
+    missing = [i for i in valid if i not in books and not is_known_missing(i)]
+    if not missing:
+        return books
 
-    return book
+    # 작업 스레드에는 contextvar 가 넘어가지 않으므로 호출한 쪽 우선순위를 직접 전달
+    priority = current_priority()
+
+    def fetch(isbn13):
+        try:
+            with aladin_priority(priority):
+                return isbn13, _lookup_item(isbn13)
+        except Exception as e:
+            print(f"🚨 알라딘 조회 실패 ({isbn13}): {e}")
+            return isbn13, None
+
+    workers = min(settings.ALADIN_BATCH_WORKERS, len(missing))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        fetched = list(executor.map(fetch, missing))
+
+    new_items = [dict(item, isbn13=isbn13) for isbn13, item in fetched if item is not None]
+    if new_items:
+        new_books, _ = upsert_catalog_books(new_items)
+        books.update(new_books)
+
+    return books
 
 
 def is_aladin_fresh(query_type: str, ttl_hours: int = 24) -> bool:
@@ -71,95 +176,445 @@ def is_aladin_fresh(query_type: str, ttl_hours: int = 24) -> bool:
     return timezone.now() - sync.updated_at < timedelta(hours=ttl_hours)
 
 
+def aladin_synced_at(query_type: str):
+    # 마지막 갱신 시각 (갱신 기록이 없으면 None)
+    return AladinSync.objects.filter(query_type=query_type).values_list("updated_at", flat=True).first()
+
+
+def aladin_sync_age(query_type: str):
+    """
+    마지막 갱신 이후 경과 시간 (갱신 기록이 없으면 None)
+    """
+    updated_at = aladin_synced_at(query_type)
+    if updated_at is None:
+        return None
+    return timezone.now() - updated_at
+
+
+def _synced_within(query_type: str, ttl):
+    # single_flight reuse 용: 다른 호출이 이미 갱신했으면 True, 아니면 None
+    age = aladin_sync_age(query_type)
+    if age is not None and age < ttl:
+        return True
+    return None
+
+
+def get_list_ttl(query_type: str):
+    """
+    query_type 별 (soft_ttl, hard_ttl)
+    - soft_ttl 경과: 기존 목록을 바로 내려주고 백그라운드에서 갱신
+    - hard_ttl 경과: 너무 오래된 목록이므로 동기 갱신
+    """
+    conf = settings.ALADIN_LIST_TTL.get(query_type) or settings.ALADIN_LIST_TTL["default"]
+    return timedelta(hours=conf["soft_ttl"]), timedelta(hours=conf["hard_ttl"])
+
+
 def touch_aladin_sync(query_type: str):
     AladinSync.objects.update_or_create(query_type=query_type)
 
 
 def _fetch_itemlist_from_aladin(query_type: str, max_results: int = 10, start: int = 1):
-    params = {
-        "ttbkey": settings.ALADIN_TTB_KEY,
-        "QueryType": query_type,
-        "MaxResults": max_results,
-        "start": start,
-        "SearchTarget": "Book",
-        "Output": "JS",
-        "Version": settings.ALADIN_API_VERSION,
+    data = aladin_client.item_list(query_type, max_results=max_results, start=start)
+    return data.get("item", [])
+
+
+# Book 카탈로그 컬럼 (isbn13 제외)
+# - 내용 컬럼: 바뀌면 행 전체를 다시 씀 (payload_hash 로 비교)
+# - 지표 컬럼: 자주 바뀌므로 내용이 같으면 이것만 갱신
+CATALOG_CONTENT_FIELDS = [
+    "item_id",
+    "category_id",
+    "category_name",
+    "title",
+    "author",
+    "publisher",
+    "pub_date",
+    "description",
+    "cover",
+]
+CATALOG_METRIC_FIELDS = [
+    "sales_point",
+    "customer_review_rank",
+]
+CATALOG_FIELDS = CATALOG_CONTENT_FIELDS + CATALOG_METRIC_FIELDS
+
+# AladinListItem 에 저장하는 목록 소속 컬럼 (query_type, item_id 제외)
+LIST_ENTRY_FIELDS = [
+    "book",
+    "best_rank",
+    "sales_point",
+]
+
+
+def normalize_book_fields(it: dict) -> dict:
+    """
+    알라딘 item(JSON) → Book 필드 dict (isbn13 제외, payload_hash 포함)
+    """
+    fields = {
+        "item_id": it.get("itemId") or None,
+        "category_id": it.get("categoryId"),
+        "category_name": it.get("categoryName", "") or "",
+        "title": it.get("title", "") or "",
+        "author": it.get("author", "") or "",
+        "publisher": it.get("publisher", "") or "",
+        "pub_date": _parse_iso_date(it.get("pubDate")),
+        "description": it.get("description", "") or "",
+        "cover": _to_cover500(it.get("cover", "") or ""),
+        "sales_point": it.get("salesPoint") or 0,
+        "customer_review_rank": it.get("customerReviewRank"),
     }
+    fields["payload_hash"] = payload_fingerprint(fields)
+    return fields
 
-    res = requests.get(settings.ALADIN_ITEMLIST_URL, params=params, timeout=10)
-    res.raise_for_status()
-    data = res.json()
-    return data.get("item", [])
 
+def payload_fingerprint(fields: dict) -> str:
+    content = [fields.get(name) for name in CATALOG_CONTENT_FIELDS]
+    raw = json.dumps(content, ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
-def refresh_aladin_list(query_type: str, max_results: int = 10):
-    items = _fetch_itemlist_from_aladin(query_type=query_type, max_results=max_results, start=1)
 
-    alive_item_ids = []
+def upsert_catalog_books(items):
+    """
+    알라딘 item 들을 Book 카탈로그에 반영하되, 바뀐 행만 쓴다.
+    - 새 도서: bulk_create (동시 저장 대비 update_conflicts)
+    - 내용 변경: 전체 컬럼 bulk_update
+    - 판매지수/평점만 변경: 지표 컬럼만 bulk_update
+    isbn13 이 없는 item 은 카탈로그에 넣을 수 없으므로 건너뜀.
+    반환: ({isbn13: Book(pk 채워짐)}, {"created", "updated", "metric_updated", "unchanged"})
+    """
+    rows = {}
     for it in items:
-        item_id = it.get("itemId")
-        if not item_id:
+        isbn13 = str(it.get("isbn13") or "").strip()
+        if not isbn13:
+            continue
+        rows[isbn13] = Book(isbn13=isbn13, **normalize_book_fields(it))
+
+    counts = {"created": 0, "updated": 0, "metric_updated": 0, "unchanged": 0}
+    if not rows:
+        return {}, counts
+
+    existing = {
+        isbn13: (pk, payload_hash, tuple(metrics))
+        for isbn13, pk, payload_hash, *metrics in Book.objects
+        .filter(isbn13__in=list(rows))
+        .values_list("isbn13", "id", "payload_hash", *CATALOG_METRIC_FIELDS)
+    }
+
+    now = timezone.now()
+    inserts, updates, metric_updates = [], [], []
+    for isbn13, row in rows.items():
+        old = existing.get(isbn13)
+        if old is None:
+            inserts.append(row)
             continue
-        alive_item_ids.append(item_id)
-
-        defaults = {
-            "category_id": it.get("categoryId"),
-            "category_name": it.get("categoryName", "") or "",
-            "mall_type": it.get("mallType", "") or "",
-            "isbn": it.get("isbn", "") or "",
-            "isbn13": it.get("isbn13", "") or "",
-            "title": it.get("title", "") or "",
-            "author": it.get("author", "") or "",
-            "publisher": it.get("publisher", "") or "",
-            "pub_date": _parse_iso_date(it.get("pubDate")),
-            "description": it.get("description", "") or "",
-            "cover": _to_cover500(it.get("cover", "") or ""),
-            "best_rank": it.get("bestRank"),
-            "sales_point": it.get("salesPoint") or 0,
-            "customer_review_rank": it.get("customerReviewRank"),
+        row.pk = old[0]
+        # bulk_update 는 auto_now 를 채우지 않음
+        row.updated_at = now
+        if row.payload_hash != old[1]:
+            updates.append(row)
+        elif tuple(getattr(row, f) for f in CATALOG_METRIC_FIELDS) != old[2]:
+            metric_updates.append(row)
+        else:
+            counts["unchanged"] += 1
+
+    with transaction.atomic():
+        if inserts:
+            Book.objects.bulk_create(
+                inserts,
+                update_conflicts=True,
+                unique_fields=["isbn13"],
+                update_fields=CATALOG_FIELDS + ["payload_hash", "updated_at"],
+            )
+        if updates:
+            Book.objects.bulk_update(updates, CATALOG_FIELDS + ["payload_hash", "updated_at"])
+        if metric_updates:
+            Book.objects.bulk_update(metric_updates, CATALOG_METRIC_FIELDS + ["updated_at"])
+
+    if inserts:
+        # 동시에 다른 요청이 먼저 저장한 행은 pk 가 비어 있을 수 있어 다시 조회
+        ids = dict(Book.objects.filter(isbn13__in=[b.isbn13 for b in inserts]).values_list("isbn13", "id"))
+        for b in inserts:
+            b.pk = ids.get(b.isbn13)
+
+    # 검색 인덱스는 내용이 바뀐 행만
+    index_documents([doc_from_book(b) for b in inserts + updates])
+
+    counts.update(created=len(inserts), updated=len(updates), metric_updated=len(metric_updates))
+    return rows, counts
+
+
+def upsert_aladin_list(query_type: str, items) -> dict:
+    """
+    한 트랜잭션 안에서 목록을 갱신하되, 바뀐 행만 쓴다.
+    1) 도서 내용은 Book 카탈로그에 upsert (다른 목록/상세 조회와 공유)
+    2) 목록 행은 (book, 순위, 판매지수) 만 비교
+       - 새 아이템: bulk_create (동시 갱신 대비 update_conflicts)
+       - 순위/판매지수 변경: bulk_update
+       - 그대로: 건너뜀
+    3) 목록에서 빠진 아이템 delete
+    4) AladinSync 갱신
+    반환: {"inserted", "updated", "rank_updated", "unchanged", "deleted", "books_created"}
+      - updated: 내용이 바뀌어 다시 쓴 카탈로그 행 수
+    """
+    items = list(items)
+    with transaction.atomic():
+        books, book_counts = upsert_catalog_books(items)
+
+        rows = {}
+        for it in items:
+            item_id = it.get("itemId")
+            book = books.get(str(it.get("isbn13") or "").strip())
+            if not item_id or book is None or book.pk is None:
+                continue
+            # 같은 응답 안의 중복 itemId 는 마지막 것만 사용
+            rows[item_id] = AladinListItem(
+                query_type=query_type,
+                item_id=item_id,
+                book=book,
+                best_rank=it.get("bestRank"),
+                sales_point=it.get("salesPoint") or 0,
+            )
+
+        existing = {
+            item_id: (pk, (book_id, best_rank, sales_point))
+            for item_id, pk, book_id, best_rank, sales_point in AladinListItem.objects
+            .filter(query_type=query_type, item_id__in=list(rows))
+            .values_list("item_id", "id", "book_id", "best_rank", "sales_point")
         }
 
-        AladinListItem.objects.update_or_create(
-            query_type=query_type,
-            item_id=item_id,
-            defaults=defaults,
-        )
+        inserts, rank_updates = [], []
+        unchanged = 0
+        for item_id, row in rows.items():
+            old = existing.get(item_id)
+            if old is None:
+                inserts.append(row)
+                continue
+            row.pk = old[0]
+            if (row.book_id, row.best_rank, row.sales_point) != old[1]:
+                rank_updates.append(row)
+            else:
+                unchanged += 1
+
+        if inserts:
+            AladinListItem.objects.bulk_create(
+                inserts,
+                update_conflicts=True,
+                unique_fields=["query_type", "item_id"],
+                update_fields=LIST_ENTRY_FIELDS,
+            )
+        if rank_updates:
+            AladinListItem.objects.bulk_update(rank_updates, LIST_ENTRY_FIELDS)
+
+        deleted, _ = AladinListItem.objects.filter(query_type=query_type).exclude(item_id__in=list(rows)).delete()
+        touch_aladin_sync(query_type)
+
+    return {
+        "inserted": len(inserts),
+        "updated": book_counts["updated"],
+        "rank_updated": len(rank_updates),
+        "unchanged": unchanged,
+        "deleted": deleted,
+        "books_created": book_counts["created"],
+    }
+
+
+def refresh_aladin_list(query_type: str, max_results: int = 10) -> dict:
+    items = _fetch_itemlist_from_aladin(query_type=query_type, max_results=max_results, start=1)
+    return upsert_aladin_list(query_type, items)
 
-    AladinListItem.objects.filter(query_type=query_type).exclude(item_id__in=alive_item_ids).delete()
-    touch_aladin_sync(query_type)
 
+def get_cached_aladin_list(query_type: str, limit: int):
+    soft_ttl, hard_ttl = get_list_ttl(query_type)
+    age = aladin_sync_age(query_type)
 
-def get_cached_aladin_list(query_type: str, limit: int, ttl_hours: int = 24):
-    if not is_aladin_fresh(query_type=query_type, ttl_hours=ttl_hours):
+    def refresh():
         refresh_aladin_list(query_type=query_type, max_results=limit)
 
-    qs = AladinListItem.objects.filter(query_type=query_type)
+    if age is None or age >= hard_ttl:
+        count_cache("aladin_list", "miss")
+        # 캐시가 비었거나 너무 오래됨 → 동기 갱신
+        # 만료 시점에 몰린 요청 중 하나만 갱신하고 나머지는 그 결과를 사용
+        try:
+            single_flight(
+                f"aladin:list:{query_type}",
+                refresh,
+                reuse=lambda: _synced_within(query_type, hard_ttl),
+            )
+        except requests.RequestException as e:
+            # 알라딘 장애/할당량 소진 → 남아 있는 (오래된) 목록이라도 반환
+            print(f"🚨 알라딘 목록 갱신 실패 ({query_type}, 기존 목록 사용): {e}")
+    elif age >= soft_ttl:
+        count_cache("aladin_list", "stale")
+        # stale-while-revalidate: 기존 목록을 바로 반환, 갱신은 백그라운드에서
+        def revalidate():
+            single_flight(
+                f"aladin:list:{query_type}",
+                refresh,
+                reuse=lambda: _synced_within(query_type, soft_ttl),
+            )
+
+        run_in_background(f"aladin:list:{query_type}", revalidate)
+    else:
+        count_cache("aladin_list", "hit")
+
+    qs = AladinListItem.objects.filter(query_type=query_type).select_related("book")
 
     if query_type == "Bestseller":
         qs = qs.order_by("best_rank", "id")
     else:
-        qs = qs.order_by("-pub_date", "-sales_point", "-id")
+        qs = qs.order_by("-book__pub_date", "-sales_point", "-id")
 
     return qs[:limit]
 
 
 def search_books_by_query(query: str, max_results: int = 1):
-    params = {
-        "ttbkey": settings.ALADIN_TTB_KEY,
-        "Query": query,
-        "QueryType": "Keyword",
-        "MaxResults": max_results,
-        "start": 1,
-        "SearchTarget": "Book",
-        "Output": "JS",
-        "Version": settings.ALADIN_API_VERSION,
-    }
+    try:
+        data = aladin_client.item_search(query, query_type="Keyword", max_results=max_results, start=1)
+        return data.get("item", [])
+    except requests.RequestException as e:
+        # 알라딘 장애/서킷 열림/할당량 소진 → 로컬 검색 인덱스 결과
+        print(f"🚨 알라딘 검색 API 에러 (로컬 검색으로 대체): {e}")
+        return search_local(query, size=max_results)["items"]
+    except Exception as e:
+        print(f"🚨 알라딘 검색 API 에러: {e}")
+        return []
+
 
+async def asearch_books_by_query(query: str, max_results: int = 1):
     try:
-        res = requests.get(settings.ALADIN_SEARCH_URL, params=params, timeout=10)
-        res.raise_for_status()
-        data = res.json()
+        data = await aladin_client.aitem_search(query, query_type="Keyword", max_results=max_results, start=1)
         return data.get("item", [])
+    except requests.RequestException as e:
+        print(f"🚨 알라딘 검색 API 에러 (로컬 검색으로 대체): {e}")
+        return (await sync_to_async(search_local)(query, size=max_results))["items"]
     except Exception as e:
         print(f"🚨 알라딘 검색 API 에러: {e}")
         return []
+
+
+# /api/books/search 결과 캐시 (정규화된 파라미터 → 알라딘 응답 요약)
+search_cache = TieredCache(
+    prefix="aladin:search",
+    maxsize=settings.ALADIN_SEARCH_CACHE_MAXSIZE,
+    ttl=settings.ALADIN_SEARCH_CACHE_TTL,
+)
+
+
+def normalize_search_params(q, query_type="Keyword", page=1, size=10, sort="Accuracy", category_id=0):
+    return (
+        " ".join(str(q).split()).lower(),
+        str(query_type or "Keyword"),
+        int(page),
+        min(int(size), 50),
+        str(sort or "Accuracy"),
+        str(category_id or 0),
+    )
+
+
+# 검색 결과에는 나왔지만 카탈로그(Book)에 없는 ISBN → 프리웜이 미리 받아 둠
+# {isbn13: 검색 결과에 나온 횟수} 하나를 CACHES 에 둔다 (워커 간 동시 갱신은 일부 유실돼도 무방한 수요 지표)
+CATALOG_MISS_KEY = "aladin:catalog-miss"
+
+
+def record_catalog_misses(isbn13s):
+    isbn13s = [i for i in isbn13s if i]
+    if not isbn13s:
+        return
+    existing = set(Book.objects.filter(isbn13__in=isbn13s).values_list("isbn13", flat=True))
+    missing = [i for i in isbn13s if i not in existing]
+    if not missing:
+        return
+
+    counts = shared_cache.get(CATALOG_MISS_KEY) or {}
+    for isbn13 in missing:
+        counts[isbn13] = counts.get(isbn13, 0) + 1
+    if len(counts) > settings.ALADIN_CATALOG_MISS_MAXSIZE:
+        counts = dict(heapq.nlargest(settings.ALADIN_CATALOG_MISS_MAXSIZE, counts.items(), key=lambda kv: kv[1]))
+    shared_cache.set(CATALOG_MISS_KEY, counts, settings.ALADIN_CATALOG_MISS_TTL)
+
+
+def catalog_miss_isbn13s(limit: int):
+    # 많이 검색된 순 (이미 카탈로그에 들어간 것도 섞여 있을 수 있으므로 호출한 쪽에서 다시 거름)
+    counts = shared_cache.get(CATALOG_MISS_KEY) or {}
+    return heapq.nlargest(limit, counts, key=counts.get)
+
+
+def _search_cache_key(params) -> str:
+    return hashlib.sha1(json.dumps(params, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def search_books(q, query_type="Keyword", page=1, size=10, sort="Accuracy", category_id=0) -> dict:
+    """
+    알라딘 ItemSearch 결과 (사용자별 정보 제외)를 캐시해서 반환
+    반환: {"total": int, "items": [...]}
+    """
+    params = normalize_search_params(q, query_type, page, size, sort, category_id)
+    key = _search_cache_key(params)
+
+    cached = search_cache.get(key)
+    if cached is not None:
+        return cached
+
+    _, query_type, page, size, sort, category_id = params
+    # 정규화는 캐시 키에만, 알라딘에는 사용자가 입력한 검색어 그대로
+    data = aladin_client.item_search(
+        str(q).strip(),
+        query_type=query_type,
+        max_results=size,
+        start=page,
+        sort=sort,
+        category_id=category_id,
+    )
+    result = _search_result(data)
+    if "errorCode" not in data:
+        # 200 + errorCode (키/할당량 오류 등) 는 캐시하지 않음 → 모든 사용자에게 TTL 동안 고정되지 않도록
+        search_cache.set(key, result)
+        record_catalog_misses([item["isbn13"] for item in result["items"]])
+    return result
+
+
+async def asearch_books(q, query_type="Keyword", page=1, size=10, sort="Accuracy", category_id=0) -> dict:
+    """
+    search_books 의 비동기 버전 (캐시 조회/저장은 스레드에서, 알라딘 호출은 이벤트 루프에서)
+    """
+    params = normalize_search_params(q, query_type, page, size, sort, category_id)
+    key = _search_cache_key(params)
+
+    cached = await sync_to_async(search_cache.get)(key)
+    if cached is not None:
+        return cached
+
+    _, query_type, page, size, sort, category_id = params
+    # 정규화는 캐시 키에만, 알라딘에는 사용자가 입력한 검색어 그대로
+    data = await aladin_client.aitem_search(
+        str(q).strip(),
+        query_type=query_type,
+        max_results=size,
+        start=page,
+        sort=sort,
+        category_id=category_id,
+    )
+    result = _search_result(data)
+    if "errorCode" not in data:
+        await sync_to_async(search_cache.set)(key, result)
+        await sync_to_async(record_catalog_misses)([item["isbn13"] for item in result["items"]])
+    return result
+
+
+def _search_result(data: dict) -> dict:
+    return {
+        "total": data.get("totalResults"),
+        "items": [
+            {
+                "title": item.get("title"),
+                "author": item.get("author"),
+                "publisher": item.get("publisher"),
+                "pub_date": item.get("pubDate"),
+                "isbn13": item.get("isbn13"),
+                "cover": _to_cover500(item.get("cover")),
+                "sales_point": item.get("salesPoint"),
+                "customer_review_rank": item.get("customerReviewRank"),
+            }
+            for item in data.get("item", [])
+        ],
+    }
@@ -0,0 +1,49 @@
+# books/services/background.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connection
+from .quota import BACKGROUND, aladin_priority
+
+_executor = None
+_pending = set()
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BACKGROUND_WORKERS,
+                thread_name_prefix="jandi-bg",
+            )
+        return _executor
+
+
+def _run(key, fn):
+    try:
+        # 백그라운드 작업의 알라딘 호출은 사용자 요청보다 뒤로
+        with aladin_priority(BACKGROUND):
+            fn()
+    except Exception as e:
+        print(f"🚨 백그라운드 작업 실패 ({key}): {e}")
+    finally:
+        with _lock:
+            _pending.discard(key)
+        # 작업 스레드가 DB 커넥션을 붙잡고 있지 않도록
+        connection.close()
+
+
+def run_in_background(key: str, fn) -> bool:
+    """
+    fn 을 백그라운드 스레드풀에서 실행한다.
+    같은 key 가 이미 대기/실행 중이면 다시 예약하지 않고 False 반환.
+    """
+    with _lock:
+        if key in _pending:
+            return False
+        _pending.add(key)
+    _get_executor().submit(_run, key, fn)
+    return True
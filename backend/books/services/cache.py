@@ -0,0 +1,98 @@
+# books/services/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from django.core.cache import cache as shared_cache
+from config.metrics import count_cache, registry
+
+_MISSING = object()
+
+
+def incr_stat(name: str, amount: int = 1):
+    # /metrics 의 app_events_total{event=...} 로 노출
+    registry.inc("app_events_total", amount, event=name)
+
+
+def get_stats() -> dict:
+    # 현재 프로세스 값 (워커 합계는 /metrics)
+    return {dict(labels)["event"]: value for labels, value in registry.counter_values("app_events_total").items()}
+
+
+class TTLLRUCache:
+    """
+    프로세스 메모리용 캐시 (TTL + 최대 개수 LRU 제거)
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TieredCache:
+    """
+    1단계: 프로세스 내 TTLLRUCache (가장 빠름, 워커마다 따로)
+    2단계: Django cache (settings.CACHES, 워커 간 공유)
+    """
+
+    def __init__(self, prefix: str, maxsize: int, ttl: float):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.local = TTLLRUCache(maxsize=maxsize, ttl=ttl)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def get(self, key: str, default=None):
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            count_cache(self.prefix, "hit")
+            return value
+        value = shared_cache.get(self._key(key), _MISSING)
+        if value is _MISSING:
+            count_cache(self.prefix, "miss")
+            return default
+        count_cache(self.prefix, "hit")
+        self.local.set(key, value)
+        return value
+
+    def set(self, key: str, value):
+        self.local.set(key, value)
+        shared_cache.set(self._key(key), value, self.ttl)
+
+    def delete(self, key: str):
+        self.local.delete(key)
+        shared_cache.delete(self._key(key))
@@ -0,0 +1,192 @@
+# books/services/client.py
+
+import asyncio
+import random
+import httpx
+import requests
+from asgiref.sync import sync_to_async
+from urllib3.util.retry import Retry
+from django.conf import settings
+from config.cassettes import AsyncCassetteTransport, cassette_session
+from config.circuit import breaker, upstream_call
+from .quota import governor
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_async_clients = {}
+
+
+def async_http_client(upstream: str) -> httpx.AsyncClient:
+    """
+    외부 API 별로 공유하는 httpx.AsyncClient (ASGI 경로)
+    - 커넥션 풀은 이벤트 루프에 묶이므로 루프마다 하나씩 (uvicorn 워커는 루프 하나)
+    """
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(upstream)
+    if entry is None or entry[0] is not loop:
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=settings.ASYNC_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.ASYNC_HTTP_MAX_KEEPALIVE,
+            ),
+        )
+        client = httpx.AsyncClient(transport=AsyncCassetteTransport(upstream, transport))
+        entry = _async_clients[upstream] = (loop, client)
+    return entry[1]
+
+
+class AladinClient:
+    """
+    알라딘 OPEN API 공용 클라이언트
+    - requests.Session + HTTPAdapter 커넥션 풀 (keep-alive)
+    - 엔드포인트별 (connect, read) 타임아웃
+    - 지터 포함 백오프로 제한된 횟수만 재시도
+    - 서킷이 열려 있으면 할당량을 쓰기 전에 바로 CircuitOpen (config.circuit)
+    - 호출 전 할당량/속도 제한 확인 (quota.governor)
+    - UPSTREAM_CASSETTE_MODE 에 따라 녹화/재생 (config.cassettes)
+    - a 로 시작하는 메서드는 비동기 버전 (httpx.AsyncClient, ASGI 뷰용)
+    """
+
+    ENDPOINTS = {
+        "list": "ALADIN_ITEMLIST_URL",
+        "search": "ALADIN_SEARCH_URL",
+        "lookup": "ALADIN_LOOKUP_URL",
+    }
+
+    def __init__(self):
+        self._session = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = self._build_session()
+        return self._session
+
+    def _build_session(self):
+        retry = Retry(
+            total=settings.ALADIN_RETRY_TOTAL,
+            connect=settings.ALADIN_RETRY_TOTAL,
+            read=settings.ALADIN_RETRY_TOTAL,
+            status=settings.ALADIN_RETRY_TOTAL,
+            backoff_factor=settings.ALADIN_RETRY_BACKOFF,
+            backoff_jitter=settings.ALADIN_RETRY_JITTER,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        return cassette_session(
+            "aladin",
+            pool_connections=settings.ALADIN_POOL_CONNECTIONS,
+            pool_maxsize=settings.ALADIN_POOL_MAXSIZE,
+            max_retries=retry,
+        )
+
+    def build_params(self, output: str = "JS", **params) -> dict:
+        base = {
+            "ttbkey": settings.ALADIN_TTB_KEY,
+            "Output": output,
+            "Version": settings.ALADIN_API_VERSION,
+        }
+        base.update({k: v for k, v in params.items() if v is not None})
+        return base
+
+    def get(self, endpoint: str, output: str = "JS", **params) -> requests.Response:
+        url = getattr(settings, self.ENDPOINTS[endpoint])
+        timeout = settings.ALADIN_TIMEOUTS[endpoint]
+        breaker("aladin").check()
+        governor.acquire()
+        with upstream_call("aladin", endpoint):
+            res = self.session.get(url, params=self.build_params(output=output, **params), timeout=timeout)
+            retries = getattr(getattr(res.raw, "retries", None), "history", None) or ()
+            governor.record_retries(len(retries))
+            res.raise_for_status()
+        return res
+
+    async def aget(self, endpoint: str, output: str = "JS", **params) -> httpx.Response:
+        url = getattr(settings, self.ENDPOINTS[endpoint])
+        connect, read = settings.ALADIN_TIMEOUTS[endpoint]
+        timeout = httpx.Timeout(read, connect=connect)
+        breaker("aladin").check()
+        await governor.aacquire()
+        with upstream_call("aladin", endpoint):
+            # 동기 경로의 urllib3 Retry 와 같은 조건/백오프로 재시도
+            for attempt in range(settings.ALADIN_RETRY_TOTAL + 1):
+                last = attempt == settings.ALADIN_RETRY_TOTAL
+                try:
+                    res = await async_http_client("aladin").get(
+                        url, params=self.build_params(output=output, **params), timeout=timeout,
+                    )
+                except httpx.TransportError as e:
+                    if last:
+                        raise requests.ConnectionError(str(e)) from e
+                else:
+                    if res.status_code not in RETRY_STATUSES or last:
+                        break
+                backoff = settings.ALADIN_RETRY_BACKOFF * (2 ** attempt)
+                await asyncio.sleep(backoff + random.uniform(0, settings.ALADIN_RETRY_JITTER))
+            if attempt:
+                await sync_to_async(governor.record_retries)(attempt)
+            if res.is_error:
+                # 동기 경로와 같은 예외 계열 (RequestException) 로 통일, 서킷 판정용 상태 코드 유지
+                err = requests.HTTPError(f"{res.status_code} Error for url: {res.url}")
+                err.status_code = res.status_code
+                raise err
+        return res
+
+    # ---- 엔드포인트별 헬퍼 ----
+
+    def item_list(self, query_type: str, max_results: int = 10, start: int = 1) -> dict:
+        return self.get(
+            "list",
+            QueryType=query_type,
+            MaxResults=max_results,
+            start=start,
+            SearchTarget="Book",
+        ).json()
+
+    def item_search(self, query: str, query_type: str = "Keyword", max_results: int = 10,
+                    start: int = 1, sort: str = None, category_id=None) -> dict:
+        return self.get(
+            "search",
+            Query=query,
+            QueryType=query_type,
+            SearchTarget="Book",
+            MaxResults=max_results,
+            Start=start,
+            Sort=sort,
+            CategoryId=category_id,
+        ).json()
+
+    def item_lookup(self, isbn13: str) -> dict:
+        return self.get(
+            "lookup",
+            ItemId=isbn13,
+            ItemIdType="ISBN13",
+        ).json()
+
+    def item_lookup_xml(self, isbn13: str, opt_result: str = None) -> str:
+        return self.get(
+            "lookup",
+            output="xml",
+            ItemId=isbn13,
+            ItemIdType="ISBN13",
+            OptResult=opt_result,
+        ).text
+
+    async def aitem_search(self, query: str, query_type: str = "Keyword", max_results: int = 10,
+                           start: int = 1, sort: str = None, category_id=None) -> dict:
+        res = await self.aget(
+            "search",
+            Query=query,
+            QueryType=query_type,
+            SearchTarget="Book",
+            MaxResults=max_results,
+            Start=start,
+            Sort=sort,
+            CategoryId=category_id,
+        )
+        return res.json()
+
+
+aladin_client = AladinClient()
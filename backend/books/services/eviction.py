@@ -0,0 +1,106 @@
+# books/services/eviction.py
+
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from books.models import AladinSync, AladinListItem
+
+AUTHOR_SALES_PREFIX = "AuthorSales:"
+
+_last_touch = {}
+_touch_lock = threading.Lock()
+
+
+def touch_access(query_type: str):
+    """
+    캐시 키 사용 기록 (last_accessed_at, hit_count)
+    같은 키는 ALADIN_ACCESS_TOUCH_SECONDS 안에 한 번만 DB 에 쓴다.
+    """
+    now = time.monotonic()
+    with _touch_lock:
+        last = _last_touch.get(query_type)
+        if last is not None and now - last < settings.ALADIN_ACCESS_TOUCH_SECONDS:
+            return
+        _last_touch[query_type] = now
+        # 오래 쓰지 않은 키가 쌓이지 않도록
+        if len(_last_touch) > 10000:
+            _last_touch.clear()
+
+    AladinSync.objects.filter(query_type=query_type).update(
+        last_accessed_at=timezone.now(),
+        hit_count=F("hit_count") + 1,
+    )
+
+
+def _coldest_first(qs):
+    if settings.ALADIN_AUTHOR_SALES_EVICTION == "lfu":
+        return qs.order_by("hit_count", F("last_accessed_at").asc(nulls_first=True), "updated_at")
+    return qs.order_by(F("last_accessed_at").asc(nulls_first=True), "hit_count", "updated_at")
+
+
+def compact_author_sales(max_keys: int = None, max_rows: int = None, batch_size: int = None) -> dict:
+    """
+    AuthorSales:* 캐시를 키 수/행 수 상한 안으로 줄인다.
+    - 사용 기록(LRU 또는 LFU) 기준으로 가장 차가운 키부터 제거
+    - AladinSync 없이 남은 고아 AladinListItem 도 정리
+    - batch_size 개 키씩 나눠서 삭제 (긴 쓰기 락 방지)
+    반환: {"keys_before", "rows_before", "evicted_keys", "deleted_rows"}
+    """
+    max_keys = settings.ALADIN_AUTHOR_SALES_MAX_KEYS if max_keys is None else max_keys
+    max_rows = settings.ALADIN_AUTHOR_SALES_MAX_ROWS if max_rows is None else max_rows
+    batch_size = batch_size or settings.ALADIN_EVICTION_BATCH_SIZE
+
+    row_counts = dict(
+        AladinListItem.objects
+        .filter(query_type__startswith=AUTHOR_SALES_PREFIX)
+        .values_list("query_type")
+        .annotate(n=Count("id"))
+    )
+    keys = list(
+        _coldest_first(AladinSync.objects.filter(query_type__startswith=AUTHOR_SALES_PREFIX))
+        .values_list("query_type", flat=True)
+    )
+    # 프리웜(aladin_refresh)이 방금 채운 키는 아직 읽힌 적이 없어 가장 차갑게 보이므로
+    # 갱신 주기 한 번이 지날 때까지는 맨 뒤로 (상한을 지키려면 어쩔 수 없을 때만 제거)
+    warmed_since = timezone.now() - timedelta(seconds=settings.ALADIN_REFRESH_INTERVAL)
+    fresh_warmed = set(
+        AladinSync.objects
+        .filter(query_type__startswith=AUTHOR_SALES_PREFIX, last_accessed_at__isnull=True, updated_at__gte=warmed_since)
+        .values_list("query_type", flat=True)
+    )
+
+    keys = [k for k in keys if k not in fresh_warmed] + [k for k in keys if k in fresh_warmed]
+
+    key_set = set(keys)
+    orphans = [k for k in row_counts if k not in key_set]
+    total_keys = len(keys)
+    total_rows = sum(row_counts.values())
+    result = {"keys_before": total_keys, "rows_before": total_rows, "evicted_keys": 0, "deleted_rows": 0}
+
+    victims = list(orphans)
+    rows_left = total_rows - sum(row_counts[k] for k in orphans)
+    keys_left = total_keys
+    for key in keys:
+        if keys_left <= max_keys and rows_left <= max_rows:
+            break
+        victims.append(key)
+        keys_left -= 1
+        rows_left -= row_counts.get(key, 0)
+
+    for start in range(0, len(victims), batch_size):
+        batch = victims[start:start + batch_size]
+        with transaction.atomic():
+            deleted, _ = AladinListItem.objects.filter(query_type__in=batch).delete()
+            evicted, _ = AladinSync.objects.filter(query_type__in=batch).delete()
+        result["deleted_rows"] += deleted
+        result["evicted_keys"] += evicted
+
+    with _touch_lock:
+        for key in victims:
+            _last_touch.pop(key, None)
+
+    return result
@@ -0,0 +1,158 @@
+# books/services/local_search.py
+
+import re
+from django.db import connection
+from django.db.models import Q
+from books.models import SearchDocument
+from .suggest import suggest_index
+
+FTS_TABLE = "books_searchdocument_fts"
+
+# 문서 필드 (isbn13 제외)
+DOCUMENT_FIELDS = [
+    "title",
+    "author",
+    "publisher",
+    "category_name",
+    "description",
+    "cover",
+    "pub_date",
+    "sales_point",
+    "customer_review_rank",
+]
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+# ---- 인덱싱 ----
+
+def doc_from_book(book) -> dict:
+    return {
+        "isbn13": book.isbn13,
+        "title": book.title or "",
+        "author": book.author or "",
+        "publisher": book.publisher or "",
+        "category_name": book.category_name or "",
+        "description": book.description or "",
+        "cover": book.cover or "",
+        "pub_date": book.pub_date,
+        "sales_point": book.sales_point or 0,
+        "customer_review_rank": book.customer_review_rank,
+    }
+
+
+def index_documents(docs):
+    """
+    SearchDocument upsert (isbn13 기준). 전문 검색 인덱스는 DB 트리거/식 인덱스가 따라감.
+    """
+    docs = list(docs)
+    rows = {}
+    for d in docs:
+        if d.get("isbn13"):
+            rows[d["isbn13"]] = SearchDocument(**d)
+    if not rows:
+        return
+
+    SearchDocument.objects.bulk_create(
+        list(rows.values()),
+        update_conflicts=True,
+        unique_fields=["isbn13"],
+        update_fields=DOCUMENT_FIELDS + ["updated_at"],
+    )
+
+    # 자동완성 인덱스에도 바로 반영
+    suggest_index.add_documents(d for d in docs if d.get("isbn13"))
+
+
+# ---- 검색 ----
+
+def _tokens(q: str):
+    return _TOKEN_RE.findall(q or "")
+
+
+def _to_item(doc: SearchDocument) -> dict:
+    # /api/books/search 의 알라딘 결과와 같은 모양
+    return {
+        "title": doc.title,
+        "author": doc.author,
+        "publisher": doc.publisher,
+        "pub_date": doc.pub_date.isoformat() if doc.pub_date else None,
+        "isbn13": doc.isbn13,
+        "cover": doc.cover,
+        "sales_point": doc.sales_point,
+        "customer_review_rank": doc.customer_review_rank,
+    }
+
+
+def _search_sqlite(tokens, offset, limit):
+    # 각 토큰을 접두어 검색 ("해리"* → 해리포터) 후 AND
+    match = " ".join('"{}"*'.format(t.replace('"', '""')) for t in tokens)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+        total = cursor.fetchone()[0]
+        # bm25 가중치: title, author, publisher, category_name, description
+        cursor.execute(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"ORDER BY bm25({FTS_TABLE}, 10.0, 5.0, 2.0, 1.0, 0.5) LIMIT %s OFFSET %s",
+            [match, limit, offset],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    docs = SearchDocument.objects.in_bulk(ids)
+    return total, [docs[i] for i in ids if i in docs]
+
+
+# 전문 검색 대상 필드 (0015 마이그레이션의 GIN 인덱스도 같은 필드/순서/config 로 만든다)
+SEARCH_VECTOR_FIELDS = ("title", "author", "publisher", "category_name", "description")
+SEARCH_CONFIG = "simple"
+
+
+def document_vector():
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector(*SEARCH_VECTOR_FIELDS, config=SEARCH_CONFIG)
+
+
+def _search_postgres(tokens, offset, limit):
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+
+    # GIN 인덱스(books_searchdocument_fts_idx)와 같은 식이어야 플래너가 인덱스를 쓴다
+    vector = document_vector()
+    query = SearchQuery(" & ".join(f"{t}:*" for t in tokens), search_type="raw", config=SEARCH_CONFIG)
+    qs = (
+        SearchDocument.objects
+        .annotate(search=vector)
+        .filter(search=query)
+        .annotate(rank=SearchRank(vector, query))
+    )
+    total = qs.count()
+    return total, list(qs.order_by("-rank", "-sales_point")[offset:offset + limit])
+
+
+def _search_fallback(tokens, offset, limit):
+    cond = Q()
+    for t in tokens:
+        cond &= Q(title__icontains=t) | Q(author__icontains=t) | Q(publisher__icontains=t)
+    qs = SearchDocument.objects.filter(cond).order_by("-sales_point", "-id")
+    return qs.count(), list(qs[offset:offset + limit])
+
+
+def search_local(q: str, page: int = 1, size: int = 10) -> dict:
+    """
+    DB 에 저장된 도서에서 검색 (알라딘 호출 없음)
+    반환: {"total": int, "items": [...]}
+    """
+    tokens = _tokens(q)
+    if not tokens:
+        return {"total": 0, "items": []}
+
+    size = min(int(size), 50)
+    offset = (max(int(page), 1) - 1) * size
+
+    if connection.vendor == "sqlite":
+        total, docs = _search_sqlite(tokens, offset, size)
+    elif connection.vendor == "postgresql":
+        total, docs = _search_postgres(tokens, offset, size)
+    else:
+        total, docs = _search_fallback(tokens, offset, size)
+
+    return {"total": total, "items": [_to_item(d) for d in docs]}
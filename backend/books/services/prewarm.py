@@ -0,0 +1,219 @@
+# books/services/prewarm.py
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+from django.utils import timezone
+from books.models import Book, Bookmark
+from reviews.models import Review
+from .aladin import (
+    aladin_sync_age,
+    catalog_miss_isbn13s,
+    get_books_by_isbn13s,
+    get_list_ttl,
+    refresh_aladin_list,
+    validate_isbn13,
+)
+from .recommendations import (
+    AUTHOR_SALES_LIMIT,
+    AUTHOR_SALES_TTL_HOURS,
+    author_sales_key,
+    refresh_author_sales,
+    _author_for_search,
+)
+from .quota import BACKGROUND, aladin_priority, governor
+from .singleflight import single_flight
+
+
+class RefreshTask:
+    """
+    갱신 작업 하나
+    - key: single_flight 키
+    - calls: 예상 알라딘 호출 수 (호출 예산 계산용)
+    """
+
+    def __init__(self, key: str, fn, calls: int = 1):
+        self.key = key
+        self.fn = fn
+        self.calls = calls
+
+
+def _due(sync_key: str, ttl: timedelta) -> bool:
+    # 만료되기 전에(ttl * ahead 시점부터) 미리 갱신
+    age = aladin_sync_age(sync_key)
+    return age is None or age >= ttl * settings.ALADIN_PREWARM_AHEAD
+
+
+def top_bookmarked_authors(limit: int):
+    rows = (
+        Bookmark.objects
+        .values("book__author")
+        .annotate(cnt=Count("id"))
+        .order_by("-cnt")[: limit * 2]
+    )
+    authors = []
+    for row in rows:
+        author = _author_for_search(row["book__author"])
+        if author and author not in authors:
+            authors.append(author)
+        if len(authors) >= limit:
+            break
+    return authors
+
+
+def demanded_isbn13s(limit: int):
+    """
+    카탈로그에 아직 없는데 찾는 사람이 있는 ISBN
+    - 최근 리뷰/북마크가 많은 ISBN (북마크는 Book 이 있어야 하므로 사실상 리뷰 쪽)
+    - 알라딘 검색 결과에 자주 나왔지만 Book 에 없는 ISBN
+    """
+    out = []
+    for isbn13 in trending_isbn13s(limit) + catalog_miss_isbn13s(limit):
+        try:
+            isbn13 = validate_isbn13(isbn13)
+        except ValueError:
+            continue
+        if isbn13 not in out:
+            out.append(isbn13)
+    existing = set(Book.objects.filter(isbn13__in=out).values_list("isbn13", flat=True))
+    return [i for i in out if i not in existing][:limit]
+
+
+def fetch_new_books(isbn13s) -> dict:
+    # 실행 시점에 이미 있는 건 빼고 새로 만든 행만 센다
+    existing = set(Book.objects.filter(isbn13__in=isbn13s).values_list("isbn13", flat=True))
+    books = get_books_by_isbn13s([i for i in isbn13s if i not in existing])
+    return {"inserted": sum(1 for i in books if i not in existing)}
+
+
+def trending_isbn13s(limit: int, days: int = 7):
+    since = timezone.now() - timedelta(days=days)
+    counts = {}
+    for isbn13, cnt in (
+        Bookmark.objects.filter(created_at__gte=since)
+        .values_list("book__isbn13")
+        .annotate(cnt=Count("id"))
+    ):
+        counts[isbn13] = counts.get(isbn13, 0) + cnt
+    for isbn13, cnt in (
+        Review.objects.filter(created_at__gte=since)
+        .exclude(isbn13="")
+        .values_list("isbn13")
+        .annotate(cnt=Count("id"))
+    ):
+        counts[isbn13] = counts.get(isbn13, 0) + cnt
+
+    ranked = sorted(counts, key=lambda k: -counts[k])
+    out = []
+    for isbn13 in ranked:
+        try:
+            out.append(validate_isbn13(isbn13))
+        except ValueError:
+            continue
+        if len(out) >= limit:
+            break
+    return out
+
+
+def plan_refresh(authors: int = 20, trending: int = 50):
+    """
+    만료가 가까운 캐시만 골라서 갱신 작업 목록 생성
+    1) 목록 (Bestseller, ItemNewSpecial ...)
+    2) 많이 북마크된 저자의 AuthorSales:* 키
+    3) 최근 인기/검색된 ISBN 중 아직 Book 테이블에 없는 것
+    """
+    tasks = []
+
+    for query_type, limit in settings.ALADIN_PREWARM_LISTS.items():
+        soft_ttl, _hard_ttl = get_list_ttl(query_type)
+        if _due(query_type, soft_ttl):
+            tasks.append(RefreshTask(
+                f"aladin:list:{query_type}",
+                lambda qt=query_type, n=limit: refresh_aladin_list(query_type=qt, max_results=n),
+            ))
+
+    for author in top_bookmarked_authors(authors) if authors else []:
+        key = author_sales_key(author)
+        if _due(key, timedelta(hours=AUTHOR_SALES_TTL_HOURS)):
+            tasks.append(RefreshTask(
+                f"aladin:list:{key}",
+                lambda a=author: refresh_author_sales(a, limit=AUTHOR_SALES_LIMIT),
+            ))
+
+    if trending:
+        missing = demanded_isbn13s(trending)
+        size = settings.BOOK_BATCH_MAX_SIZE
+        for start in range(0, len(missing), size):
+            chunk = missing[start:start + size]
+            tasks.append(RefreshTask(
+                f"aladin:books:trending:{start}",
+                lambda c=chunk: fetch_new_books(c),
+                calls=len(chunk),
+            ))
+
+    return tasks
+
+
+def _run_task(task: RefreshTask):
+    try:
+        with aladin_priority(BACKGROUND):
+            return task.key, single_flight(task.key, task.fn), None
+    except Exception as e:
+        return task.key, None, e
+    finally:
+        connection.close()
+
+
+def run_refresh_cycle(authors: int = 20, trending: int = 50, concurrency: int = 4, budget: int = None, log=print):
+    """
+    갱신 한 사이클 실행
+    - concurrency: 동시에 실행할 작업 수
+    - budget: 이번 사이클에서 쓸 최대 알라딘 호출 수 (넘는 작업은 다음 사이클로)
+    반환: {"planned", "run", "skipped", "failed", "calls", "rows": 행 변경 수 합계}
+    """
+    if budget is None:
+        budget = settings.ALADIN_REFRESH_CALL_BUDGET
+    # 일일 할당량 중 백그라운드 몫이 얼마 안 남았으면 그만큼만
+    budget = min(budget, governor.available(BACKGROUND))
+
+    tasks = plan_refresh(authors=authors, trending=trending)
+    # 목록은 항상 먼저, 나머지는 매번 순서를 섞어서 특정 키만 계속 밀리지 않도록
+    lists = [t for t in tasks if t.key.startswith("aladin:list:") and not t.key.startswith("aladin:list:AuthorSales:")]
+    rest = [t for t in tasks if t not in lists]
+    random.shuffle(rest)
+
+    selected = []
+    used = 0
+    for task in lists + rest:
+        if used + task.calls > budget:
+            continue
+        selected.append(task)
+        used += task.calls
+
+    failed = 0
+    rows = {"inserted": 0, "updated": 0, "rank_updated": 0, "unchanged": 0, "deleted": 0}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for key, counts, error in executor.map(_run_task, selected):
+            if error is not None:
+                failed += 1
+                log(f"🚨 갱신 실패 ({key}): {error}")
+                continue
+            for name, value in (counts or {}).items():
+                rows[name] = rows.get(name, 0) + value
+
+    return {
+        "planned": len(tasks),
+        "run": len(selected),
+        "skipped": len(tasks) - len(selected),
+        "failed": failed,
+        "calls": used,
+        "rows": rows,
+    }
+
+
+def next_delay(interval: float, jitter: float) -> float:
+    # 여러 워커/서버가 같은 시각에 몰리지 않도록 ±jitter 비율만큼 흔든다
+    return max(1.0, interval * random.uniform(1 - jitter, 1 + jitter))
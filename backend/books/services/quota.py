@@ -0,0 +1,203 @@
+# books/services/quota.py
+
+import asyncio
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache as shared_cache
+from django.db.models import F
+from django.utils import timezone
+from books.models import AladinQuotaUsage
+from .cache import incr_stat
+
+# 호출 우선순위
+USER = "user"               # 사용자 요청 경로 (상세, 검색, 북마크 ...)
+BACKGROUND = "background"   # 백그라운드 갱신, 프리웜
+
+_priority = contextvars.ContextVar("aladin_priority", default=USER)
+
+
+class QuotaExceeded(requests.RequestException):
+    """
+    알라딘 호출 한도(일일 할당량/호출 속도) 초과로 호출하지 않음.
+    requests.RequestException 이므로 기존 알라딘 장애 대체 경로(캐시/로컬 데이터)를 그대로 탄다.
+    알라딘 쪽 장애가 아니므로 서킷 브레이커 실패로는 세지 않는다.
+    """
+
+    upstream_failure = False
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+@contextmanager
+def aladin_priority(priority: str):
+    """
+    이 블록 안의 알라딘 호출 우선순위 지정 (스레드풀로 넘길 때는 작업 안에서 다시 지정해야 함)
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class RateWindow:
+    """
+    워커 간 공유 호출 속도 제한 (settings.CACHES 의 1초 단위 카운터)
+    - 1초 창마다 최대 rate 번 (모든 워커 합계, CACHES 가 LocMem 이면 프로세스당)
+    - 우선순위: 백그라운드는 창마다 사용자 몫(user_share)을 남기고 그 전까지만 가져간다
+      → 사용자 호출이 몰리면 백그라운드는 다음 창으로 밀림
+    """
+
+    def __init__(self, rate: int, user_share: float, prefix: str = "aladin:rate"):
+        self.rate = max(1, int(rate))
+        self.background_rate = max(1, int(self.rate * (1 - user_share)))
+        self.prefix = prefix
+
+    def limit_for(self, priority: str) -> int:
+        return self.background_rate if priority == BACKGROUND else self.rate
+
+    def _take(self, priority: str) -> float:
+        # 자리를 얻었으면 0, 아니면 다음 창까지 기다릴 시간
+        now = time.time()
+        window = int(now)
+        key = f"{self.prefix}:{window}"
+        shared_cache.add(key, 0, timeout=5)
+        try:
+            count = shared_cache.incr(key)
+        except ValueError:
+            # 창이 막 만료된 경우 → 다음 창에서 다시
+            return max(0.01, window + 1 - now)
+        if count <= self.limit_for(priority):
+            return 0
+        # 자리를 못 얻었으면 되돌려서 다른 호출(특히 사용자 호출)을 막지 않도록
+        shared_cache.decr(key)
+        return max(0.01, window + 1 - now)
+
+    def acquire(self, priority: str, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self._take(priority)
+            if not wait:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    async def aacquire(self, priority: str, timeout: float) -> bool:
+        # 이벤트 루프를 막지 않고 대기 (캐시 접근은 스레드에서)
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = await sync_to_async(self._take)(priority)
+            if not wait:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+    def used(self) -> int:
+        return shared_cache.get(f"{self.prefix}:{int(time.time())}", 0)
+
+
+class QuotaGovernor:
+    """
+    모든 알라딘 호출 앞에서 실행
+    1) 워커 간 공유 RateWindow 로 호출 속도 제한 (우선순위별 몫과 대기 시간)
+    2) 워커 간 공유되는 일일 사용량(AladinQuotaUsage)에 조건부 F() 증가로 예약
+       - 사용자 호출: 일일 할당량 전체까지
+       - 백그라운드 호출: 사용자 몫(ALADIN_QUOTA_USER_RESERVE)을 남기고 그 전까지만
+    한도를 넘으면 QuotaExceeded
+    """
+
+    def __init__(self):
+        self._rate = None
+        self._row_day = None
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> RateWindow:
+        with self._lock:
+            if self._rate is None:
+                self._rate = RateWindow(settings.ALADIN_RATE_PER_SECOND, settings.ALADIN_RATE_USER_SHARE)
+            return self._rate
+
+    def limit_for(self, priority: str) -> int:
+        quota = settings.ALADIN_DAILY_QUOTA
+        if priority == BACKGROUND:
+            return int(quota * (1 - settings.ALADIN_QUOTA_USER_RESERVE))
+        return quota
+
+    def _today_row(self):
+        day = timezone.localdate()
+        if self._row_day != day:
+            AladinQuotaUsage.objects.get_or_create(day=day)
+            self._row_day = day
+        return day
+
+    def _reserve(self, priority: str) -> bool:
+        day = self._today_row()
+        field = f"{priority}_calls"
+        updated = AladinQuotaUsage.objects.filter(day=day, calls__lt=self.limit_for(priority)).update(
+            calls=F("calls") + 1,
+            **{field: F(field) + 1},
+            updated_at=timezone.now(),
+        )
+        return updated == 1
+
+    def _reject(self, priority: str, reason: str):
+        incr_stat(f"aladin.quota.rejected.{priority}")
+        AladinQuotaUsage.objects.filter(day=self._today_row()).update(rejected=F("rejected") + 1)
+        raise QuotaExceeded(reason)
+
+    def acquire(self):
+        priority = current_priority()
+        if not self.rate.acquire(priority, settings.ALADIN_RATE_WAIT[priority]):
+            self._reject(priority, "알라딘 호출 속도 제한 초과")
+        if not self._reserve(priority):
+            self._reject(priority, "알라딘 일일 호출 한도 초과")
+        incr_stat(f"aladin.quota.calls.{priority}")
+
+    async def aacquire(self):
+        priority = current_priority()
+        if not await self.rate.aacquire(priority, settings.ALADIN_RATE_WAIT[priority]):
+            await sync_to_async(self._reject)(priority, "알라딘 호출 속도 제한 초과")
+        if not await sync_to_async(self._reserve)(priority):
+            await sync_to_async(self._reject)(priority, "알라딘 일일 호출 한도 초과")
+        incr_stat(f"aladin.quota.calls.{priority}")
+
+    def record_retries(self, count: int):
+        # 재시도로 실제 나간 추가 호출도 사용량에 반영 (한도 검사 없이)
+        if count > 0:
+            AladinQuotaUsage.objects.filter(day=self._today_row()).update(calls=F("calls") + count)
+
+    def usage(self):
+        return AladinQuotaUsage.objects.filter(day=timezone.localdate()).first()
+
+    def available(self, priority: str = USER) -> int:
+        row = self.usage()
+        used = row.calls if row else 0
+        return max(0, self.limit_for(priority) - used)
+
+    def snapshot(self) -> dict:
+        row = self.usage()
+        used = row.calls if row else 0
+        return {
+            "day": timezone.localdate().isoformat(),
+            "quota": settings.ALADIN_DAILY_QUOTA,
+            "used": used,
+            "user_calls": row.user_calls if row else 0,
+            "background_calls": row.background_calls if row else 0,
+            "rejected": row.rejected if row else 0,
+            "remaining": {p: max(0, self.limit_for(p) - used) for p in (USER, BACKGROUND)},
+            "rate_per_second": settings.ALADIN_RATE_PER_SECOND,
+            "rate_used": self.rate.used(),
+        }
+
+
+governor = QuotaGovernor()
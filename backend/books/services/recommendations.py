@@ -2,14 +2,22 @@
 
 import random
 import requests
-from django.conf import settings
 from django.utils import timezone
 from django.db.models import Count
 from datetime import timedelta
+from config.metrics import count_cache
 from users.models import Follow
 from books.models import Book, Bookmark, AladinSync, AladinListItem
 from reviews.models import Review
-from .aladin import _to_cover500
+from .aladin import upsert_aladin_list
+from .client import aladin_client
+from .eviction import touch_access
+from .singleflight import single_flight
+
+
+# 북마크 기반 추천에서 저자별로 캐시하는 판매량순 도서 수 / 유효 시간
+AUTHOR_SALES_LIMIT = 30
+AUTHOR_SALES_TTL_HOURS = 24
 
 
 def _author_for_search(raw: str) -> str:
@@ -35,68 +43,48 @@ def _is_fresh(key: str, ttl_hours: int = 24) -> bool:
     return timezone.now() - sync.updated_at < timedelta(hours=ttl_hours)
 
 
-def _touch(key: str):
-    AladinSync.objects.update_or_create(query_type=key)
-
-
 def _fetch_itemsearch_author_sales(author: str, max_results: int = 20, start: int = 1):
-    params = {
-        "ttbkey": settings.ALADIN_TTB_KEY,
-        "Query": author,
-        "QueryType": "Author",
-        "SearchTarget": "Book",
-        "Sort": "SalesPoint",
-        "MaxResults": max_results,
-        "Start": start,
-        "Output": "JS",
-        "Version": settings.ALADIN_API_VERSION,
-    }
-    res = requests.get(settings.ALADIN_SEARCH_URL, params=params, timeout=10)
-    res.raise_for_status()
-    data = res.json()
+    data = aladin_client.item_search(
+        author,
+        query_type="Author",
+        max_results=max_results,
+        start=start,
+        sort="SalesPoint",
+    )
     return data.get("item", [])
 
 
+def author_sales_key(author: str) -> str:
+    return f"AuthorSales:{author}"
+
+
+def refresh_author_sales(author: str, limit: int = 20) -> dict:
+    items = _fetch_itemsearch_author_sales(author, max_results=limit, start=1)
+    return upsert_aladin_list(author_sales_key(author), items)
+
+
 def _get_cached_author_sales(author: str, limit: int = 20, ttl_hours: int = 24):
-    key = f"AuthorSales:{author}"
-
-    if not _is_fresh(key, ttl_hours=ttl_hours):
-        items = _fetch_itemsearch_author_sales(author, max_results=limit, start=1)
-
-        alive_item_ids = []
-        for it in items:
-            item_id = it.get("itemId")
-            if not item_id:
-                continue
-            alive_item_ids.append(item_id)
-
-            defaults = {
-                "category_id": it.get("categoryId"),
-                "category_name": it.get("categoryName", "") or "",
-                "mall_type": it.get("mallType", "") or "",
-                "isbn": it.get("isbn", "") or "",
-                "isbn13": it.get("isbn13", "") or "",
-                "title": it.get("title", "") or "",
-                "author": it.get("author", "") or "",
-                "publisher": it.get("publisher", "") or "",
-                "pub_date": None,
-                "description": it.get("description", "") or "",
-                "cover": _to_cover500(it.get("cover", "") or ""),
-                "best_rank": it.get("bestRank"),
-                "sales_point": it.get("salesPoint") or 0,
-                "customer_review_rank": it.get("customerReviewRank"),
-            }
-
-            AladinListItem.objects.update_or_create(
-                query_type=key,
-                item_id=item_id,
-                defaults=defaults,
+    key = author_sales_key(author)
+
+    fresh = _is_fresh(key, ttl_hours=ttl_hours)
+    count_cache("author_sales", "hit" if fresh else "miss")
+    if not fresh:
+        try:
+            single_flight(
+                f"aladin:list:{key}",
+                lambda: refresh_author_sales(author, limit=limit),
+                reuse=lambda: True if _is_fresh(key, ttl_hours=ttl_hours) else None,
             )
+        except requests.RequestException as e:
+            # 알라딘 장애/할당량 소진 → 남아 있는 (오래된) 목록 사용
+            print(f"🚨 저자 판매 목록 갱신 실패 ({key}, 기존 목록 사용): {e}")
 
-        AladinListItem.objects.filter(query_type=key).exclude(item_id__in=alive_item_ids).delete()
-        _touch(key)
-
-    return AladinListItem.objects.filter(query_type=key).order_by("-sales_point", "-id")[:limit]
+    touch_access(key)
+    return (
+        AladinListItem.objects.filter(query_type=key)
+        .select_related("book")
+        .order_by("-sales_point", "-id")[:limit]
+    )
 
 
 def recommend_bookmark_based_aladin(user, limit=5):
@@ -119,13 +107,11 @@ def recommend_bookmark_based_aladin(user, limit=5):
         .values_list("book__isbn13", flat=True)
     )
 
-    cand = _get_cached_author_sales(author, limit=30, ttl_hours=24)
+    cand = _get_cached_author_sales(author, limit=AUTHOR_SALES_LIMIT, ttl_hours=AUTHOR_SALES_TTL_HOURS)
 
     items = []
     for it in cand:
-        if not it.isbn13:
-            continue
-        if it.isbn13 in bookmarked_isbn13:
+        if it.book.isbn13 in bookmarked_isbn13:
             continue
         items.append(it)
         if len(items) == limit:
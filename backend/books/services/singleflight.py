@@ -0,0 +1,110 @@
+# books/services/singleflight.py
+
+import hashlib
+import os
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from books.models import FetchLock
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _lock_key(key: str) -> str:
+    # FetchLock.key 길이(100) 초과 시 해시로 축약
+    if len(key) <= 100:
+        return key
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return f"{key[:59]}#{digest}"
+
+
+def _owner() -> str:
+    return f"{os.getpid()}:{threading.get_ident()}"
+
+
+def _acquire(key: str, owner: str, ttl_seconds: int) -> bool:
+    now = timezone.now()
+    # 죽은 워커가 남긴 만료 락 정리
+    FetchLock.objects.filter(key=key, expires_at__lt=now).delete()
+    try:
+        with transaction.atomic():
+            FetchLock.objects.create(key=key, owner=owner, expires_at=now + timedelta(seconds=ttl_seconds))
+        return True
+    except IntegrityError:
+        return False
+
+
+def _release(key: str, owner: str):
+    FetchLock.objects.filter(key=key, owner=owner).delete()
+
+
+def _run_with_db_lock(key, fn, reuse):
+    # 락을 얻을 때까지 직접 가져오지 않는다 (보유자가 끝나거나 죽으면 SINGLE_FLIGHT_LOCK_TTL 안에 풀림)
+    lock_key = _lock_key(key)
+    owner = _owner()
+    while True:
+        if _acquire(lock_key, owner, settings.SINGLE_FLIGHT_LOCK_TTL):
+            try:
+                # 락을 얻기 직전에 다른 워커가 끝냈을 수 있음
+                if reuse is not None:
+                    result = reuse()
+                    if result is not None:
+                        return result
+                return fn()
+            finally:
+                _release(lock_key, owner)
+
+        # 다른 워커가 가져오는 중 → 결과가 생기면 재사용
+        if reuse is not None:
+            result = reuse()
+            if result is not None:
+                return result
+
+        time.sleep(settings.SINGLE_FLIGHT_POLL)
+
+
+def single_flight(key: str, fn, reuse=None):
+    """
+    같은 key 에 대한 동시 호출 중 하나만 fn() 을 실행한다.
+    - 프로세스 내: 먼저 들어온 스레드가 실행하고 나머지 스레드는 그 결과(예외 포함)를 공유
+    - 워커 간: FetchLock 행을 잡은 워커만 실행하고, 나머지는 reuse() 로 DB 결과를 재사용
+    - 기다리다 시간이 지나도 직접 fn() 을 부르지 않는다 (느린 알라딘 호출이 대기자 수만큼 퍼지지 않도록)
+    reuse: 이미 채워진 결과를 돌려주는 함수 (아직 없으면 None)
+    """
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _Call()
+            _inflight[key] = call
+
+    if not leader:
+        if not call.event.wait(max(settings.SINGLE_FLIGHT_WAIT, settings.SINGLE_FLIGHT_LOCK_TTL)):
+            # 먼저 들어온 스레드가 너무 오래 걸림 → 바로 가져오지 않고 DB 락/결과 재사용 경로로
+            return _run_with_db_lock(key, fn, reuse)
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = _run_with_db_lock(key, fn, reuse)
+        return call.result
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        call.event.set()
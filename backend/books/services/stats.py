@@ -0,0 +1,121 @@
+# books/services/stats.py
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.utils import timezone
+from books.models import BookStats, Bookmark
+from reviews.models import Review
+
+RATINGS = range(1, 6)
+
+
+def _apply(isbn13: str, **deltas):
+    """
+    BookStats 행에 증감분을 F() 로 반영 (행이 없으면 먼저 만든다)
+    """
+    if not isbn13:
+        return
+    updates = {name: F(name) + delta for name, delta in deltas.items() if delta}
+    updates["last_activity"] = timezone.now()
+    with transaction.atomic():
+        BookStats.objects.get_or_create(isbn13=isbn13)
+        BookStats.objects.filter(isbn13=isbn13).update(**updates)
+
+
+def _rating_deltas(rating, sign: int) -> dict:
+    if not rating:
+        return {}
+    return {
+        "rating_count": sign,
+        "rating_sum": sign * rating,
+        f"rating_{rating}": sign,
+    }
+
+
+# ---- 쓰기 경로에서 호출 (같은 트랜잭션 안에서) ----
+
+def on_review_created(review):
+    _apply(review.isbn13, review_count=1, **_rating_deltas(review.rating, 1))
+
+
+def on_review_deleted(review):
+    _apply(review.isbn13, review_count=-1, **_rating_deltas(review.rating, -1))
+
+
+def on_review_updated(review, old_rating):
+    # 별점이 그대로여도 last_activity 는 갱신 (도서 상세 ETag 가 바뀌도록)
+    deltas = {}
+    if old_rating != review.rating:
+        deltas = _rating_deltas(old_rating, -1)
+        for name, delta in _rating_deltas(review.rating, 1).items():
+            deltas[name] = deltas.get(name, 0) + delta
+    _apply(review.isbn13, **deltas)
+
+
+def on_bookmark_toggled(isbn13: str, added: bool):
+    _apply(isbn13, bookmark_count=1 if added else -1)
+
+
+# ---- 조회 ----
+
+def get_book_stats(isbn13: str):
+    return BookStats.objects.filter(isbn13=isbn13).first()
+
+
+def get_book_stats_map(isbn13s) -> dict:
+    # 목록/검색 보강용: {isbn13: BookStats} (쿼리 한 번)
+    isbn13s = [i for i in isbn13s if i]
+    if not isbn13s:
+        return {}
+    return BookStats.objects.in_bulk(isbn13s, field_name="isbn13")
+
+
+# ---- 전체 재계산 ----
+
+def rebuild_book_stats() -> int:
+    """
+    reviews_review / books_bookmark 를 다시 집계해서 BookStats 를 통째로 교체
+    반환: 저장한 행 수
+    """
+    rows = {}
+
+    def row(isbn13):
+        if isbn13 not in rows:
+            rows[isbn13] = BookStats(isbn13=isbn13)
+        return rows[isbn13]
+
+    review_aggs = (
+        Review.objects.exclude(isbn13="")
+        .values("isbn13")
+        .annotate(
+            review_count=Count("id"),
+            rating_count=Count("id", filter=Q(rating__isnull=False)),
+            rating_sum=Sum("rating", default=0),
+            last_review=Max("updated_at"),
+            **{f"rating_{r}": Count("id", filter=Q(rating=r)) for r in RATINGS},
+        )
+    )
+    for agg in review_aggs:
+        stats = row(agg["isbn13"])
+        stats.review_count = agg["review_count"]
+        stats.rating_count = agg["rating_count"]
+        stats.rating_sum = agg["rating_sum"]
+        for r in RATINGS:
+            setattr(stats, f"rating_{r}", agg[f"rating_{r}"])
+        stats.last_activity = agg["last_review"]
+
+    bookmark_aggs = (
+        Bookmark.objects.values("book__isbn13")
+        .annotate(bookmark_count=Count("id"), last_bookmark=Max("created_at"))
+    )
+    for agg in bookmark_aggs:
+        stats = row(agg["book__isbn13"])
+        stats.bookmark_count = agg["bookmark_count"]
+        if stats.last_activity is None or agg["last_bookmark"] > stats.last_activity:
+            stats.last_activity = agg["last_bookmark"]
+
+    with transaction.atomic():
+        BookStats.objects.all().delete()
+        BookStats.objects.bulk_create(rows.values(), batch_size=500)
+
+    return len(rows)
@@ -0,0 +1,245 @@
+# books/services/suggest.py
+
+import bisect
+import heapq
+import threading
+import time
+from django.conf import settings
+
+CHOSEONG = [
+    "ㄱ", "ㄲ", "ㄴ", "ㄷ", "ㄸ", "ㄹ", "ㅁ", "ㅂ", "ㅃ", "ㅅ",
+    "ㅆ", "ㅇ", "ㅈ", "ㅉ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+]
+_CHOSEONG_SET = set(CHOSEONG)
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+
+
+def to_choseong(s: str) -> str:
+    """
+    한글 음절을 초성으로 바꾼다. ("할매" → "ㅎㅁ", 한글이 아닌 글자는 그대로)
+    """
+    out = []
+    for ch in s:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            out.append(CHOSEONG[(code - _HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _normalize(s: str) -> str:
+    # 대소문자/공백 무시 ("해리 포" 로도 "해리포터" 매칭)
+    return "".join(str(s or "").lower().split())
+
+
+def _clean_author(raw: str) -> str:
+    # "한강 (지은이), 홍길동 (옮긴이)" → "한강"
+    s = str(raw or "").strip()
+    if "," in s:
+        s = s.split(",", 1)[0].strip()
+    if "(" in s:
+        s = s.split("(", 1)[0].strip()
+    return s
+
+
+def _matches_mixed(key: str, query: str) -> bool:
+    """
+    초성이 섞인 질의: 완성된 음절은 글자 그대로, 자음만 있는 자리는 초성으로 비교
+    ("할ㅁ" → "할매" 는 맞고 "한마디" 는 아님)
+    """
+    if len(key) < len(query):
+        return False
+    for k, q in zip(key, query):
+        if q in _CHOSEONG_SET:
+            if to_choseong(k) != q:
+                return False
+        elif k != q:
+            return False
+    return True
+
+
+class SuggestIndex:
+    """
+    제목/저자 자동완성용 메모리 접두어 인덱스
+    - (키, 항목번호) 를 정렬된 리스트로 들고 bisect 로 접두어 범위 탐색
+    - 키: 공백 제거한 전체 문자열 + 각 단어 시작 위치부터의 문자열, 그리고 각각의 초성 버전
+    - 새 문서는 insort 로 바로 추가, 다른 워커에서 저장된 문서는 주기적 전체 재구축으로 반영
+      (재구축은 백그라운드에서, 끝날 때까지 기존 인덱스로 응답)
+    """
+
+    # 이 길이 이하 질의는 접두어 범위가 넓어서 결과를 인덱스가 바뀔 때까지 기억
+    SHORT_QUERY = 2
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()   # 전체 구축은 한 번에 하나만 (첫 구축 때 동시 요청은 기다림)
+        self._entries = []      # [(text, kind, isbn13, weight)]
+        self._entry_ids = {}    # (kind, text) → 항목번호
+        self._text_keys = []    # [(key, 항목번호)]
+        self._cho_keys = []     # [(초성 키, 항목번호, key)]
+        self._built_at = None
+        self._rebuilding = False
+        self._pending = []      # 재구축 중에 추가된 문서 (교체 후 다시 반영)
+        self._short_results = {}
+
+    # ---- 구축 ----
+
+    def _keys_for(self, text: str):
+        words = str(text).split()
+        keys = set()
+        for i in range(len(words)):
+            key = _normalize("".join(words[i:]))
+            if key:
+                keys.add(key)
+        return keys
+
+    def _add_entry(self, text, kind, isbn13, weight, insort):
+        text = str(text or "").strip()
+        if not text:
+            return
+        entry_key = (kind, text)
+        idx = self._entry_ids.get(entry_key)
+        if idx is not None:
+            # 이미 있는 항목은 인기도만 갱신
+            old = self._entries[idx]
+            self._entries[idx] = (old[0], old[1], old[2] or isbn13, max(old[3], weight))
+            return
+
+        idx = len(self._entries)
+        self._entries.append((text, kind, isbn13, weight))
+        self._entry_ids[entry_key] = idx
+
+        for key in self._keys_for(text):
+            cho = to_choseong(key)
+            if insort:
+                bisect.insort(self._text_keys, (key, idx))
+                bisect.insort(self._cho_keys, (cho, idx, key))
+            else:
+                self._text_keys.append((key, idx))
+                self._cho_keys.append((cho, idx, key))
+
+    def _add_doc(self, doc, insort):
+        weight = doc.get("sales_point") or 0
+        self._add_entry(doc.get("title"), "title", doc.get("isbn13"), weight, insort)
+        self._add_entry(_clean_author(doc.get("author")), "author", None, weight, insort)
+
+    def rebuild(self):
+        with self._build_lock:
+            self._rebuild()
+
+    def _rebuild(self):
+        from books.models import SearchDocument
+
+        with self._lock:
+            self._rebuilding = True
+            self._pending = []
+        try:
+            docs = SearchDocument.objects.values("isbn13", "title", "author", "sales_point").iterator()
+
+            fresh = SuggestIndex()
+            for doc in docs:
+                fresh._add_doc(doc, insort=False)
+            fresh._text_keys.sort()
+            fresh._cho_keys.sort()
+
+            with self._lock:
+                self._entries = fresh._entries
+                self._entry_ids = fresh._entry_ids
+                self._text_keys = fresh._text_keys
+                self._cho_keys = fresh._cho_keys
+                # 구축하는 동안 저장된 문서를 새 인덱스에도
+                for doc in self._pending:
+                    self._add_doc(doc, insort=True)
+                self._short_results = {}
+                self._built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._rebuilding = False
+                self._pending = []
+
+    def add_documents(self, docs):
+        # 아직 한 번도 구축되지 않았으면 첫 조회 때 전체 구축하므로 건너뜀
+        if self._built_at is None:
+            return
+        with self._lock:
+            for doc in docs:
+                self._add_doc(doc, insort=True)
+                if self._rebuilding:
+                    self._pending.append(doc)
+            self._short_results = {}
+
+    def _ensure_built(self):
+        if self._built_at is None:
+            # 처음 한 번은 응답할 인덱스가 없으므로 직접 구축 (한 스레드만, 나머지는 끝날 때까지 기다림)
+            with self._build_lock:
+                if self._built_at is None:
+                    self._rebuild()
+        elif time.monotonic() - self._built_at > settings.SUGGEST_INDEX_REBUILD_SECONDS:
+            from .background import run_in_background
+
+            # 오래됐으면 백그라운드에서 재구축하고 그동안은 기존 인덱스로 응답
+            run_in_background("suggest:rebuild", self.rebuild)
+
+    # ---- 조회 ----
+
+    def suggest(self, q: str, limit: int = 10):
+        self._ensure_built()
+
+        query = _normalize(q)
+        if not query:
+            return []
+
+        memo_key = (query, limit)
+        if len(query) <= self.SHORT_QUERY:
+            cached = self._short_results.get(memo_key)
+            if cached is not None:
+                return list(cached)
+
+        mixed = any(ch in _CHOSEONG_SET for ch in query)
+        with self._lock:
+            # 접두어 범위 전체를 본다 (앞쪽 일부만 보면 인기순 정렬이 사전순 일부에만 적용됨)
+            candidates = {}
+            if mixed:
+                # 초성이 섞인 질의는 초성 키로 범위를 찾고 완성된 음절은 글자 그대로 확인
+                prefix = to_choseong(query)
+                keys = self._cho_keys
+                pos = bisect.bisect_left(keys, (prefix,))
+                matched = []
+                while pos < len(keys) and keys[pos][0].startswith(prefix):
+                    _, idx, key = keys[pos]
+                    if _matches_mixed(key, query):
+                        matched.append(idx)
+                    pos += 1
+            else:
+                keys = self._text_keys
+                pos = bisect.bisect_left(keys, (query,))
+                matched = []
+                while pos < len(keys) and keys[pos][0].startswith(query):
+                    matched.append(keys[pos][1])
+                    pos += 1
+
+            for idx in matched:
+                if idx in candidates:
+                    continue
+                # 문자열 맨 앞에서 맞은 항목 우선
+                head = _normalize(self._entries[idx][0])
+                candidates[idx] = _matches_mixed(head, query) if mixed else head.startswith(query)
+
+            ranked = heapq.nsmallest(
+                limit,
+                candidates.items(),
+                key=lambda kv: (not kv[1], -self._entries[kv[0]][3], len(self._entries[kv[0]][0])),
+            )
+            out = []
+            for idx, _ in ranked:
+                text, kind, isbn13, _weight = self._entries[idx]
+                out.append({"text": text, "type": kind, "isbn13": isbn13})
+
+            if len(query) <= self.SHORT_QUERY:
+                self._short_results[memo_key] = out
+            return list(out)
+
+
+suggest_index = SuggestIndex()
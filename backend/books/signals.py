@@ -0,0 +1,29 @@
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Book
+from .services.local_search import index_documents, doc_from_book
+
+
+# 로컬 검색 인덱스 동기화 (bulk_create 경로는 서비스 코드에서 직접 index_documents 호출)
+@receiver(post_save, sender=Book)
+def index_book(sender, instance, **kwargs):
+    index_documents([doc_from_book(instance)])
+
+
+# 큐레이터 도서는 저장 시 카탈로그 행에 연결 (없으면 큐레이터 데이터로 생성)
+@receiver(pre_save, sender="ai_curator.Book")
+def link_curator_book(sender, instance, raw=False, **kwargs):
+    if raw or instance.catalog_id or not instance.isbn13:
+        return
+    instance.catalog, _ = Book.objects.get_or_create(
+        isbn13=instance.isbn13,
+        defaults={
+            "title": instance.title,
+            "author": instance.author,
+            "publisher": instance.publisher,
+            "description": instance.description,
+            "cover": instance.cover or "",
+            "category_name": instance.category_name,
+        },
+    )
@@ -1,3 +1,489 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+import requests
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from config.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+from books.models import AladinListItem, AladinQuotaUsage, AladinSync, Book, BookStats, FetchLock
+from books.services import aladin
+from books.services.aladin import is_known_missing, negative_cache, remember_missing, search_books, search_cache
+from books.services.eviction import AUTHOR_SALES_PREFIX, compact_author_sales
+from books.services.quota import BACKGROUND, USER, QuotaExceeded, QuotaGovernor, RateWindow, aladin_priority
+from books.services.singleflight import single_flight
+from books.services.stats import rebuild_book_stats
+from users.models import User
 
-# Create your tests here.
+ISBN = "9788936434120"
+OTHER_ISBN = "9788937460449"
+
+
+def clear_caches():
+    # 공유 캐시(LocMem) + 프로세스 내 캐시를 테스트마다 비움
+    cache.clear()
+    negative_cache.local.clear()
+    search_cache.local.clear()
+
+
+# ---- single_flight ----
+
+@override_settings(SINGLE_FLIGHT_POLL=0.01)
+class SingleFlightTests(TransactionTestCase):
+    def setUp(self):
+        clear_caches()
+
+    def _run_concurrently(self, n, target):
+        threads = [threading.Thread(target=target) for _ in range(n)]
+        for t in threads:
+            t.start()
+        return threads
+
+    def test_concurrent_callers_share_one_call(self):
+        calls, results = [], []
+        release = threading.Event()
+
+        def fn():
+            calls.append(1)
+            release.wait(2)   # 다른 호출이 모두 붙을 때까지 붙잡음
+            return "value"
+
+        def worker():
+            try:
+                results.append(single_flight("test:coalesce", fn))
+            finally:
+                connection.close()
+
+        threads = self._run_concurrently(6, worker)
+        time.sleep(0.2)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 6)
+        self.assertFalse(FetchLock.objects.exists())
+
+    def test_followers_get_the_leaders_error(self):
+        release = threading.Event()
+        errors = []
+
+        def fn():
+            release.wait(2)
+            raise ValueError("boom")
+
+        def worker():
+            try:
+                single_flight("test:error", fn)
+            except ValueError as e:
+                errors.append(str(e))
+            finally:
+                connection.close()
+
+        threads = self._run_concurrently(4, worker)
+        time.sleep(0.2)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, ["boom"] * 4)
+
+    def test_waits_for_other_worker_lock_and_reuses_its_result(self):
+        # 다른 워커가 락을 잡고 가져오는 중 → 직접 부르지 않고 그 결과를 재사용
+        FetchLock.objects.create(key="test:locked", owner="other:1", expires_at=timezone.now() + timedelta(seconds=30))
+        filled = []
+        threading.Timer(0.1, lambda: filled.append("from-other-worker")).start()
+        fn = mock.Mock(return_value="fetched")
+
+        result = single_flight("test:locked", fn, reuse=lambda: filled[0] if filled else None)
+
+        self.assertEqual(result, "from-other-worker")
+        fn.assert_not_called()
+
+    def test_expired_lock_from_dead_worker_is_taken_over(self):
+        FetchLock.objects.create(key="test:expired", owner="dead:1", expires_at=timezone.now() - timedelta(seconds=1))
+        fn = mock.Mock(return_value="fetched")
+
+        self.assertEqual(single_flight("test:expired", fn, reuse=lambda: None), "fetched")
+        fn.assert_called_once()
+        self.assertFalse(FetchLock.objects.filter(key="test:expired").exists())
+
+
+class MissingBookShortCircuitTests(TestCase):
+    def setUp(self):
+        clear_caches()
+
+    def test_known_missing_isbn_does_not_call_aladin_again(self):
+        # 락을 먼저 잡은 워커가 "없음" 을 기록했으면 대기하던 워커는 알라딘을 다시 부르지 않음
+        remember_missing(ISBN)
+        with mock.patch.object(aladin.aladin_client, "item_lookup") as lookup:
+            with self.assertRaises(ValueError):
+                aladin._fetch_and_create_book(ISBN)
+            with self.assertRaises(ValueError):
+                aladin.get_or_create_book_by_isbn13(ISBN)
+        lookup.assert_not_called()
+
+    def test_empty_lookup_is_remembered(self):
+        with mock.patch.object(aladin.aladin_client, "item_lookup", return_value={"item": []}) as lookup:
+            with self.assertRaises(ValueError):
+                aladin.get_or_create_book_by_isbn13(OTHER_ISBN)
+            with self.assertRaises(ValueError):
+                aladin.get_or_create_book_by_isbn13(OTHER_ISBN)
+        lookup.assert_called_once_with(OTHER_ISBN)
+
+
+# ---- 검색 / 네거티브 캐시 ----
+
+def search_response(*isbn13s):
+    return {
+        "totalResults": len(isbn13s),
+        "item": [{"title": f"책 {i}", "author": "저자", "isbn13": isbn13} for i, isbn13 in enumerate(isbn13s)],
+    }
+
+
+class SearchCacheTests(TestCase):
+    def setUp(self):
+        clear_caches()
+
+    def test_equivalent_queries_share_one_cache_entry(self):
+        with mock.patch.object(aladin.aladin_client, "item_search", return_value=search_response(ISBN)) as upstream:
+            first = search_books("  Harry   Potter ")
+            second = search_books("harry potter")
+        upstream.assert_called_once()
+        self.assertEqual(first, second)
+        self.assertEqual(first["items"][0]["isbn13"], ISBN)
+
+    def test_original_query_is_sent_upstream(self):
+        # 정규화는 캐시 키에만 (알라딘에는 사용자가 입력한 대소문자 그대로)
+        with mock.patch.object(aladin.aladin_client, "item_search", return_value=search_response()) as upstream:
+            search_books(" Harry Potter ")
+        self.assertEqual(upstream.call_args.args[0], "Harry Potter")
+
+    def test_other_params_are_part_of_the_key(self):
+        with mock.patch.object(aladin.aladin_client, "item_search", return_value=search_response()) as upstream:
+            search_books("harry potter", page=1)
+            search_books("harry potter", page=2)
+            search_books("harry potter", sort="SalesPoint")
+        self.assertEqual(upstream.call_count, 3)
+
+    def test_error_code_response_is_not_cached(self):
+        error = {"errorCode": 10, "errorMessage": "quota"}
+        with mock.patch.object(aladin.aladin_client, "item_search", side_effect=[error, search_response(ISBN)]) as upstream:
+            self.assertEqual(search_books("harry potter")["items"], [])
+            self.assertEqual(search_books("harry potter")["items"][0]["isbn13"], ISBN)
+        self.assertEqual(upstream.call_count, 2)
+
+    def test_negative_cache_is_per_isbn(self):
+        remember_missing(ISBN)
+        self.assertTrue(is_known_missing(ISBN))
+        self.assertFalse(is_known_missing(OTHER_ISBN))
+        # 다른 워커(프로세스 내 캐시가 빈 상태)도 공유 캐시로 알 수 있음
+        negative_cache.local.clear()
+        self.assertTrue(is_known_missing(ISBN))
+
+
+# ---- AuthorSales 캐시 정리 ----
+
+class AuthorSalesEvictionTests(TestCase):
+    def setUp(self):
+        self.book = Book.objects.create(isbn13=ISBN, title="책", author="저자", publisher="출판사")
+        self.now = timezone.now()
+        # 프리웜 보호 대상이 되지 않도록 모두 갱신 주기보다 오래된 키로
+        self.old = self.now - timedelta(days=7)
+
+    def add_key(self, name, rows=1, accessed_minutes_ago=None, hits=0):
+        query_type = AUTHOR_SALES_PREFIX + name
+        AladinSync.objects.create(query_type=query_type)
+        AladinSync.objects.filter(query_type=query_type).update(
+            updated_at=self.old,
+            last_accessed_at=None if accessed_minutes_ago is None else self.now - timedelta(minutes=accessed_minutes_ago),
+            hit_count=hits,
+        )
+        self.add_rows(query_type, rows)
+        return query_type
+
+    def add_rows(self, query_type, rows):
+        base = AladinListItem.objects.count()
+        AladinListItem.objects.bulk_create(
+            AladinListItem(query_type=query_type, item_id=base + i, book=self.book) for i in range(rows)
+        )
+
+    def remaining(self):
+        return set(AladinSync.objects.values_list("query_type", flat=True))
+
+    @override_settings(ALADIN_AUTHOR_SALES_EVICTION="lru")
+    def test_lru_evicts_least_recently_used_first(self):
+        never = self.add_key("never", hits=50)
+        stale = self.add_key("stale", accessed_minutes_ago=120, hits=50)
+        recent = self.add_key("recent", accessed_minutes_ago=1)
+
+        result = compact_author_sales(max_keys=1, max_rows=100)
+
+        self.assertEqual(self.remaining(), {recent})
+        self.assertEqual(result["evicted_keys"], 2)
+        self.assertFalse(AladinListItem.objects.filter(query_type__in=[never, stale]).exists())
+
+    @override_settings(ALADIN_AUTHOR_SALES_EVICTION="lfu")
+    def test_lfu_evicts_least_frequently_used_first(self):
+        self.add_key("rare-recent", accessed_minutes_ago=1, hits=1)
+        popular = self.add_key("popular-old", accessed_minutes_ago=120, hits=30)
+
+        compact_author_sales(max_keys=1, max_rows=100)
+
+        self.assertEqual(self.remaining(), {popular})
+
+    def test_row_limit_evicts_until_under_limit(self):
+        self.add_key("a", rows=3, accessed_minutes_ago=30)
+        self.add_key("b", rows=3, accessed_minutes_ago=20)
+        c = self.add_key("c", rows=3, accessed_minutes_ago=10)
+
+        result = compact_author_sales(max_keys=100, max_rows=4, batch_size=1)
+
+        self.assertEqual(self.remaining(), {c})
+        self.assertEqual(result["rows_before"], 9)
+        self.assertEqual(result["deleted_rows"], 6)
+
+    def test_orphan_rows_are_removed_even_under_limits(self):
+        kept = self.add_key("kept", rows=2, accessed_minutes_ago=1)
+        self.add_rows(AUTHOR_SALES_PREFIX + "orphan", 3)
+
+        result = compact_author_sales(max_keys=100, max_rows=100)
+
+        self.assertEqual(result["deleted_rows"], 3)
+        self.assertEqual(result["evicted_keys"], 0)
+        self.assertEqual(set(AladinListItem.objects.values_list("query_type", flat=True)), {kept})
+
+    def test_other_list_caches_are_untouched(self):
+        AladinSync.objects.create(query_type="Bestseller")
+        self.add_rows("Bestseller", 2)
+
+        compact_author_sales(max_keys=0, max_rows=0)
+
+        self.assertTrue(AladinSync.objects.filter(query_type="Bestseller").exists())
+        self.assertEqual(AladinListItem.objects.filter(query_type="Bestseller").count(), 2)
+
+    def test_freshly_warmed_keys_go_last(self):
+        # 방금 프리웜된 키(아직 읽힌 적 없음)는 오래 안 쓰인 키보다 나중에 제거
+        warmed = AUTHOR_SALES_PREFIX + "warmed"
+        AladinSync.objects.create(query_type=warmed)
+        self.add_rows(warmed, 1)
+        self.add_key("stale", accessed_minutes_ago=600)
+
+        compact_author_sales(max_keys=1, max_rows=100)
+
+        self.assertEqual(self.remaining(), {warmed})
+
+
+# ---- BookStats (북마크) ----
+
+class BookmarkStatsTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        Book.objects.create(isbn13=ISBN, title="책", author="저자", publisher="출판사")
+        self.users = [
+            User.objects.create_user(username=f"u{i}", nickname=f"u{i}", email=f"u{i}@example.com", password="pw")
+            for i in range(2)
+        ]
+
+    def toggle(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        res = client.post(f"/api/books/{ISBN}/bookmark/")
+        self.assertEqual(res.status_code, 200, res.data)
+        return res.data["bookmarked"]
+
+    def bookmark_count(self):
+        return BookStats.objects.get(isbn13=ISBN).bookmark_count
+
+    def test_toggle_updates_count_and_matches_rebuild(self):
+        self.assertTrue(self.toggle(self.users[0]))
+        self.assertTrue(self.toggle(self.users[1]))
+        self.assertEqual(self.bookmark_count(), 2)
+
+        self.assertFalse(self.toggle(self.users[0]))
+        self.assertEqual(self.bookmark_count(), 1)
+
+        rebuild_book_stats()
+        self.assertEqual(self.bookmark_count(), 1)
+
+
+# ---- 알라딘 호출 할당량 ----
+
+@override_settings(ALADIN_DAILY_QUOTA=10, ALADIN_QUOTA_USER_RESERVE=0.2, ALADIN_RATE_PER_SECOND=1000)
+class QuotaGovernorTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.governor = QuotaGovernor()
+
+    def call(self, priority, times=1):
+        with aladin_priority(priority):
+            for _ in range(times):
+                self.governor.acquire()
+
+    def test_user_calls_stop_at_daily_quota(self):
+        self.call(USER, times=10)
+        with self.assertRaises(QuotaExceeded):
+            self.call(USER)
+
+        usage = self.governor.usage()
+        self.assertEqual((usage.calls, usage.user_calls, usage.rejected), (10, 10, 1))
+        self.assertEqual(self.governor.available(USER), 0)
+
+    def test_background_leaves_user_reserve(self):
+        self.call(BACKGROUND, times=8)
+        with self.assertRaises(QuotaExceeded):
+            self.call(BACKGROUND)
+
+        # 남겨둔 사용자 몫은 그대로 사용 가능
+        self.call(USER, times=2)
+        usage = self.governor.usage()
+        self.assertEqual((usage.calls, usage.background_calls, usage.user_calls), (10, 8, 2))
+        self.assertEqual(self.governor.snapshot()["remaining"], {USER: 0, BACKGROUND: 0})
+
+    def test_usage_is_shared_through_the_db_row(self):
+        # 다른 워커가 이미 쓴 만큼은 이 워커에서도 한도에 포함
+        AladinQuotaUsage.objects.create(day=timezone.localdate(), calls=10)
+        with self.assertRaises(QuotaExceeded):
+            self.call(USER)
+
+    def test_quota_exceeded_is_not_an_upstream_failure(self):
+        self.assertFalse(QuotaExceeded.upstream_failure)
+
+
+class RateWindowTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.window = RateWindow(5, user_share=0.2, prefix="test:rate")
+
+    def test_background_share_leaves_room_for_users(self):
+        with mock.patch("books.services.quota.time.time", return_value=1000.25):
+            taken = [self.window._take(BACKGROUND) for _ in range(5)]
+            self.assertEqual(taken[:4], [0] * 4)
+            self.assertAlmostEqual(taken[4], 0.75)   # 다음 창까지 대기
+
+            # 밀린 백그라운드 호출은 자리를 되돌려 놓으므로 사용자 호출은 마지막 한 자리를 씀
+            self.assertEqual(self.window._take(USER), 0)
+            self.assertGreater(self.window._take(USER), 0)
+            self.assertEqual(self.window.used(), 5)
+
+    def test_next_window_starts_empty(self):
+        with mock.patch("books.services.quota.time.time", return_value=1000.0):
+            for _ in range(5):
+                self.window._take(USER)
+            self.assertGreater(self.window._take(USER), 0)
+        with mock.patch("books.services.quota.time.time", return_value=1001.0):
+            self.assertEqual(self.window._take(USER), 0)
+
+    def test_acquire_gives_up_after_timeout(self):
+        with mock.patch("books.services.quota.time.time", return_value=1000.0):
+            for _ in range(4):
+                self.window._take(BACKGROUND)
+            self.assertFalse(self.window.acquire(BACKGROUND, timeout=0))
+
+
+# ---- 서킷 브레이커 ----
+
+def http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(f"{status_code}", response=response)
+
+
+@override_settings(CIRCUIT_BREAKERS={
+    "default": {
+        "window_seconds": 60, "min_calls": 4, "failure_rate": 0.5,
+        "slow_call_seconds": 5, "open_seconds": 30, "half_open_calls": 2,
+    },
+})
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("config.circuit.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker("test")
+
+    def ok(self, seconds=0):
+        with self.breaker.guard():
+            self.now += seconds
+
+    def fail(self, exc):
+        with self.assertRaises(type(exc)):
+            with self.breaker.guard():
+                raise exc
+
+    def trip(self):
+        for _ in range(4):
+            self.fail(http_error(503))
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_opens_at_failure_rate_after_min_calls(self):
+        self.ok()
+        self.ok()
+        self.fail(http_error(500))
+        self.assertEqual(self.breaker.state, CLOSED)   # min_calls 전에는 열지 않음
+        self.fail(http_error(429))
+        self.assertEqual(self.breaker.state, OPEN)
+
+        with self.assertRaises(CircuitOpen):
+            self.ok()
+
+    def test_client_errors_and_quota_are_not_counted(self):
+        for _ in range(4):
+            self.fail(http_error(404))
+            self.fail(QuotaExceeded("한도 초과"))
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.snapshot()["recent_calls"], 0)
+
+    def test_slow_success_counts_as_failure(self):
+        for _ in range(4):
+            self.ok(seconds=6)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_half_open_trials_close_the_circuit(self):
+        self.trip()
+        self.now += 30
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+        self.ok()
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.ok()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_failure_reopens(self):
+        self.trip()
+        self.now += 30
+        self.fail(requests.ConnectionError("down"))
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_half_open_limits_trial_calls(self):
+        self.trip()
+        self.now += 30
+        with self.breaker.guard():
+            with self.breaker.guard():
+                with self.assertRaises(CircuitOpen):
+                    self.breaker.check()
+
+    def test_quota_rejection_returns_the_trial_slot(self):
+        self.trip()
+        self.now += 30
+        self.fail(QuotaExceeded("한도 초과"))
+        self.fail(QuotaExceeded("한도 초과"))
+        # 시험 호출 자리를 돌려받았으므로 실제 시험 호출 두 번으로 닫힘
+        self.ok()
+        self.ok()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_old_failures_leave_the_window(self):
+        self.fail(http_error(500))
+        self.fail(http_error(500))
+        self.now += 61
+        # 창 안에 남아 있었다면 6번 중 3번 실패 → open
+        self.ok()
+        self.ok()
+        self.ok()
+        self.fail(http_error(500))
+        self.assertEqual(self.breaker.state, CLOSED)
@@ -1,26 +1,42 @@
+from django.conf import settings
 from django.urls import path
+from . import async_views
 from .views import (
     bestseller_list,
     new_special_list,
     book_search,
     book_detail,
+    book_reviews,
+    book_batch,
+    book_suggest,
+    aladin_quota,
     bookmark_toggle,
     RecommendBookmarkBasedView,
     RecommendFollowBasedView,
     RecommendDebugView,
 )
 
+# 알라딘 검색은 ASYNC_VIEWS 일 때 비동기 버전으로
+if settings.ASYNC_VIEWS:
+    book_search = async_views.book_search
+
 urlpatterns = [
     # 도서 검색, 베스트셀러, 신간추천도서
     path("bestsellers/", bestseller_list),
     path("new/special/", new_special_list),
     path("search/", book_search),
+    path("suggest/", book_suggest),
+    path("batch/", book_batch),
+    # 관리자: 알라딘 호출 할당량 / 외부 API 서킷 상태
+    path("admin/quota/", aladin_quota),
     # 추천알고리즘
     path("recommend/bookmark/", RecommendBookmarkBasedView.as_view()),
     path("recommend/follow/", RecommendFollowBasedView.as_view()),
     path("recommend/debug/", RecommendDebugView.as_view()),
     # 북마크
     path("<str:isbn13>/bookmark/", bookmark_toggle),
+    # 도서 리뷰 (커서 페이지네이션)
+    path("<str:isbn13>/reviews/", book_reviews, name="book-reviews"),
     # 도서상세
     path("<str:isbn13>/", book_detail),
 ]
@@ -1,32 +1,57 @@
 import requests
 from datetime import timedelta
-from django.utils import timezone
 from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from config.circuit import breaker_snapshots
+from config.http import conditional, make_etag
+from ai_curator.jobs import should_warm, warm_analysis
+from reviews.models import Review
 from .models import Book, Bookmark
-from .serializers import BookDetailSerializer, AladinListItemSerializer, BookSimpleSerializer
+from .serializers import BookDetailSerializer, AladinListItemSerializer, BookSimpleSerializer, BookReviewSerializer
 from .services import get_or_create_book_by_isbn13, get_cached_aladin_list
-from .services.aladin import _to_cover500
+from .services.aladin import search_books, get_books_by_isbn13s, InvalidISBN, validate_isbn13, aladin_synced_at
+from .services.cache import get_stats
+from .services.local_search import search_local
+from .services.quota import governor
+from .services.stats import get_book_stats, get_book_stats_map, on_bookmark_toggled
+from .services.suggest import suggest_index
 from .services.recommendations import recommend_bookmark_based_aladin, recommend_follow_based
 
+UPSTREAM_UNAVAILABLE_MESSAGE = "도서 정보를 잠시 불러올 수 없습니다. 잠시 후 다시 시도해주세요."
+
 
 # 베스트셀러 TOP20
 @api_view(["GET"])
 @permission_classes([AllowAny]) 
 def bestseller_list(request):
-    qs = get_cached_aladin_list(query_type="Bestseller", limit=20, ttl_hours=24)
-    return Response(AladinListItemSerializer(qs, many=True).data)
+    return _aladin_list_response(request, "Bestseller", limit=20)
 
 
 # 주목할만한 신간
 @api_view(["GET"])
 def new_special_list(request):
-    qs = get_cached_aladin_list("ItemNewSpecial", limit=5, ttl_hours=24)
-    return Response(AladinListItemSerializer(qs, many=True).data)
+    return _aladin_list_response(request, "ItemNewSpecial", limit=5)
+
+
+def _aladin_list_response(request, query_type, limit):
+    # 목록 갱신(SWR) 판단은 먼저 하고, 마지막 갱신 시각이 그대로면 직렬화 없이 304
+    qs = get_cached_aladin_list(query_type, limit=limit)
+    synced_at = aladin_synced_at(query_type)
+    return conditional(
+        request,
+        lambda: Response(AladinListItemSerializer(qs, many=True).data),
+        etag=make_etag(query_type, limit, synced_at),
+        last_modified=synced_at,
+        cache="aladin_list",
+    )
 
 
 # 도서 검색
@@ -42,68 +67,171 @@ def book_search(request):
     sort = request.GET.get("sort", "Accuracy")
     category_id = request.GET.get("category", 0)
     
-    params = {
-        "ttbkey": settings.ALADIN_TTB_KEY,
-        "Query": q,
-        "QueryType": query_type,
-        "SearchTarget": "Book",
-        "Start": page,
-        "MaxResults": min(size, 50),
-        "Sort": sort,
-        "CategoryId": category_id,
-        "Output": "JS",
-        "Version": settings.ALADIN_API_VERSION,
-    }
-
-    res = requests.get(settings.ALADIN_SEARCH_URL, params=params)
-    res.raise_for_status()
-    data = res.json()
-    
+    # source=local: DB 에 저장된 도서에서만 검색 (알라딘 호출 없음)
+    source = request.GET.get("source", "aladin")
+    if source == "local":
+        data = search_local(q, page=page, size=size)
+    else:
+        try:
+            data = search_books(q, query_type=query_type, page=page, size=size, sort=sort, category_id=category_id)
+        except requests.RequestException as e:
+            # 알라딘 장애/타임아웃 → 로컬 인덱스 결과로 대체
+            print(f"🚨 알라딘 검색 API 에러 (로컬 검색으로 대체): {e}")
+            data = search_local(q, page=page, size=size)
+            source = "local"
+
+    return Response({
+        "total": data["total"],
+        "source": source,
+        "page": page,
+        "size": size,
+        "items": decorate_search_items(request.user, data["items"]),
+    })
+
+
+def decorate_search_items(user, items):
+    # 북마크 여부/리뷰 집계는 바뀌므로 캐시하지 않고 매 요청마다 계산
+    isbns = [item["isbn13"] for item in items if item.get("isbn13")]
+    stats_map = get_book_stats_map(isbns)
     bookmarked_isbns = set()
-    if request.user.is_authenticated:
-        isbns = [item.get("isbn13") for item in data.get("item", []) if item.get("isbn13")]
+    if user.is_authenticated:
         bookmarked_isbns = set(
-            Bookmark.objects.filter(user=request.user, book__isbn13__in=isbns)
+            Bookmark.objects.filter(user=user, book__isbn13__in=isbns)
             .values_list("book__isbn13", flat=True)
         )
 
-    items = []
-    for item in data.get("item", []):
-        isbn13 = item.get("isbn13")
-        items.append({
-            "title": item.get("title"),
-            "author": item.get("author"),
-            "publisher": item.get("publisher"),
-            "pub_date": item.get("pubDate"),
-            "isbn13": isbn13,
-            "cover": _to_cover500(item.get("cover")),
-            "sales_point": item.get("salesPoint"),
-            "customer_review_rank": item.get("customerReviewRank"),
-            "is_bookmarked": isbn13 in bookmarked_isbns,
+    out = []
+    for item in items:
+        stats = stats_map.get(item.get("isbn13"))
+        out.append({
+            **item,
+            "is_bookmarked": item.get("isbn13") in bookmarked_isbns,
+            "review_count": stats.review_count if stats else 0,
+            "rating_avg": stats.rating_avg if stats else None,
         })
-
-    return Response({
-        "total": data.get("totalResults"),
-        "page": page,
-        "size": size,
-        "items": items,
-    })
+    return out
     
     
     
+# 검색어 자동완성: /api/books/suggest/?q=
+# 제목/저자 접두어 + 초성("ㅎㅁ" → "할매") 매칭, 메모리 인덱스에서 바로 응답
+@api_view(["GET"])
+def book_suggest(request):
+    q = (request.GET.get("q") or "").strip()
+    if not q:
+        return Response({"q": q, "items": []})
+
+    try:
+        limit = max(1, min(int(request.GET.get("limit", 10)), 20))
+    except ValueError:
+        limit = 10
+
+    return Response({"q": q, "items": suggest_index.suggest(q, limit=limit)})
+
+
 # 도서 상세 페이지
 @api_view(["GET"])
 def book_detail(request, isbn13):
     try:
         book = get_or_create_book_by_isbn13(isbn13)
+    except InvalidISBN as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except ValueError as e:
         return Response(
             {"error": str(e)},
             status=status.HTTP_404_NOT_FOUND
         )
+    except requests.RequestException as e:
+        # 아직 DB 에 없는 도서인데 알라딘 장애/할당량 소진
+        print(f"🚨 알라딘 도서 조회 실패 ({isbn13}): {e}")
+        return Response({"error": UPSTREAM_UNAVAILABLE_MESSAGE}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    user = request.user
+    stats = get_book_stats(book.isbn13)
+    is_bookmarked = user.is_authenticated and Bookmark.objects.filter(user=user, book=book).exists()
+
+    def build():
+        # 리뷰는 첫 페이지만 (user 를 join 해서 한 번에), 다음 페이지는 리뷰 목록 엔드포인트로
+        paginator = BookReviewPagination()
+        reviews = paginator.paginate_queryset(_book_reviews_qs(book.isbn13), request)
+        paginator.base_url = request.build_absolute_uri(reverse("book-reviews", args=[book.isbn13]))
 
-    serializer = BookDetailSerializer(book, context={"request": request})
-    return Response(serializer.data, status=status.HTTP_200_OK)
+        context = {
+            "request": request,
+            "reviews": reviews,
+            "reviews_next": paginator.get_next_link(),
+            "stats": stats,
+            "is_bookmarked": is_bookmarked,
+        }
+        serializer = BookDetailSerializer(book, context=context)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    # 도서 내용/리뷰·북마크 활동/내 북마크 여부가 그대로면 304
+    last_activity = stats.last_activity if stats else None
+    response = conditional(
+        request,
+        build,
+        etag=make_etag(book.isbn13, book.updated_at, last_activity, is_bookmarked),
+        last_modified=max(filter(None, [book.updated_at, last_activity])),
+        cache="book_detail",
+    )
+
+    # 상세 화면이 곧 AI 분석을 요청하므로 미리 시작해 둠 (304 여도, 이미 있으면 아무것도 안 함)
+    if should_warm(request):
+        warm_analysis(book.isbn13)
+    return response
+
+
+class BookReviewPagination(CursorPagination):
+    page_size = settings.BOOK_REVIEW_PAGE_SIZE
+    ordering = "-id"
+
+
+def _book_reviews_qs(isbn13):
+    return Review.objects.filter(isbn13=isbn13).select_related("user")
+
+
+# 도서 리뷰 목록: /api/books/<isbn13>/reviews/?cursor=...
+@api_view(["GET"])
+def book_reviews(request, isbn13):
+    try:
+        isbn13 = validate_isbn13(isbn13)
+    except InvalidISBN as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    paginator = BookReviewPagination()
+    reviews = paginator.paginate_queryset(_book_reviews_qs(isbn13), request)
+    return paginator.get_paginated_response(BookReviewSerializer(reviews, many=True).data)
+
+
+# 도서 일괄 조회: /api/books/batch/?isbn13=...&isbn13=... (또는 콤마 구분)
+@api_view(["GET"])
+def book_batch(request):
+    # 중복 제거(순서 유지)는 dict 로, 최대 개수를 넘는 순간 바로 거절
+    seen = {}
+    for raw in request.GET.getlist("isbn13"):
+        for v in raw.split(","):
+            v = v.strip()
+            if v and v not in seen:
+                seen[v] = None
+                if len(seen) > settings.BOOK_BATCH_MAX_SIZE:
+                    return Response(
+                        {"error": f"최대 {settings.BOOK_BATCH_MAX_SIZE}개까지 조회할 수 있습니다."},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+    isbn13s = list(seen)
+
+    if not isbn13s:
+        return Response({"error": "isbn13 parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    books = get_books_by_isbn13s(isbn13s)
+
+    # 요청 순서 유지
+    found = [books[i] for i in isbn13s if i in books]
+    return Response({
+        "items": BookSimpleSerializer(found, many=True).data,
+        "missing": [i for i in isbn13s if i not in books],
+    })
 
 
 # 북마크
@@ -113,21 +241,33 @@ def bookmark_toggle(request, isbn13):
     user = request.user
 
     # Book 확보 (없으면 알라딘 → DB 저장)
-    book = get_or_create_book_by_isbn13(isbn13)
+    try:
+        book = get_or_create_book_by_isbn13(isbn13)
+    except InvalidISBN as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+    except requests.RequestException as e:
+        print(f"🚨 알라딘 도서 조회 실패 ({isbn13}): {e}")
+        return Response({"error": UPSTREAM_UNAVAILABLE_MESSAGE}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
 
     # 북마크 존재 여부 확인
     bookmark = Bookmark.objects.filter(user=user, book=book).first()
 
     if bookmark:
         # 이미 있으면 → 삭제
-        bookmark.delete()
+        with transaction.atomic():
+            bookmark.delete()
+            on_bookmark_toggled(book.isbn13, added=False)
         return Response({
             "bookmarked": False,
             "created": False
         })
 
     # 없으면 → 생성
-    Bookmark.objects.create(user=user, book=book)
+    with transaction.atomic():
+        Bookmark.objects.create(user=user, book=book)
+        on_bookmark_toggled(book.isbn13, added=True)
     return Response({
         "bookmarked": True,
         "created": True
@@ -135,6 +275,17 @@ def bookmark_toggle(request, isbn13):
 
 
 
+# 알라딘 호출 할당량 현황 (관리자용): /api/books/admin/quota/
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def aladin_quota(request):
+    return Response({
+        "quota": governor.snapshot(),
+        "circuits": breaker_snapshots(),
+        "stats": get_stats(),
+    })
+
+
 # 책 추천 알고리즘
 class RecommendBookmarkBasedView(APIView):
     permission_classes = [IsAuthenticated]
@@ -0,0 +1,238 @@
+# config/cassettes.py
+
+"""
+외부 API (알라딘 / 위키피디아 / OpenAI) 녹화·재생
+
+- settings.UPSTREAM_CASSETTE_MODE (requests / httpx 동기·비동기 모두)
+  - "off": 그대로 네트워크 호출
+  - "record": 실제로 호출하고 응답을 카세트로 저장
+  - "replay": 네트워크 없이 카세트에서 응답 (없으면 연결 오류)
+- 카세트: UPSTREAM_CASSETTE_DIR/<upstream>/<endpoint>/<키>.json.gz
+- 키: upstream + 메서드 + 경로 마지막 조각 + 정렬된 파라미터(비밀값 제외) + 정규화한 JSON 본문
+  → 호스트와 무관하므로 실서버에서 녹화한 것을 스텁 서버(upstream_stub 명령)가 그대로 재생
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+# 키/카세트에 남기지 않는 파라미터
+SECRET_PARAMS = {"ttbkey", "key", "api_key", "apikey"}
+
+
+def cassette_mode() -> str:
+    return getattr(settings, "UPSTREAM_CASSETTE_MODE", "off") or "off"
+
+
+# ---- 키 ----
+
+def _normalize_body(body) -> str:
+    if not body:
+        return ""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    except ValueError:
+        return body
+
+
+def request_key(upstream: str, method: str, url: str, body=None) -> dict:
+    """
+    카세트를 찾을 때 쓰는 정규화된 요청
+    반환: {"upstream", "endpoint", "method", "params", "body", "key"}
+    """
+    parts = urlsplit(url)
+    endpoint = parts.path.rstrip("/").rsplit("/", 1)[-1] or "root"
+    params = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in SECRET_PARAMS
+    )
+    norm = {
+        "upstream": upstream,
+        "endpoint": endpoint,
+        "method": method.upper(),
+        "params": params,
+        "body": _normalize_body(body),
+    }
+    raw = json.dumps(norm, sort_keys=True, ensure_ascii=False)
+    norm["key"] = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return norm
+
+
+# ---- 저장/조회 ----
+
+def _path(req: dict) -> str:
+    return os.path.join(settings.UPSTREAM_CASSETTE_DIR, req["upstream"], req["endpoint"], f"{req['key']}.json.gz")
+
+
+def load_cassette(req: dict):
+    try:
+        with gzip.open(_path(req), "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"🚨 카세트 읽기 실패 ({req['key']}): {e}")
+        return None
+
+
+def save_cassette(req: dict, status: int, content_type: str, content: bytes, elapsed_ms: float):
+    entry = {
+        "request": {k: req[k] for k in ("upstream", "endpoint", "method", "params", "body")},
+        "status": status,
+        "content_type": content_type or "",
+        "elapsed_ms": round(elapsed_ms, 1),
+        "recorded_at": int(time.time()),
+    }
+    try:
+        entry["body"] = content.decode("utf-8")
+    except UnicodeDecodeError:
+        entry["body_b64"] = base64.b64encode(content).decode("ascii")
+
+    path = _path(req)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"🚨 카세트 저장 실패 ({req['key']}): {e}")
+
+
+def cassette_content(entry: dict) -> bytes:
+    if "body_b64" in entry:
+        return base64.b64decode(entry["body_b64"])
+    return entry.get("body", "").encode("utf-8")
+
+
+# ---- requests (알라딘 / 위키피디아) ----
+
+class CassetteAdapter(HTTPAdapter):
+    """
+    HTTPAdapter 에 녹화/재생을 얹은 것 (모드는 호출할 때마다 settings 에서 확인)
+    """
+
+    def __init__(self, upstream: str, **kwargs):
+        self.upstream = upstream
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        mode = cassette_mode()
+        if mode == "off":
+            return super().send(request, **kwargs)
+
+        req = request_key(self.upstream, request.method, request.url, request.body)
+        if mode == "replay":
+            entry = load_cassette(req)
+            if entry is None:
+                raise requests.ConnectionError(f"녹화된 응답 없음: {self.upstream}/{req['endpoint']} {req['key']}", request=request)
+            return self._replayed(request, entry)
+
+        started = time.monotonic()
+        res = super().send(request, **kwargs)
+        save_cassette(req, res.status_code, res.headers.get("Content-Type"), res.content,
+                      (time.monotonic() - started) * 1000)
+        return res
+
+    def _replayed(self, request, entry):
+        res = requests.Response()
+        res.status_code = entry["status"]
+        res.reason = "Replayed"
+        res.headers["Content-Type"] = entry.get("content_type") or ""
+        res._content = cassette_content(entry)
+        res.encoding = requests.utils.get_encoding_from_headers(res.headers) or "utf-8"
+        res.url = request.url
+        res.request = request
+        res.connection = self
+        return res
+
+
+def cassette_session(upstream: str, **adapter_kwargs) -> requests.Session:
+    session = requests.Session()
+    adapter = CassetteAdapter(upstream, **adapter_kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# ---- httpx (OpenAI SDK) ----
+
+class CassetteTransport(httpx.BaseTransport):
+    def __init__(self, upstream: str, transport: httpx.BaseTransport = None):
+        self.upstream = upstream
+        self._transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request):
+        mode = cassette_mode()
+        if mode == "off":
+            return self._transport.handle_request(request)
+
+        req = request_key(self.upstream, request.method, str(request.url), request.read())
+        if mode == "replay":
+            entry = load_cassette(req)
+            if entry is None:
+                raise httpx.ConnectError(f"녹화된 응답 없음: {self.upstream}/{req['endpoint']} {req['key']}", request=request)
+            return httpx.Response(
+                entry["status"],
+                headers={"Content-Type": entry.get("content_type") or "application/json"},
+                content=cassette_content(entry),
+                request=request,
+            )
+
+        started = time.monotonic()
+        res = self._transport.handle_request(request)
+        content = res.read()
+        save_cassette(req, res.status_code, res.headers.get("Content-Type"), content,
+                      (time.monotonic() - started) * 1000)
+        return res
+
+    def close(self):
+        self._transport.close()
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    """
+    CassetteTransport 의 비동기 버전 (ASGI 경로의 httpx.AsyncClient / AsyncOpenAI)
+    """
+
+    def __init__(self, upstream: str, transport: httpx.AsyncBaseTransport = None):
+        self.upstream = upstream
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request):
+        mode = cassette_mode()
+        if mode == "off":
+            return await self._transport.handle_async_request(request)
+
+        req = request_key(self.upstream, request.method, str(request.url), await request.aread())
+        if mode == "replay":
+            entry = load_cassette(req)
+            if entry is None:
+                raise httpx.ConnectError(f"녹화된 응답 없음: {self.upstream}/{req['endpoint']} {req['key']}", request=request)
+            return httpx.Response(
+                entry["status"],
+                headers={"Content-Type": entry.get("content_type") or "application/json"},
+                content=cassette_content(entry),
+                request=request,
+            )
+
+        started = time.monotonic()
+        res = await self._transport.handle_async_request(request)
+        content = await res.aread()
+        save_cassette(req, res.status_code, res.headers.get("Content-Type"), content,
+                      (time.monotonic() - started) * 1000)
+        return res
+
+    async def aclose(self):
+        await self._transport.aclose()
@@ -0,0 +1,189 @@
+# config/circuit.py
+# 외부 API (알라딘 / 위키피디아 / OpenAI) 별 서킷 브레이커 (프로세스별)
+# - closed: 정상 호출, 최근 window_seconds 동안의 실패/느린 호출 비율을 기록
+# - open: 비율이 failure_rate 를 넘으면 open_seconds 동안 호출하지 않고 바로 CircuitOpen
+# - half-open: 그 뒤 half_open_calls 번만 시험 호출, 모두 성공하면 closed / 하나라도 실패하면 다시 open
+# CircuitOpen 은 requests.RequestException 이라 기존 장애 대체 경로(오래된 목록, 로컬 검색, 카탈로그 ...)를 그대로 탄다.
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import requests
+from django.conf import settings
+from config.metrics import observe_upstream, registry
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(requests.RequestException):
+    """
+    서킷이 열려 있어 호출하지 않음
+    """
+
+
+def is_upstream_failure(exc) -> bool:
+    """
+    상대 서비스 문제로 볼 오류인지 (잘못된 요청/자체 할당량 초과는 제외)
+    - upstream_failure = False 인 예외 (QuotaExceeded 등) 는 무시
+    - 상태 코드가 있으면 5xx / 429 만 실패
+    """
+    if not getattr(exc, "upstream_failure", True):
+        return False
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None) or getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status >= 500 or status == 429
+    return True
+
+
+class CircuitBreaker:
+    def __init__(self, name: str):
+        self.name = name
+        conf = {**settings.CIRCUIT_BREAKERS["default"], **settings.CIRCUIT_BREAKERS.get(name, {})}
+        self.window_seconds = conf["window_seconds"]
+        self.min_calls = conf["min_calls"]
+        self.failure_rate = conf["failure_rate"]
+        self.slow_call_seconds = conf["slow_call_seconds"]
+        self.open_seconds = conf["open_seconds"]
+        self.half_open_calls = conf["half_open_calls"]
+
+        self._lock = threading.Lock()
+        self._calls = deque(maxlen=1000)   # (시각, 실패 여부)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trials = 0                   # half-open 에서 나간 시험 호출 수
+        self._trial_ok = 0
+
+    # ---- 상태 ----
+
+    def _set_state(self, state):
+        if state != self._state:
+            self._state = state
+            registry.inc("circuit_transitions_total", upstream=self.name, state=state)
+            if state == OPEN:
+                self._opened_at = time.monotonic()
+                print(f"🚨 서킷 열림 ({self.name}): {self.open_seconds}초 동안 호출 차단")
+            if state == HALF_OPEN:
+                self._trials = self._trial_ok = 0
+            if state == CLOSED:
+                self._calls.clear()
+
+    def _current(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._set_state(HALF_OPEN)
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current()
+
+    def _reject(self):
+        registry.inc("circuit_rejections_total", upstream=self.name)
+        return CircuitOpen(f"{self.name} 서킷 열림 (잠시 호출하지 않음)")
+
+    def check(self):
+        """
+        호출 전에 가볍게 확인만 (할당량 등 다른 자원을 쓰기 전에)
+        """
+        with self._lock:
+            state = self._current()
+            if state == OPEN or (state == HALF_OPEN and self._trials >= self.half_open_calls):
+                raise self._reject()
+
+    # ---- 기록 ----
+
+    def _admit(self):
+        with self._lock:
+            state = self._current()
+            if state == OPEN:
+                raise self._reject()
+            if state == HALF_OPEN:
+                if self._trials >= self.half_open_calls:
+                    raise self._reject()
+                self._trials += 1
+            return state
+
+    def _record(self, admitted_state, failed: bool):
+        with self._lock:
+            if self._state == HALF_OPEN and admitted_state == HALF_OPEN:
+                if failed:
+                    self._set_state(OPEN)
+                else:
+                    self._trial_ok += 1
+                    if self._trial_ok >= self.half_open_calls:
+                        self._set_state(CLOSED)
+                return
+            if self._state != CLOSED:
+                return
+
+            now = time.monotonic()
+            self._calls.append((now, failed))
+            while self._calls and self._calls[0][0] < now - self.window_seconds:
+                self._calls.popleft()
+            if len(self._calls) >= self.min_calls:
+                failures = sum(1 for _, f in self._calls if f)
+                if failures / len(self._calls) >= self.failure_rate:
+                    self._set_state(OPEN)
+
+    def _release(self, admitted_state):
+        # 상대 서비스와 무관한 오류: 기록하지 않고 시험 호출 자리만 돌려줌
+        with self._lock:
+            if admitted_state == HALF_OPEN and self._state == HALF_OPEN:
+                self._trials = max(0, self._trials - 1)
+
+    @contextmanager
+    def guard(self):
+        admitted = self._admit()
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            if is_upstream_failure(e):
+                self._record(admitted, True)
+            else:
+                self._release(admitted)
+            raise
+        # 성공했어도 너무 느렸으면 실패로 센다 (느린 서비스가 워커를 잡아두지 않도록)
+        self._record(admitted, time.monotonic() - start > self.slow_call_seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            state = self._current()
+            now = time.monotonic()
+            recent = [f for t, f in self._calls if t >= now - self.window_seconds]
+            return {
+                "state": state,
+                "recent_calls": len(recent),
+                "recent_failures": sum(recent),
+                "open_remaining": round(max(0.0, self.open_seconds - (now - self._opened_at)), 1) if state == OPEN else 0,
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(upstream: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if upstream not in _breakers:
+            _breakers[upstream] = CircuitBreaker(upstream)
+        return _breakers[upstream]
+
+
+def breaker_snapshots() -> dict:
+    with _breakers_lock:
+        names = list(_breakers)
+    return {name: breaker(name).snapshot() for name in names}
+
+
+@contextmanager
+def upstream_call(upstream: str, endpoint: str):
+    """
+    외부 API 호출 한 번: 서킷 확인/기록 + 메트릭 (observe_upstream)
+    """
+    with breaker(upstream).guard(), observe_upstream(upstream, endpoint):
+        yield
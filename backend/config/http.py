@@ -0,0 +1,72 @@
+# config/http.py
+# 조건부 GET (ETag / Last-Modified), 비동기 뷰 공통 처리
+
+import hashlib
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+
+def make_etag(*parts) -> str:
+    """
+    응답을 결정하는 값들로 만든 약한 검증자가 아닌 강한 ETag (따옴표 포함)
+    """
+    raw = "|".join("" if p is None else str(p) for p in parts)
+    return quote_etag(hashlib.sha1(raw.encode("utf-8")).hexdigest())
+
+
+def conditional(request, build, etag=None, last_modified=None, cache="default"):
+    """
+    클라이언트 검증자가 현재 값과 같으면 build() 없이 304, 아니면 build() 결과에 검증자/Cache-Control 을 붙인다.
+    - build: 실제 응답을 만드는 함수 (직렬화는 여기서만)
+    - last_modified: datetime (초 단위로 비교됨)
+    - cache: settings.HTTP_CACHE_CONTROL 의 키
+    """
+    last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if response is None:
+        response = build()
+        if response.status_code != 200:
+            return response
+
+    if etag:
+        response["ETag"] = etag
+    if last_modified_ts is not None:
+        response["Last-Modified"] = http_date(last_modified_ts)
+    patch_cache_control(response, **settings.HTTP_CACHE_CONTROL[cache])
+    return response
+
+
+def _authenticate(request):
+    # DRF 기본 인증(JWT/세션)을 그대로 사용
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    return drf_request.user
+
+
+def async_api_view(methods):
+    """
+    DRF @api_view 의 비동기 버전 (DRF 뷰는 async 를 지원하지 않음)
+    - 허용 메서드 검사, DRF 인증으로 request.user 설정 (세션 인증의 CSRF 검사 포함)
+    - 응답은 JsonResponse, 인증 실패는 DRF 와 같은 {"detail": ...}
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+            try:
+                request.user = await sync_to_async(_authenticate)(request)
+            except APIException as e:
+                return JsonResponse({"detail": e.detail}, status=e.status_code)
+            return await view(request, *args, **kwargs)
+
+        return csrf_exempt(wrapper)
+    return decorator
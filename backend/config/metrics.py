@@ -0,0 +1,363 @@
+# config/metrics.py
+# 외부 서비스 없이 쓰는 프로세스 내 메트릭 레지스트리 + /metrics (Prometheus 텍스트 형식)
+# - 워커(프로세스)마다 자기 값을 METRICS_DIR/<pid>.json 으로 주기적으로 내려쓰고
+#   /metrics 는 디렉터리의 모든 파일을 합쳐서 응답 (METRICS_DIR 이 없으면 현재 프로세스 값만)
+# - 끝난 워커 값은 archive.json 에 합치고 <pid>.json 은 지움 (카운터가 줄어들지 않도록)
+
+import atexit
+import contextvars
+import fcntl
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+# 이름 → (종류, 설명, 히스토그램 구간)
+METRICS = {
+    "upstream_requests_total": ("counter", "외부 API 호출 수", None),
+    "upstream_errors_total": ("counter", "외부 API 호출 실패 수", None),
+    "upstream_request_duration_seconds": ("histogram", "외부 API 응답 시간", LATENCY_BUCKETS),
+    "cache_requests_total": ("counter", "캐시 조회 결과 (hit/miss/stale)", None),
+    "http_requests_total": ("counter", "뷰별 요청 수", None),
+    "db_queries_total": ("counter", "뷰별 DB 쿼리 수 합계", None),
+    "db_queries_per_request": ("histogram", "요청 하나당 DB 쿼리 수", QUERY_BUCKETS),
+    "app_events_total": ("counter", "기타 애플리케이션 이벤트 (incr_stat)", None),
+    "circuit_transitions_total": ("counter", "서킷 브레이커 상태 전환 수", None),
+    "circuit_rejections_total": ("counter", "서킷이 열려 바로 거절한 호출 수", None),
+    "ai_analysis_jobs_total": ("counter", "AI 분석 요청 수 (새 작업 / 기존 작업에 합류)", None),
+    "ai_analysis_jobs_finished_total": ("counter", "끝난 AI 분석 작업 수", None),
+    "ai_analysis_job_seconds": ("histogram", "AI 분석 작업 실행 시간", LATENCY_BUCKETS),
+}
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}     # (name, labels) → 값
+        self._histograms = {}   # (name, labels) → [구간별 개수..., 합, 개수]
+        self._flusher_pid = None
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+        self._ensure_flusher()
+
+    def observe(self, name: str, value: float, **labels):
+        buckets = METRICS[name][2]
+        key = (name, _label_key(labels))
+        with self._lock:
+            h = self._histograms.get(key)
+            if h is None:
+                h = self._histograms[key] = [0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    h[i] += 1
+            h[-2] += value
+            h[-1] += 1
+        self._ensure_flusher()
+
+    def counter_values(self, name: str) -> dict:
+        with self._lock:
+            return {labels: v for (n, labels), v in self._counters.items() if n == name}
+
+    # ---- 멀티프로세스 ----
+
+    def dump(self) -> dict:
+        with self._lock:
+            return {
+                "counters": [[n, list(l), v] for (n, l), v in self._counters.items()],
+                "histograms": [[n, list(l), h] for (n, l), h in self._histograms.items()],
+            }
+
+    def _ensure_flusher(self):
+        """
+        프로세스마다 METRICS_FLUSH_SECONDS 간격으로 파일을 쓰는 데몬 스레드 하나
+        (요청이 없는 워커도 파일이 계속 갱신되므로 오래된 파일 = 끝난 워커)
+        fork 된 워커는 pid 가 달라서 자기 스레드를 새로 띄운다.
+        """
+        if not settings.METRICS_DIR or self._flusher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_loop, name="jandi-metrics", daemon=True).start()
+
+    def _flush_loop(self):
+        pid = os.getpid()
+        while True:
+            time.sleep(settings.METRICS_FLUSH_SECONDS)
+            if self._flusher_pid != pid:
+                return  # retire 됨
+            self.flush()
+
+    def _path(self, pid=None) -> str:
+        return os.path.join(settings.METRICS_DIR, f"{pid or os.getpid()}.json")
+
+    def flush(self):
+        if not settings.METRICS_DIR:
+            return
+        try:
+            os.makedirs(settings.METRICS_DIR, exist_ok=True)
+            path = self._path()
+            tmp = f"{path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.dump(), f)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"🚨 메트릭 저장 실패: {e}")
+
+    def retire(self):
+        # 워커 종료 시: 값을 archive.json 에 합치고 자기 파일 삭제
+        if not settings.METRICS_DIR or self._flusher_pid != os.getpid():
+            return
+        self._flusher_pid = None
+        try:
+            os.makedirs(settings.METRICS_DIR, exist_ok=True)
+            _archive(self._path(), self.dump())
+        except OSError as e:
+            print(f"🚨 메트릭 정리 실패: {e}")
+
+
+ARCHIVE_FILE = "archive.json"
+
+
+def _read(path: str):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _archive(path: str, dump: dict = None):
+    """
+    워커 파일 값(dump 를 주지 않으면 path 내용)을 archive.json 에 더하고 path 를 지운다
+    (파일 락 안에서 하므로 여러 워커/수집 요청이 동시에 와도 한 번만 합쳐짐)
+    """
+    archive_path = os.path.join(settings.METRICS_DIR, ARCHIVE_FILE)
+    with open(os.path.join(settings.METRICS_DIR, "archive.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if dump is None:
+            dump = _read(path)
+            if dump is None:
+                return  # 다른 쪽에서 이미 합침
+        archived = _read(archive_path) or {"counters": [], "histograms": []}
+        counters, histograms = _merge([archived, dump])
+        tmp = f"{archive_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "counters": [[n, list(l), v] for (n, l), v in counters.items()],
+                "histograms": [[n, list(l), h] for (n, l), h in histograms.items()],
+            }, f)
+        os.replace(tmp, archive_path)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+registry = Registry()
+atexit.register(registry.retire)
+
+
+# ---- 계측 도우미 ----
+
+@contextmanager
+def observe_upstream(upstream: str, endpoint: str):
+    """
+    외부 API 호출 한 번을 감싸서 호출 수/실패 수/응답 시간 기록
+    """
+    start = time.perf_counter()
+    registry.inc("upstream_requests_total", upstream=upstream, endpoint=endpoint)
+    try:
+        yield
+    except Exception as e:
+        registry.inc("upstream_errors_total", upstream=upstream, endpoint=endpoint, error=type(e).__name__)
+        raise
+    finally:
+        registry.observe(
+            "upstream_request_duration_seconds",
+            time.perf_counter() - start,
+            upstream=upstream,
+            endpoint=endpoint,
+        )
+
+
+def count_cache(cache: str, result: str):
+    registry.inc("cache_requests_total", cache=cache, result=result)
+
+
+# 요청마다 [쿼리 수] 를 담는 상자. sync_to_async 로 넘어간 스레드에도 컨텍스트가 복사되므로 같은 상자를 센다.
+_query_count = contextvars.ContextVar("db_query_count", default=None)
+
+
+def _count_query(execute, sql, params, many, context):
+    box = _query_count.get()
+    if box is not None:
+        box[0] += 1
+    return execute(sql, params, many, context)
+
+
+def _install_query_counter(sender, connection, **kwargs):
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+connection_created.connect(_install_query_counter)
+# 이 모듈보다 먼저 열린 커넥션 (테스트 DB 등)
+for _conn in connections.all(initialized_only=True):
+    _install_query_counter(None, _conn)
+
+
+class MetricsMiddleware:
+    """
+    뷰별 요청 수와 요청당 DB 쿼리 수 (DEBUG 와 무관하게 execute_wrapper 로 셈)
+    - 동기/비동기 양쪽 지원 (ASGI 에서 비동기 뷰를 스레드로 감싸지 않도록)
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        box = [0]
+        token = _query_count.set(box)
+        try:
+            response = self.get_response(request)
+        finally:
+            _query_count.reset(token)
+        self._record(request, response, box[0])
+        return response
+
+    async def __acall__(self, request):
+        box = [0]
+        token = _query_count.set(box)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _query_count.reset(token)
+        self._record(request, response, box[0])
+        return response
+
+    def _record(self, request, response, queries):
+        match = getattr(request, "resolver_match", None)
+        view = match.route if match is not None else "unmatched"
+        registry.inc("http_requests_total", view=view, method=request.method, status=response.status_code)
+        registry.inc("db_queries_total", queries, view=view)
+        registry.observe("db_queries_per_request", queries, view=view)
+
+
+# ---- /metrics ----
+
+def _load_worker_files() -> list:
+    """
+    다른 프로세스 파일 읽기 (METRICS_STALE_SECONDS 동안 갱신되지 않은 파일은 죽은 워커 → archive 로 합치고 삭제)
+    """
+    dumps = []
+    mine = os.path.basename(registry._path())
+    stale_before = time.time() - settings.METRICS_STALE_SECONDS
+    for filename in os.listdir(settings.METRICS_DIR):
+        if not filename.endswith(".json") or filename in (mine, ARCHIVE_FILE):
+            continue
+        path = os.path.join(settings.METRICS_DIR, filename)
+        try:
+            if os.path.getmtime(path) < stale_before:
+                _archive(path)
+                continue
+        except OSError:
+            continue
+        dump = _read(path)
+        if dump is not None:
+            dumps.append(dump)
+    # 방금 합친 값이 빠지지 않도록 archive 는 마지막에 다시 읽음
+    archived = _read(os.path.join(settings.METRICS_DIR, ARCHIVE_FILE))
+    if archived is not None:
+        dumps.append(archived)
+    return dumps
+
+
+def _merge(dumps):
+    counters, histograms = {}, {}
+    for d in dumps:
+        for name, labels, value in d["counters"]:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, h in d["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            cur = histograms.get(key)
+            histograms[key] = h if cur is None else [a + b for a, b in zip(cur, h)]
+    return counters, histograms
+
+
+def _collect():
+    """
+    모든 프로세스 값 합치기: 다른 프로세스(와 끝난 워커 archive)는 파일에서, 현재 프로세스는 메모리에서
+    """
+    dumps = [registry.dump()]
+    if settings.METRICS_DIR and os.path.isdir(settings.METRICS_DIR):
+        dumps += _load_worker_files()
+    return _merge(dumps)
+
+
+def _fmt_labels(labels) -> str:
+    if not labels:
+        return ""
+    inner = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in labels)
+    return "{" + inner + "}"
+
+
+def render_metrics() -> str:
+    counters, histograms = _collect()
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (n, labels), value in sorted(counters.items()):
+                if n == name:
+                    lines.append(f"{name}{_fmt_labels(labels)} {value}")
+        else:
+            for (n, labels), h in sorted(histograms.items()):
+                if n != name:
+                    continue
+                for bound, count in zip(buckets, h):
+                    lines.append(f"{name}_bucket{_fmt_labels(labels + (('le', str(bound)),))} {count}")
+                lines.append(f"{name}_bucket{_fmt_labels(labels + (('le', '+Inf'),))} {h[-1]}")
+                lines.append(f"{name}_sum{_fmt_labels(labels)} {h[-2]}")
+                lines.append(f"{name}_count{_fmt_labels(labels)} {h[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    # METRICS_TOKEN 이 설정돼 있으면 Authorization: Bearer <token>, 아니면 스태프 세션만
+    token = settings.METRICS_TOKEN
+    if token:
+        allowed = request.headers.get("Authorization") == f"Bearer {token}"
+    else:
+        user = getattr(request, "user", None)
+        allowed = user is not None and user.is_authenticated and user.is_staff
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -108,6 +108,7 @@ SIMPLE_JWT = {
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'config.metrics.MetricsMiddleware',   # 뷰별 요청/DB 쿼리 수 (/metrics)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -150,6 +151,26 @@ DATABASES = {
 }
 
 
+# Cache
+# REDIS_URL 이 있으면 워커 간 공유 캐시로 Redis 사용, 없으면 프로세스 로컬 메모리
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "jandibook",
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -206,13 +227,194 @@ CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_HEADERS = ["*"]
 
 
+# 외부 API 스텁 / 녹화·재생 (부하 테스트, CI)
+# - UPSTREAM_STUB_URL 을 주면 알라딘/위키/OpenAI 주소가 스텁 서버(manage.py upstream_stub)로 바뀜
+# - UPSTREAM_CASSETTE_MODE: "off" | "record" (실제 호출 + 저장) | "replay" (저장본만, 네트워크 없음)
+UPSTREAM_STUB_URL = os.getenv("UPSTREAM_STUB_URL", "").rstrip("/")
+UPSTREAM_CASSETTE_MODE = os.getenv("UPSTREAM_CASSETTE_MODE", "off")
+UPSTREAM_CASSETTE_DIR = os.getenv("UPSTREAM_CASSETTE_DIR", str(BASE_DIR / "cassettes"))
+UPSTREAM_STUB = {
+    # 응답 지연: "recorded" 면 녹화 당시 걸린 시간 × latency_scale, 숫자면 고정 ms
+    "latency": "recorded",
+    "latency_scale": 1.0,
+    "jitter": 0.2,             # 지연 시간에 ± 비율로 흔들기
+    "error_rate": 0.0,         # 이 비율만큼 error_status 로 응답
+    "error_status": 503,
+    "timeout_rate": 0.0,       # 이 비율만큼 hang_seconds 동안 응답하지 않음 (클라이언트 타임아웃 유도)
+    "hang_seconds": 30,
+}
+
+
+# 비동기 뷰 (ASGI: uvicorn config.asgi:application)
+# 켜면 검색/AI 리뷰/북트래블/성향 추천이 httpx.AsyncClient·AsyncOpenAI 로 외부 호출을 기다린다
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "") == "1"
+ASYNC_HTTP_MAX_CONNECTIONS = 100      # 외부 API 별 이벤트 루프당 최대 연결 수
+ASYNC_HTTP_MAX_KEEPALIVE = 20
+
+
+# 외부 API 서킷 브레이커 (config.circuit, 워커 프로세스별)
+# 최근 window_seconds 안의 호출이 min_calls 이상이고 실패(5xx/429/연결 오류/타임아웃) 또는
+# slow_call_seconds 보다 느린 호출의 비율이 failure_rate 이상이면 open_seconds 동안 바로 실패 처리
+CIRCUIT_BREAKERS = {
+    "default": {
+        "window_seconds": 60,
+        "min_calls": 10,
+        "failure_rate": 0.5,
+        "slow_call_seconds": 5,
+        "open_seconds": 30,
+        "half_open_calls": 2,    # open 이 끝난 뒤 시험 호출 수
+    },
+    "aladin": {"slow_call_seconds": 6},
+    "wikipedia": {"min_calls": 5, "slow_call_seconds": 4, "open_seconds": 60},
+    "openai": {"min_calls": 4, "slow_call_seconds": 45, "open_seconds": 60},
+}
+
+
 # 알라딘 OPEN API 설정
 ALADIN_TTB_KEY = os.getenv("ALADIN_TTB_KEY")
 ALADIN_API_VERSION = "20131101"
-ALADIN_ITEMLIST_URL = "http://www.aladin.co.kr/ttb/api/ItemList.aspx"
-ALADIN_SEARCH_URL = "http://www.aladin.co.kr/ttb/api/ItemSearch.aspx"
-ALADIN_LOOKUP_URL = "http://www.aladin.co.kr/ttb/api/ItemLookUp.aspx"
+ALADIN_API_BASE = os.getenv("ALADIN_API_BASE") or (
+    f"{UPSTREAM_STUB_URL}/aladin" if UPSTREAM_STUB_URL else "http://www.aladin.co.kr/ttb/api"
+)
+ALADIN_ITEMLIST_URL = os.getenv("ALADIN_ITEMLIST_URL", f"{ALADIN_API_BASE}/ItemList.aspx")
+ALADIN_SEARCH_URL = os.getenv("ALADIN_SEARCH_URL", f"{ALADIN_API_BASE}/ItemSearch.aspx")
+ALADIN_LOOKUP_URL = os.getenv("ALADIN_LOOKUP_URL", f"{ALADIN_API_BASE}/ItemLookUp.aspx")
+
+# 알라딘 HTTP 클라이언트 (커넥션 풀 / 타임아웃 / 재시도)
+ALADIN_TIMEOUTS = {
+    # (connect, read) 초
+    "list": (3.05, 10),
+    "search": (3.05, 7),
+    "lookup": (3.05, 7),
+}
+ALADIN_RETRY_TOTAL = 2
+ALADIN_RETRY_BACKOFF = 0.3
+ALADIN_RETRY_JITTER = 0.3
+ALADIN_POOL_CONNECTIONS = 4
+ALADIN_POOL_MAXSIZE = 20
+
+# single-flight (동시 갱신 방지) 락
+SINGLE_FLIGHT_LOCK_TTL = 30   # 락 자동 만료 (초)
+SINGLE_FLIGHT_WAIT = SINGLE_FLIGHT_LOCK_TTL + 5   # 같은 프로세스의 먼저 온 호출을 기다리는 시간 (초, 락 TTL 이상)
+SINGLE_FLIGHT_POLL = 0.2      # 워커 간 락 확인 주기 (초)
+
+# 알라딘 목록 캐시 TTL (시간 단위)
+# soft_ttl 이 지나면 기존 목록을 내려주면서 백그라운드 갱신, hard_ttl 이 지나면 동기 갱신
+ALADIN_LIST_TTL = {
+    "default": {"soft_ttl": 24, "hard_ttl": 72},
+    "Bestseller": {"soft_ttl": 6, "hard_ttl": 72},
+    "ItemNewSpecial": {"soft_ttl": 24, "hard_ttl": 168},
+}
+
+# 도서 검색 결과 캐시 (프로세스 내 LRU + CACHES 공유 캐시)
+ALADIN_SEARCH_CACHE_TTL = 60 * 10      # 초
+ALADIN_SEARCH_CACHE_MAXSIZE = 512      # 워커당 최대 보관 검색어 수
+
+# 알라딘에 없는 ISBN 네거티브 캐시
+ALADIN_NEGATIVE_CACHE_TTL = 60 * 30    # 초
+ALADIN_NEGATIVE_CACHE_MAXSIZE = 2048
+
+# 검색 결과에 나왔지만 카탈로그에 없는 ISBN (aladin_refresh 가 미리 받아 둠)
+ALADIN_CATALOG_MISS_TTL = 60 * 60 * 24   # 초
+ALADIN_CATALOG_MISS_MAXSIZE = 1000       # 검색 횟수 상위 몇 개까지 기억할지
+
+# 도서 일괄 조회 (/api/books/batch/)
+BOOK_BATCH_MAX_SIZE = 50     # 한 요청당 최대 ISBN 수
+ALADIN_BATCH_WORKERS = 8     # 알라딘 동시 조회 스레드 수
+
+# 도서 상세 리뷰 한 페이지 크기 (상세 응답에 첫 페이지만 포함, 이후는 /api/books/<isbn13>/reviews/)
+BOOK_REVIEW_PAGE_SIZE = 10
+
+# 자동완성 인덱스 전체 재구축 주기 (초) - 다른 워커에서 저장된 도서 반영용
+SUGGEST_INDEX_REBUILD_SECONDS = 60 * 10
+
+# 알라딘 캐시 미리 갱신 (manage.py aladin_refresh [--daemon])
+# query_type → 화면에서 쓰는 개수 (views 의 limit 과 맞춰야 함)
+ALADIN_PREWARM_LISTS = {
+    "Bestseller": 20,
+    "ItemNewSpecial": 5,
+}
+ALADIN_PREWARM_AHEAD = 0.8              # TTL 의 80% 가 지나면 미리 갱신
+ALADIN_REFRESH_INTERVAL = 60 * 15       # daemon 모드 사이클 간격 (초)
+ALADIN_REFRESH_CALL_BUDGET = 200        # 사이클당 최대 알라딘 호출 수
+# 워커 부팅 시 한 번 목록 캐시를 채움 (배포 직후 첫 사용자가 알라딘 지연을 겪지 않도록)
+ALADIN_WARMUP_ON_BOOT = os.getenv("ALADIN_WARMUP_ON_BOOT", "") == "1"
+
+# AuthorSales:* 캐시 상한 (manage.py aladin_compact / aladin_refresh 사이클마다 정리)
+ALADIN_AUTHOR_SALES_MAX_KEYS = 500
+ALADIN_AUTHOR_SALES_MAX_ROWS = 10000
+ALADIN_AUTHOR_SALES_EVICTION = "lru"    # "lru" | "lfu"
+ALADIN_EVICTION_BATCH_SIZE = 50         # 한 번에 지우는 키 수
+ALADIN_ACCESS_TOUCH_SECONDS = 60 * 5    # 같은 키 사용 기록은 이 간격으로만 DB 에 씀
+
+# 알라딘 호출 할당량 (books.services.quota)
+ALADIN_DAILY_QUOTA = int(os.getenv("ALADIN_DAILY_QUOTA", 5000))   # TTB 키 일일 호출 한도
+ALADIN_QUOTA_USER_RESERVE = 0.2     # 사용자 호출 몫으로 남겨두는 비율 (백그라운드는 나머지까지만)
+ALADIN_RATE_PER_SECOND = 5          # 초당 호출 수 (CACHES 를 공유하는 모든 워커 합계)
+ALADIN_RATE_USER_SHARE = 0.2        # 초마다 사용자 호출 몫으로 남겨두는 비율 (백그라운드는 나머지까지만)
+# 속도 제한에 걸렸을 때 기다리는 최대 시간 (초) - 사용자 요청은 짧게, 백그라운드는 길게
+ALADIN_RATE_WAIT = {
+    "user": 2,
+    "background": 30,
+}
+
+# /metrics (config.metrics)
+# 여러 워커 프로세스 값을 합치려면 모든 워커가 같은 디렉터리를 쓰도록 지정 (비우면 현재 프로세스 값만)
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_SECONDS = 5
+METRICS_STALE_SECONDS = METRICS_FLUSH_SECONDS * 6   # 이만큼 갱신 안 된 워커 파일은 archive 로 합치고 삭제
+# Prometheus 수집용 Bearer 토큰 (비우면 /metrics 는 스태프 로그인 세션만)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# 백그라운드 작업 스레드 수 (stale 목록 갱신 등)
+BACKGROUND_WORKERS = 4
+
+# 조건부 GET 응답의 Cache-Control (config.http.conditional)
+# - public: 브라우저/리버스 프록시 모두 저장 가능, private: 사용자별 응답이라 브라우저만
+# - no_cache: 저장은 하되 매번 ETag 로 재검증 (바뀌지 않았으면 304)
+HTTP_CACHE_CONTROL = {
+    "default": {"private": True, "no_cache": True},
+    "aladin_list": {"public": True, "max_age": 60 * 5},
+    "book_detail": {"private": True, "no_cache": True},   # 북마크 여부가 사용자별
+    "ai_review": {"public": True, "max_age": 60 * 60},
+    "static": {"public": True, "max_age": 60 * 60 * 24},
+    "grass": {"private": True, "no_cache": True},
+}
 
 
 # OpenAI API 설정
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY") 
\ No newline at end of file
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY") 
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or (
+    f"{UPSTREAM_STUB_URL}/openai/v1" if UPSTREAM_STUB_URL else "https://gms.ssafy.io/gmsapi/api.openai.com/v1"
+)
+OPENAI_TIMEOUT = 60        # 초 (SDK 기본값 600초)
+OPENAI_MAX_RETRIES = 1
+
+# GPT 응답 캐시 (ai_curator.llm_cache): DB 에 저장 + 워커별 메모리 LRU
+LLM_CACHE_TTL = 60 * 60 * 24 * 30     # 초
+LLM_CACHE_MAX_ENTRIES = 5000          # DB 최대 보관 수 (넘으면 오래 안 쓴 것부터 삭제)
+LLM_CACHE_LOCAL_MAXSIZE = 256         # 워커당 메모리 보관 수
+LLM_CACHE_PRUNE_RATE = 0.05           # 저장 중 이 비율에서만 정리 (만료/초과분 삭제)
+
+# AI 도서 분석 작업 (ai_curator.jobs)
+AI_ANALYSIS_WARM_ON_DETAIL = os.getenv("AI_ANALYSIS_WARM_ON_DETAIL", "1") == "1"  # 상세 페이지를 열면 미리 분석 시작
+AI_ANALYSIS_WARM_ANON_RATE = 0.2                     # 비로그인 상세 요청 중 미리 분석을 시작하는 비율 (로그인 사용자는 항상, 봇은 안 함)
+AI_ANALYSIS_JOB_STALE_SECONDS = OPENAI_TIMEOUT * 3   # 이보다 오래 실행 중이면 워커가 죽었다고 보고 다시 실행
+AI_ANALYSIS_RETRY_SECONDS = 60 * 5                   # GPT 실패 후 다시 분석하기까지 (그 사이엔 임시 응답)
+AI_ANALYSIS_POLL_SECONDS = 2                         # 202 응답의 Retry-After / SSE 확인 간격
+AI_ANALYSIS_SSE_TIMEOUT = 90                         # SSE 연결 최대 유지 시간 (초과하면 클라이언트가 다시 연결)
+
+# 성향 테스트 추천 미리 계산 (ai_curator.taste, taste_precompute 명령)
+# 답변 7개(1/2) 조합 128가지 × 결과 TASTE_RESULT_VARIANTS 개를 저장해 두고 그중 하나를 응답
+TASTE_RESULT_VARIANTS = 3
+TASTE_CANDIDATE_BOOKS = 80       # GPT 에 보여줄 후보 도서 수 (무작위)
+TASTE_PREFERRED_SHARE = 0.6      # 후보 중 성향에 맞는 카테고리에서 뽑는 비율 (나머지는 전체에서)
+TASTE_DESCRIPTION_CHARS = 80     # 프롬프트에 넣는 설명 길이 (DB 에서 잘라서 가져옴)
+TASTE_CATEGORY_INDEX_TTL = 60 * 5  # 카테고리별 도서 id 목록을 워커 메모리에 두는 시간 (도서 저장/삭제 시 바로 비움)
+TASTE_REGENERATE_ON_CHANGE = os.getenv("TASTE_REGENERATE_ON_CHANGE", "0") == "1"  # 큐레이터 도서가 바뀌면 백그라운드 재생성
+
+# 위키피디아 API
+WIKIPEDIA_API_URL = os.getenv("WIKIPEDIA_API_URL") or (
+    f"{UPSTREAM_STUB_URL}/wikipedia/w/api.php" if UPSTREAM_STUB_URL else "https://ko.wikipedia.org/w/api.php"
+)
+WIKIPEDIA_TIMEOUT = (3.05, 5)   # (connect, read) 초
@@ -19,6 +19,7 @@ from django.urls import path, include
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from rest_framework import permissions
+from config.metrics import metrics_view
 
 
 schema_view = get_schema_view(
@@ -54,6 +55,8 @@ urlpatterns = [
     path("api/grass/", include("grass.urls")),
     #AI 큐레이터
     path("api/ai_curator/", include("ai_curator.urls")),
+    # 메트릭 (Prometheus 텍스트 형식)
+    path("metrics", metrics_view),
 ]
 
 
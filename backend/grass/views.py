@@ -1,10 +1,14 @@
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
 from datetime import date
+from django.db.models import Count, Max
+from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
+from config.http import conditional, make_etag
+from .models import GrassDaily
 from .services import get_grass_range, get_level_payload
 
 User = get_user_model()
@@ -19,16 +23,18 @@ class GrassMeView(APIView):
         days = int(request.query_params.get("days", 365))
         days = max(1, min(days, 365))
 
-        items = get_grass_range(request.user, days=days)
+        def build():
+            items = get_grass_range(request.user, days=days)
+            return Response({
+                "user_id": request.user.id,
+                "days": days,
+                "end_date": date.today().isoformat(),
+                "values": [{"date": x["date"], "count": x["count"]} for x in items],
+                "legend": ["0", "1", "2", "3", "3+"],
+                "cap": 3,
+            })
 
-        return Response({
-            "user_id": request.user.id,
-            "days": days,
-            "end_date": date.today().isoformat(),
-            "values": [{"date": x["date"], "count": x["count"]} for x in items],
-            "legend": ["0", "1", "2", "3", "3+"],
-            "cap": 3,
-        })
+        return _grass_conditional(request, request.user, days, build)
 
 
 class GrassUserView(APIView):
@@ -40,23 +46,25 @@ class GrassUserView(APIView):
         days = int(request.query_params.get("days", 365))
         days = max(1, min(days, 365))
 
-        items = get_grass_range(target, days=days)
+        def build():
+            items = get_grass_range(target, days=days)
+            return Response({
+                "user_id": target.id,
+                "days": days,
+                "end_date": items[-1]["date"] if items else None,
+                "values": [{"date": x["date"], "count": x["count"]} for x in items],
+                "legend": ["0", "1", "2", "3", "3+"],
+                "cap": 3,
+            })
 
-        return Response({
-            "user_id": target.id,
-            "days": days,
-            "end_date": items[-1]["date"] if items else None,
-            "values": [{"date": x["date"], "count": x["count"]} for x in items],
-            "legend": ["0", "1", "2", "3", "3+"],
-            "cap": 3,
-        })
+        return _grass_conditional(request, target, days, build)
 
 
 class LevelMeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        return Response(get_level_payload(request.user))
+        return _level_conditional(request, request.user)
 
 
 class LevelUserView(APIView):
@@ -64,7 +72,29 @@ class LevelUserView(APIView):
 
     def get(self, request, user_id):
         target = get_object_or_404(User, id=user_id)
-        return Response(get_level_payload(target))
+        return _level_conditional(request, target)
+
+
+def _grass_conditional(request, user, days, build):
+    # 잔디 행의 마지막 변경 시각 + 행 수 + 오늘 날짜(범위가 하루씩 밀림)가 그대로면 304
+    agg = GrassDaily.objects.filter(user=user).aggregate(last=Max("updated_at"), rows=Count("id"))
+    return conditional(
+        request,
+        build,
+        etag=make_etag(user.id, days, timezone.localdate(), agg["last"], agg["rows"]),
+        last_modified=agg["last"],
+        cache="grass",
+    )
+
+
+def _level_conditional(request, user):
+    # 레벨 정보는 exp_total 로만 계산됨
+    return conditional(
+        request,
+        lambda: Response(get_level_payload(user)),
+        etag=make_etag(user.id, user.exp_total),
+        cache="grass",
+    )
 
 
 class GrassSyncView(APIView):
@@ -79,7 +109,8 @@ class GrassSyncView(APIView):
         user = request.user
         
         # 1. 해당 유저의 모든 잔디 기록을 0으로 초기화 (잘못된 과거 데이터 제거)
-        GrassDaily.objects.filter(user=user).update(points=0)
+        # (update() 는 auto_now 를 채우지 않으므로 updated_at 도 직접 갱신 → 잔디 ETag 갱신)
+        GrassDaily.objects.filter(user=user).update(points=0, updated_at=timezone.now())
         
         # 2. 리뷰 DB를 전수 조사하여 날짜별 개수 파악
         review_counts = (
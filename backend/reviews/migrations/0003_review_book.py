@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_books(apps, schema_editor):
+    # 이미 카탈로그에 있는 도서의 리뷰만 연결
+    Review = apps.get_model("reviews", "Review")
+    Book = apps.get_model("books", "Book")
+
+    isbn13s = set(Review.objects.exclude(isbn13="").values_list("isbn13", flat=True))
+    book_ids = dict(Book.objects.filter(isbn13__in=isbn13s).values_list("isbn13", "id"))
+    for isbn13, book_id in book_ids.items():
+        Review.objects.filter(isbn13=isbn13).update(book_id=book_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0012_catalog'),
+        ('reviews', '0002_review_is_representative'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='book',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reviews', to='books.book'),
+        ),
+        migrations.RunPython(link_books, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0012_catalog'),
+        ('community', '0002_delete_review'),
+        ('reviews', '0003_review_book'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['isbn13', '-id'], name='review_isbn13_id_idx'),
+        ),
+    ]
@@ -15,6 +15,15 @@ class Review(models.Model):
     pub_date = models.CharField(max_length=20, blank=True)
     cover = models.URLField(blank=True)
 
+    # 카탈로그에 있는 도서면 연결 (위 도서 필드는 API 호환을 위해 유지)
+    book = models.ForeignKey(
+        "books.Book",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="reviews",
+    )
+
     rating = models.PositiveSmallIntegerField(null=True, blank=True)  # 1~5
     is_representative = models.BooleanField(default=False)
 
@@ -26,6 +35,10 @@ class Review(models.Model):
 
     class Meta:
         ordering = ["-id"]
+        indexes = [
+            # 도서 상세 리뷰 목록 (isbn13 별 최신순 커서 페이지네이션)
+            models.Index(fields=["isbn13", "-id"], name="review_isbn13_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.id}:{self.book_title}"
@@ -1,3 +1,91 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
+from books.models import BookStats
+from books.services.stats import rebuild_book_stats
+from community.models import Board
+from users.models import User
 
-# Create your tests here.
+ISBN = "9788936434120"
+
+STAT_FIELDS = [
+    "review_count", "rating_count", "rating_sum",
+    "rating_1", "rating_2", "rating_3", "rating_4", "rating_5",
+    "bookmark_count",
+]
+
+
+def stats_snapshot():
+    return {
+        s.isbn13: {f: getattr(s, f) for f in STAT_FIELDS}
+        for s in BookStats.objects.all()
+    }
+
+
+class ReviewStatsTests(TestCase):
+    """리뷰 작성/수정/삭제 시 BookStats 증감분이 전체 재계산 결과와 같은지"""
+
+    def setUp(self):
+        Board.objects.get_or_create(slug="review", defaults={"name": "리뷰", "board_type": "REVIEW"})
+        self.user = User.objects.create_user(username="reader", nickname="reader", email="reader@example.com", password="pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def write(self, rating=None, isbn13=ISBN):
+        res = self.client.post("/api/review/write/", {
+            "book_title": "책", "book_author": "저자", "content": "좋아요",
+            "rating": rating, "isbn13": isbn13,
+        }, format="json")
+        self.assertEqual(res.status_code, 201, res.data)
+        return res.data["id"]
+
+    def assertMatchesRebuild(self):
+        live = stats_snapshot()
+        rebuild_book_stats()
+        self.assertEqual(live, stats_snapshot())
+
+    def test_create_counts_rating_bucket(self):
+        self.write(rating=4)
+        self.write(rating=4)
+        self.write()   # 별점 없는 리뷰는 평균 분모에서 제외
+
+        stats = BookStats.objects.get(isbn13=ISBN)
+        self.assertEqual(stats.review_count, 3)
+        self.assertEqual(stats.rating_count, 2)
+        self.assertEqual(stats.rating_4, 2)
+        self.assertEqual(stats.rating_avg, 4)
+        self.assertIsNotNone(stats.last_activity)
+        self.assertMatchesRebuild()
+
+    def test_update_moves_rating_between_buckets(self):
+        review_id = self.write(rating=2)
+
+        self.client.patch(f"/api/review/{review_id}/", {"rating": 5}, format="json")
+        stats = BookStats.objects.get(isbn13=ISBN)
+        self.assertEqual((stats.rating_2, stats.rating_5, stats.rating_sum), (0, 1, 5))
+        self.assertMatchesRebuild()
+
+        self.client.patch(f"/api/review/{review_id}/", {"rating": None}, format="json")
+        stats = BookStats.objects.get(isbn13=ISBN)
+        self.assertEqual((stats.review_count, stats.rating_count, stats.rating_5), (1, 0, 0))
+        self.assertMatchesRebuild()
+
+    def test_content_only_update_bumps_last_activity(self):
+        review_id = self.write(rating=3)
+        before = BookStats.objects.get(isbn13=ISBN).last_activity
+
+        self.client.patch(f"/api/review/{review_id}/", {"content": "다시 읽음"}, format="json")
+
+        stats = BookStats.objects.get(isbn13=ISBN)
+        self.assertEqual(stats.rating_3, 1)
+        self.assertGreater(stats.last_activity, before)
+
+    def test_delete_reverts_counts(self):
+        self.write(rating=5)
+        gone = self.write(rating=1)
+
+        res = self.client.delete(f"/api/review/{gone}/")
+        self.assertEqual(res.status_code, 204)
+
+        stats = BookStats.objects.get(isbn13=ISBN)
+        self.assertEqual((stats.review_count, stats.rating_count, stats.rating_1, stats.rating_sum), (1, 1, 0, 5))
+        self.assertMatchesRebuild()
@@ -1,4 +1,5 @@
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from django.db.models import Count, Q
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
@@ -12,6 +13,8 @@ from community.views import (
     _like_count_map, _comment_count_map, _bulk_liked_ids, _toggle_like,
     _comment_tree_response
 )
+from books.models import Book
+from books.services.stats import on_review_created, on_review_deleted, on_review_updated
 from .models import Review
 from .serializers import ReviewListSerializer, ReviewWriteSerializer
 
@@ -51,19 +54,24 @@ def review_write(request):
         return Response(s.errors, status=status.HTTP_400_BAD_REQUEST)
 
     v = s.validated_data
+    isbn13 = v.get("isbn13", "")
 
-    review = Review.objects.create(
-        board=board,
-        user=request.user,
-        book_title=v["book_title"],
-        book_author=v["book_author"],
-        content=v["content"],
-        rating=v.get("rating", None),
-        isbn13=v.get("isbn13", ""),
-        publisher=v.get("publisher", ""),
-        pub_date=v.get("pub_date", ""),
-        cover=v.get("cover", ""),
-    )
+    with transaction.atomic():
+        review = Review.objects.create(
+            board=board,
+            user=request.user,
+            book_title=v["book_title"],
+            book_author=v["book_author"],
+            content=v["content"],
+            rating=v.get("rating", None),
+            isbn13=isbn13,
+            publisher=v.get("publisher", ""),
+            pub_date=v.get("pub_date", ""),
+            cover=v.get("cover", ""),
+            # 카탈로그에 이미 있는 도서면 연결 (리뷰 작성 때문에 알라딘을 호출하지는 않음)
+            book=Book.objects.filter(isbn13=isbn13).first() if isbn13 else None,
+        )
+        on_review_created(review)
 
     add_points(request.user, "REVIEW")
 
@@ -108,9 +116,13 @@ def review_detail(request, review_id):
         return Response({"error": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
 
     if request.method == "DELETE":
-        review.delete()
+        with transaction.atomic():
+            review.delete()
+            on_review_deleted(review)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    old_rating = review.rating
+
     if "rating" in request.data:
         rating = request.data.get("rating")
         if rating is not None and rating != "":
@@ -127,7 +139,9 @@ def review_detail(request, review_id):
     if "content" in request.data:
         review.content = request.data.get("content")
 
-    review.save()
+    with transaction.atomic():
+        review.save()
+        on_review_updated(review, old_rating)
 
     like_map = _like_count_map(Review, [review.id])
     comment_map = _comment_count_map(Review, [review.id])
@@ -4,8 +4,29 @@ import api from "@/api/axios";
 export const getBookDetail = (isbn13) =>
   api.get(`/books/${isbn13}/`);
 
-export const getAiDetail = (isbn13) =>
-  api.get(`/ai_curator/${isbn13}/`);
+// AI 분석은 서버에서 작업으로 돌아간다: 처음이면 202 + poll_url → 끝날 때까지 확인해서 결과만 반환
+// isCancelled() 가 true 가 되면 (다른 책으로 이동/화면 이탈) 확인을 멈추고 null
+const AI_POLL_MS = 2000;
+const AI_POLL_MAX = 45; // 약 90초
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+export async function getAiDetail(isbn13, isCancelled = () => false) {
+  const res = await api.get(`/ai_curator/${encodeURIComponent(isbn13)}/`);
+  if (res?.status !== 202) return res?.data || {};
+
+  for (let i = 0; i < AI_POLL_MAX; i++) {
+    await sleep(AI_POLL_MS);
+    if (isCancelled()) return null;
+    const poll = await api.get(res.data.poll_url);
+    const d = poll?.data || {};
+    if (d.status === "done" || d.status === "failed") {
+      if (!d.result) throw new Error(d.error || "AI 분석 실패");
+      return d.result;
+    }
+  }
+  throw new Error("AI 분석 시간 초과");
+}
 
 export const getBookReviews = (isbn13) =>
   api.get(`/books/${isbn13}/reviews/`);